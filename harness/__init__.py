@@ -0,0 +1,7 @@
+"""
+Performance harness for the Project Management System
+
+Benchmarks, load scenarios and reporting tools that drive the Next.js API
+(``app/api``) and the Socket.IO workspace server (``websocket-server.js``).
+Every tool is runnable on its own, e.g. ``python -m harness.cold_start``.
+"""
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Activity-log write amplification benchmark
+
+Every task update, task creation, project edit and membership change
+also inserts an Activity row. This measures what that costs:
+
+  * Writes per user action: rows inserted/updated/deleted per table and
+    committed transactions (pg_stat_user_tables / pg_stat_database
+    deltas) for each action, plus Activity rows per action.
+  * As the activities table grows (COPY straight into Postgres, see
+    harness.seed.SqlSeeder): PATCH /api/tasks/{id} latency, the Activity
+    INSERT on its own (EXPLAIN ANALYZE, i.e. the part of every write
+    that logging adds) and GET /api/activity read latency.
+
+Run it against a database nothing else is writing to; the statistics
+views are server-wide.
+
+    DATABASE_URL=postgres://... python -m harness.activity --sizes 100000,1000000,3000000
+"""
+
+import argparse
+import sys
+import time
+import uuid
+
+import requests
+
+from .client import ApiClient
+from .config import BASE_URL
+from .db import Database, DatabaseError, new_id
+from .results import RunRecorder
+from .seed import ApiSeeder, SqlSeeder
+from .stats import format_ms, summarize
+
+ACTIONS = ['create_task', 'update_task', 'complete_task', 'update_project', 'change_member_role', 'join_project']
+
+# Counters in pg_stat_user_tables are flushed by each backend at most once a second
+STATS_FLUSH_SEC = 1.5
+
+
+class ActivityBenchmark:
+    def __init__(self, args):
+        self.args = args
+        self.recorder = RunRecorder('activity')
+        self.client = ApiClient(args.base_url, recorder=self.recorder, timeout=args.timeout)
+        self.db = Database(args.database_url)
+        self.sql = SqlSeeder(self.db)
+        self.namespace = f"activity{uuid.uuid4().hex[:6]}"
+        self.seeder = None
+        self.user_id = None
+        self.project_id = None
+        self.noise_user_id = None
+        self.noise_project_id = None
+        self.tasks = []
+        self.members = []  # project_members row ids
+        self.joiners = []  # signed-in clients not yet in the project
+        self.seeded = 0
+        self.amplification = {}
+        self.results = []
+        self.counter = 0
+
+    def setup(self):
+        self.client.register_and_login("Activity Bench")
+        self.user_id = self.client.user['id']
+        self.seeder = ApiSeeder(self.client, self.args.base_url, namespace=self.namespace)
+        self.project_id = self.seeder.create_project()
+        self.tasks = self.seeder.add_tasks(self.project_id, self.args.tasks)
+        member_ids = self.seeder.add_members(self.project_id, 2)
+        self.members = [row[0] for row in self.db.query(
+            f"""SELECT id FROM "project_members" WHERE "projectId" = '{self.project_id}'
+                AND "userId" IN ('{member_ids[0]}', '{member_ids[1]}')""")]
+
+        # Most seeded activity belongs to someone else's project, like the rest of a shared database
+        other = ApiClient(self.args.base_url, timeout=self.args.timeout)
+        other.register_and_login("Activity Bench Neighbour")
+        self.noise_user_id = other.user['id']
+        self.noise_project_id = ApiSeeder(other, self.args.base_url, namespace=self.namespace).create_project()
+
+    # Actions -----------------------------------------------------------
+
+    def act(self, name):
+        """Perform one user action through the API; returns the responses it took"""
+        self.counter += 1
+        n = self.counter
+        task_id = self.tasks[n % len(self.tasks)]
+        if name == 'create_task':
+            return [self.client.post(f"/projects/{self.project_id}/tasks", json={
+                'title': f"{self.namespace} action task {n}", 'priority': 'MEDIUM'})]
+        if name == 'update_task':
+            return [self.client.patch(f"/tasks/{task_id}", json={'priority': ['LOW', 'HIGH'][n % 2]})]
+        if name == 'complete_task':
+            return [self.client.patch(f"/tasks/{task_id}", json={'status': ['DONE', 'IN_PROGRESS'][n % 2]})]
+        if name == 'update_project':
+            return [self.client.patch(f"/projects/{self.project_id}", json={'description': f"Revision {n}"})]
+        if name == 'change_member_role':
+            member_id = self.members[n % len(self.members)]
+            return [self.client.patch(f"/projects/{self.project_id}/members/{member_id}",
+                                      json={'role': ['ADMIN', 'MEMBER'][n % 2]})]
+        if name == 'join_project':
+            joiner = self.joiners.pop()
+            invite = self.client.post(f"/projects/{self.project_id}/invite",
+                                      json={'email': joiner['email'], 'role': 'MEMBER'})
+            if invite.status_code != 201:
+                return [invite]
+            return [invite, joiner['client'].post("/inbox/invitations", json={
+                'invitationId': invite.json()['invitation']['id'], 'action': 'accept'})]
+        raise KeyError(name)
+
+    def prepare_joiners(self, count):
+        for i in range(count):
+            client = ApiClient(self.args.base_url, recorder=self.recorder, timeout=self.args.timeout)
+            email = f"{self.namespace}.joiner.{i}@example.com"
+            client.register_and_login(f"{self.namespace} joiner {i}", email)
+            self.joiners.append({'client': client, 'email': email})
+
+    def table_writes(self):
+        rows = self.db.query('SELECT relname, n_tup_ins, n_tup_upd, n_tup_del FROM pg_stat_user_tables')
+        return {name: (int(ins), int(upd), int(dele)) for name, ins, upd, dele in rows}
+
+    def commits(self):
+        return int(self.db.scalar("SELECT xact_commit FROM pg_stat_database WHERE datname = current_database()"))
+
+    def activity_count(self):
+        return int(self.db.scalar(f"""SELECT count(*) FROM "activities" WHERE "projectId" = '{self.project_id}'"""))
+
+    def snapshot(self):
+        return self.table_writes(), self.commits(), self.activity_count()
+
+    def writes_between(self, name, repeat):
+        """Per-table row writes and commits while running an action repeat times (None: just the snapshots)"""
+        time.sleep(STATS_FLUSH_SEC)
+        before = self.snapshot()
+        responses = []
+        for _ in range(repeat if name else 0):
+            responses += self.act(name)
+        time.sleep(STATS_FLUSH_SEC)
+        after = self.snapshot()
+        tables = {}
+        for table, counts in after[0].items():
+            delta = [a - b for a, b in zip(counts, before[0].get(table, (0, 0, 0)))]
+            if any(delta):
+                tables[table] = dict(zip(['ins', 'upd', 'del'], delta))
+        return responses, tables, after[1] - before[1], after[2] - before[2]
+
+    def measure_amplification(self):
+        self.prepare_joiners(self.args.actions)
+        # The snapshot queries commit transactions of their own; measure them once and take them off
+        _, _, overhead, _ = self.writes_between(None, 0)
+        print(f"{'action':<20} {'requests':>8} {'activity':>9} {'commits':>8}  rows written per action")
+        for name in ACTIONS:
+            responses, tables, commits, activities = self.writes_between(name, self.args.actions)
+            failed = [r.status_code for r in responses if r.status_code >= 400]
+            per_table = {table: {k: v / self.args.actions for k, v in counts.items()}
+                         for table, counts in tables.items()}
+            entry = {
+                'requests': len(responses) / self.args.actions,
+                'activityRows': activities / self.args.actions,
+                'commits': max(commits - overhead, 0) / self.args.actions,
+                'tables': per_table,
+                'rowsWritten': sum(sum(t.values()) for t in per_table.values()),
+                'failedStatuses': failed,
+            }
+            self.amplification[name] = entry
+            written = ', '.join(f"{table} {sum(t.values()):g}" for table, t in sorted(per_table.items()))
+            print(f"{name:<20} {entry['requests']:>8g} {entry['activityRows']:>9g} {entry['commits']:>8.1f}  "
+                  f"{written}")
+            if failed:
+                print(f"   ❌ {len(failed)} failed requests: {sorted(set(failed))}")
+
+    # Growth ------------------------------------------------------------
+
+    def grow(self, size):
+        count = size - self.seeded
+        if count <= 0:
+            return
+        start = time.perf_counter()
+        own = int(count * self.args.own_ratio)
+        self.sql.activities(self.user_id, self.project_id, own, task_ids=self.tasks, start=self.seeded)
+        self.sql.activities(self.noise_user_id, self.noise_project_id, count - own, start=self.seeded + own)
+        self.seeded = size
+        self.db.execute('ANALYZE "activities"')
+        print(f"🌱 {self.seeded} seeded activities ({time.perf_counter() - start:.1f}s)")
+
+    def timed(self, label, func, repeat):
+        timings = []
+        status = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            try:
+                response = func()
+                status = response.status_code
+                if status < 500:
+                    timings.append((time.perf_counter() - start) * 1000)
+            except requests.RequestException as e:
+                status = type(e).__name__
+        return {'label': label, 'status': status, **summarize(timings)}
+
+    def add_result(self, size, kind, result, baseline=None):
+        entry = {'size': size, 'kind': kind, **result}
+        if baseline and result.get('p50') is not None and baseline.get('p50') is not None:
+            entry['addedMs'] = result['p50'] - baseline['p50']
+        self.results.append(entry)
+        added = f"{entry['addedMs']:+.1f}ms" if 'addedMs' in entry else ''
+        print(f"   {kind:<6} {result['label']:<40} {format_ms(result.get('p50')):>9} "
+              f"{format_ms(result.get('max')):>9} {added:>10}")
+
+    def insert_cost(self):
+        """EXPLAIN ANALYZE of the INSERT the routes run through prisma.activity.create"""
+        timings = []
+        for i in range(self.args.repeat):
+            activity_id = new_id()
+            timings.append(self.db.explain_analyze(
+                'INSERT INTO "activities" (id, type, content, "createdAt", "userId", "projectId", "taskId") '
+                f"VALUES ('{activity_id}', 'TASK_UPDATED', 'updated task \"bench\"', now(), '{self.user_id}', "
+                f"'{self.project_id}', '{self.tasks[i % len(self.tasks)]}')"))
+            self.db.execute(f"""DELETE FROM "activities" WHERE id = '{activity_id}'""")
+        return {'label': "INSERT activities (EXPLAIN ANALYZE)", 'status': None,
+                **summarize([t for t in timings if t is not None])}
+
+    def measure_size(self, size, baselines):
+        measurements = [
+            ('write', lambda: self.timed("PATCH /tasks/{id}", lambda: self.client.patch(
+                f"/tasks/{self.tasks[0]}", json={'priority': 'HIGH'}), self.args.repeat)),
+            ('sql', self.insert_cost),
+            ('read', lambda: self.timed("GET /activity all", lambda: self.client.get(
+                "/activity", endpoint="GET /activity all"), self.args.repeat)),
+            ('read', lambda: self.timed("GET /activity project", lambda: self.client.get(
+                "/activity", params={'projectId': self.project_id}, endpoint="GET /activity project"),
+                self.args.repeat)),
+        ]
+        for kind, measure in measurements:
+            result = measure()
+            baseline = baselines.setdefault(result['label'], result)
+            self.add_result(size, kind, result, baseline if baseline is not result else None)
+
+    def run(self):
+        print("=" * 80)
+        print("ACTIVITY LOG WRITE AMPLIFICATION")
+        print("=" * 80)
+        self.setup()
+        self.measure_amplification()
+
+        print()
+        baselines = {}
+        for size in [0] + self.args.sizes:
+            self.grow(size)
+            print(f"   {'kind':<6} {'measurement':<40} {'p50':>9} {'max':>9} {'vs empty':>10}")
+            self.measure_size(size, baselines)
+            print()
+
+        self.recorder.add_section('activity', {
+            'actionsPerMeasurement': self.args.actions,
+            'ownRatio': self.args.own_ratio,
+            'amplification': self.amplification,
+            'results': self.results,
+        })
+        print(f"💾 Results: {self.recorder.save()}")
+        return not any(entry['failedStatuses'] for entry in self.amplification.values())
+
+
+def int_list(value):
+    return [int(x) for x in value.split(',')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--database-url', default=None, help="defaults to $DATABASE_URL")
+    parser.add_argument('--sizes', type=int_list, default=[100000, 1000000, 3000000], help="activity rows per step")
+    parser.add_argument('--own-ratio', type=float, default=0.1,
+                        help="share of seeded rows in the benchmark user's project (rest go to another project)")
+    parser.add_argument('--tasks', type=int, default=20)
+    parser.add_argument('--actions', type=int, default=20, help="repetitions of each action for the write counts")
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--timeout', type=int, default=120)
+    args = parser.parse_args(argv)
+
+    try:
+        benchmark = ActivityBenchmark(args)
+    except DatabaseError as e:
+        print(f"❌ {e}")
+        return 1
+    return 0 if benchmark.run() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Calendar and my-tasks date-range benchmark
+
+Seeds one user with tasks spread over --years around today (most in the
+past and mostly done, the rest upcoming) across --projects projects
+(COPY straight into Postgres, see harness.seed.SqlSeeder), then measures
+at each size:
+
+  * GET /api/my-tasks. The route takes no date range: it returns every
+    assigned task with project, assignee and labels, ordered by priority
+    and createdAt. The month, week, overdue and due-soon views filter
+    that list in the browser, so the report shows rows fetched against
+    rows each view displays.
+  * The project calendar page, which loads GET /projects/:id and
+    GET /projects/:id/tasks in parallel and filters by due date client-side.
+  * The same views as SQL range queries (EXPLAIN ANALYZE), i.e. what
+    server-side date filtering would cost; --try-index re-measures them
+    with (assigneeId, dueDate) / (projectId, dueDate) / open-task dueDate
+    indexes, then drops them again.
+  * Due-soon and overdue notification sweeps. Nothing schedules them
+    today; notifyTaskDueSoon/notifyTaskOverdue run one task at a time via
+    POST /notifications/trigger. So the candidate query is timed across
+    all users, a sample of triggers is timed, and the sweep's duration is
+    projected from the two.
+
+    DATABASE_URL=postgres://... python -m harness.calendar --sizes 1000,5000,20000 --projects 50
+"""
+
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import requests
+
+from .client import ApiClient
+from .config import BASE_URL
+from .db import Database
+from .results import RunRecorder
+from .seed import ApiSeeder, SqlSeeder
+from .stats import format_ms, summarize
+
+OPEN_SQL = "status NOT IN ('DONE', 'CANCELLED')"
+RANGE_INDEXES = {
+    'bench_tasks_assignee_due': '"tasks" ("assigneeId", "dueDate")',
+    'bench_tasks_project_due': '"tasks" ("projectId", "dueDate")',
+    'bench_tasks_open_due': f'"tasks" ("dueDate") WHERE {OPEN_SQL}',
+}
+
+
+def _sql_time(value):
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def view_windows(now, due_soon_hours):
+    """(start, end) per calendar view, as the pages compute them"""
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    month_end = (month_start + timedelta(days=32)).replace(day=1)
+    week_start = (now - timedelta(days=(now.weekday() + 1) % 7)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return {
+        'month': (month_start, month_end),
+        'week': (week_start, week_start + timedelta(days=7)),
+        'due soon': (now, now + timedelta(hours=due_soon_hours)),
+    }
+
+
+def shown_by_view(tasks, now, due_soon_hours):
+    """Rows each client-side view keeps out of a fetched task list"""
+    dated = [(t, datetime.fromisoformat(t['dueDate'].replace('Z', '+00:00')).replace(tzinfo=None))
+             for t in tasks if t.get('dueDate')]
+    shown = {name: sum(1 for _, due in dated if start <= due < end)
+             for name, (start, end) in view_windows(now, due_soon_hours).items()}
+    shown['overdue'] = sum(1 for t, due in dated if due < now and t['status'] != 'DONE')
+    return shown
+
+
+class CalendarBenchmark:
+    def __init__(self, args):
+        self.args = args
+        self.recorder = RunRecorder('calendar')
+        self.client = ApiClient(args.base_url, recorder=self.recorder, timeout=args.timeout)
+        self.db = Database(args.database_url)
+        self.sql = SqlSeeder(self.db)
+        self.user_id = None
+        self.project_ids = []
+        self.seeded = 0
+        self.results = []
+        self.sweeps = []
+
+    def setup(self):
+        self.client.register_and_login("Calendar Bench")
+        self.user_id = self.client.user['id']
+        seeder = ApiSeeder(self.client, self.args.base_url, namespace='calendar')
+        print(f"🌱 Creating {self.args.projects} projects...")
+        self.project_ids = [seeder.create_project() for _ in range(self.args.projects)]
+
+    def plan(self, i):
+        """Due date and status of seeded task i (deterministic, so due() and status() agree)"""
+        rng = random.Random(self.args.seed * 1_000_003 + i)
+        if rng.random() < self.args.undated_ratio:
+            return None, rng.choice(['TODO', 'IN_PROGRESS'])
+        span = self.args.years * 365
+        offset = rng.uniform(-span * self.args.past_ratio, span * (1 - self.args.past_ratio))
+        due = self.sql.newest + timedelta(days=offset)
+        if offset < 0:
+            status = rng.choices(['DONE', 'CANCELLED', 'TODO', 'IN_PROGRESS', 'IN_REVIEW'], [80, 5, 7, 5, 3])[0]
+        else:
+            status = rng.choices(['TODO', 'IN_PROGRESS', 'IN_REVIEW'], [60, 30, 10])[0]
+        return due, status
+
+    def grow(self, size):
+        missing = size - self.seeded
+        if missing <= 0:
+            return
+        start = time.perf_counter()
+        per_project = -(-missing // len(self.project_ids))
+        for project_id in self.project_ids:
+            count = min(per_project, size - self.seeded)
+            if count <= 0:
+                break
+            self.sql.tasks(project_id, self.user_id, count, start=self.seeded, assignee_id=self.user_id,
+                           due=lambda i: self.plan(i)[0], status=lambda i: self.plan(i)[1])
+            self.seeded += count
+        self.db.execute('ANALYZE "tasks"')
+        print(f"🌱 {self.seeded} tasks over {len(self.project_ids)} projects and {self.args.years:g} years "
+              f"({time.perf_counter() - start:.1f}s)")
+
+    def timed(self, label, func, repeat):
+        timings = []
+        status, response = None, None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            try:
+                response = func()
+                status = response.status_code
+                if status < 500:
+                    timings.append((time.perf_counter() - start) * 1000)
+            except requests.RequestException as e:
+                status = type(e).__name__
+        return {'label': label, 'status': status, **summarize(timings)}, response
+
+    def add_result(self, size, kind, result, note="", **extra):
+        entry = {'size': size, 'kind': kind, **extra, **result}
+        self.results.append(entry)
+        print(f"   {kind:<10} {result['label']:<36} {format_ms(result.get('p50')):>9} "
+              f"{format_ms(result.get('max')):>9}  {note}")
+
+    def measure_api(self, size, now):
+        result, response = self.timed("my-tasks", lambda: self.client.get("/my-tasks"), self.args.repeat)
+        tasks = response.json().get('tasks', []) if response is not None and response.ok else []
+        shown = shown_by_view(tasks, now, self.args.due_soon_hours)
+        size_kb = len(response.content) / 1024 if response is not None else 0
+        self.add_result(size, 'api', result, f"{len(tasks)} rows, {size_kb:.0f}KB",
+                        rows=len(tasks), bytes=len(response.content) if response is not None else None, shown=shown)
+        for view, count in shown.items():
+            print(f"   {'':<10} {'  ' + view + ' view shows':<36} {count:>9} of {len(tasks)}")
+
+        project_id = self.project_ids[0]
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            def page_load():
+                detail = pool.submit(self.client.get, f"/projects/{project_id}")
+                tasks = pool.submit(self.client.get, f"/projects/{project_id}/tasks")
+                detail.result()
+                return tasks.result()
+            result, response = self.timed("project calendar page", page_load, self.args.repeat)
+        rows = len(response.json().get('tasks', [])) if response is not None and response.ok else 0
+        self.add_result(size, 'api', result, f"{rows} rows (detail + tasks in parallel)", rows=rows)
+
+    def range_queries(self, now):
+        windows = view_windows(now, self.args.due_soon_hours)
+        user = f"\"assigneeId\" = '{self.user_id}'"
+        now_sql = f"'{_sql_time(now)}'"
+        assigned_open = f'"assigneeId" IS NOT NULL AND {OPEN_SQL}'
+
+        def between(name):
+            start, end = windows[name]
+            return f"\"dueDate\" >= '{_sql_time(start)}' AND \"dueDate\" < '{_sql_time(end)}'"
+
+        return {
+            'my-tasks as issued': f'SELECT * FROM "tasks" WHERE {user} ORDER BY priority DESC, "createdAt" DESC',
+            'my-tasks month': f'SELECT * FROM "tasks" WHERE {user} AND {between("month")} ORDER BY "dueDate"',
+            'my-tasks week': f'SELECT * FROM "tasks" WHERE {user} AND {between("week")} ORDER BY "dueDate"',
+            'my-tasks overdue': f'SELECT * FROM "tasks" WHERE {user} AND "dueDate" < {now_sql} '
+                                f'AND status <> \'DONE\' ORDER BY "dueDate"',
+            'my-tasks due soon': f'SELECT * FROM "tasks" WHERE {user} AND {between("due soon")} ORDER BY "dueDate"',
+            'project month': f'SELECT * FROM "tasks" WHERE "projectId" = \'{self.project_ids[0]}\' '
+                             f'AND {between("month")} ORDER BY "dueDate"',
+            'sweep due soon (all users)': f'SELECT id, "assigneeId" FROM "tasks" '
+                                          f'WHERE {assigned_open} AND {between("due soon")}',
+            'sweep overdue (all users)': f'SELECT id, "assigneeId" FROM "tasks" '
+                                         f'WHERE {assigned_open} AND "dueDate" < {now_sql}',
+        }
+
+    def measure_sql(self, size, now, label=''):
+        for name, sql in self.range_queries(now).items():
+            self.add_result(size, 'sql' + label, {'label': name, 'p50': self.db.explain_analyze(sql)})
+
+    def try_indexes(self, size, now):
+        """Re-measure the range queries with date-range indexes, then drop them"""
+        try:
+            for name, definition in RANGE_INDEXES.items():
+                self.db.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON {definition}')
+            self.db.execute('ANALYZE "tasks"')
+            self.measure_sql(size, now, label=' +index')
+        finally:
+            self.db.execute('; '.join(f'DROP INDEX IF EXISTS "{name}"' for name in RANGE_INDEXES))
+
+    def measure_sweeps(self, size, now):
+        """Candidate counts and query time, a timed sample of triggers, and the projected sweep"""
+        queries = self.range_queries(now)
+        for kind, trigger_type in [('due soon', 'task_due_soon'), ('overdue', 'task_overdue')]:
+            sql = queries[f"sweep {kind} (all users)"]
+            candidates = int(self.db.scalar(f"SELECT count(*) FROM ({sql}) AS candidates"))
+            query_ms = self.db.explain_analyze(sql)
+            sample = self.db.query(f"{sql} LIMIT {self.args.sweep_sample}")
+            timings = []
+            for task_id, assignee_id in sample:
+                start = time.perf_counter()
+                response = self.client.post("/notifications/trigger", endpoint=f"POST /notifications/trigger {kind}",
+                                            json={'type': trigger_type,
+                                                  'data': {'taskId': task_id, 'assigneeId': assignee_id}})
+                if response.ok:
+                    timings.append((time.perf_counter() - start) * 1000)
+            per_task = summarize(timings)
+            projected = ((query_ms or 0) + (per_task.get('mean') or 0) * candidates) / 1000
+            self.sweeps.append({'size': size, 'kind': kind, 'candidates': candidates, 'queryMs': query_ms,
+                                'sampled': len(timings), 'perTask': per_task, 'projectedSeconds': projected})
+            print(f"   sweep      {kind:<12} {candidates:>7} candidates, query {format_ms(query_ms)}, "
+                  f"{format_ms(per_task.get('p50'))}/notification ({len(timings)} sampled) "
+                  f"→ ~{projected:.1f}s sequential")
+
+    def run(self):
+        print("=" * 80)
+        print("CALENDAR / MY-TASKS DATE-RANGE BENCHMARK")
+        print("=" * 80)
+        self.setup()
+        for size in self.args.sizes:
+            self.grow(size)
+            now = datetime.utcnow()
+            print(f"   {'kind':<10} {'measurement':<36} {'p50':>9} {'max':>9}")
+            self.measure_api(size, now)
+            self.measure_sql(size, now)
+            if self.args.try_index:
+                self.try_indexes(size, now)
+            if self.args.sweep_sample:
+                self.measure_sweeps(size, now)
+            print()
+
+        self.recorder.add_section('calendar', {
+            'projects': self.args.projects, 'years': self.args.years, 'dueSoonHours': self.args.due_soon_hours,
+            'results': self.results, 'sweeps': self.sweeps,
+        })
+        print(f"💾 Results: {self.recorder.save()}")
+        return True
+
+
+def int_list(value):
+    return [int(x) for x in value.split(',')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--database-url', default=None, help="defaults to $DATABASE_URL")
+    parser.add_argument('--sizes', type=int_list, default=[1000, 5000, 20000], help="tasks assigned to the user")
+    parser.add_argument('--projects', type=int, default=50, help="projects the tasks are spread over")
+    parser.add_argument('--years', type=float, default=3.0, help="span of due dates around today")
+    parser.add_argument('--past-ratio', type=float, default=0.75, help="share of due dates before today")
+    parser.add_argument('--undated-ratio', type=float, default=0.1, help="share of tasks without a due date")
+    parser.add_argument('--due-soon-hours', type=float, default=48.0)
+    parser.add_argument('--sweep-sample', type=int, default=20, help="triggers timed per sweep (0 to skip)")
+    parser.add_argument('--try-index', action='store_true', help="compare against date-range indexes")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--timeout', type=int, default=600)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+    return 0 if CalendarBenchmark(args).run() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Traffic capture for /api requests
+
+Requests are appended to a compact JSON-lines log, one request per line:
+
+    {"ts": 1729330000.123, "sid": "a1b2c3", "m": "PATCH", "p": "/api/tasks/clx...",
+     "ct": "application/json", "b": "{...}", "s": 200, "d": 41.7, "ids": ["clx..."]}
+
+``ts`` is the wall-clock send time, ``sid`` the client session, ``d`` the
+observed latency in ms and ``ids`` the ``id`` values found in the JSON
+response (used by harness.replay to remap ids created during replay).
+
+Two capture sources are supported:
+
+    # reverse proxy in front of the app (browsers, testers, anything)
+    python -m harness.capture proxy --listen 8080 --target http://localhost:3000
+
+    # run one of the backend testers with a capturing session
+    python -m harness.capture tester enhanced_backend_test
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from http.cookiejar import DefaultCookiePolicy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+
+from .config import REPO_ROOT, RUNS_DIR
+
+# The proxy tags every client with this cookie so pre- and post-login
+# requests of one browser/tester end up in the same captured session
+SESSION_COOKIE = 'harness-sid'
+HOP_BY_HOP_HEADERS = {
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailers', 'transfer-encoding', 'upgrade', 'content-length', 'content-encoding',
+}
+
+
+def extract_ids(payload, depth=2):
+    """Collect `id` values from a JSON response, in document order"""
+    ids = []
+
+    def walk(node, level):
+        if level > depth:
+            return
+        if isinstance(node, dict):
+            if isinstance(node.get('id'), str):
+                ids.append(node['id'])
+            for key, value in node.items():
+                if key != 'id':
+                    walk(value, level + 1)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item, level)
+
+    walk(payload, 0)
+    return ids
+
+
+def response_ids(content_type, body):
+    if not body or 'json' not in (content_type or ''):
+        return []
+    try:
+        return extract_ids(json.loads(body))
+    except ValueError:
+        return []
+
+
+def decode_body(body):
+    """Request bodies are stored as text; binary bodies are dropped"""
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        try:
+            return body.decode('utf-8')
+        except UnicodeDecodeError:
+            return None
+    return str(body)
+
+
+class TrafficLog:
+    """Append-only JSON-lines request log, safe to share between threads"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+        self.count = 0
+
+    def write(self, session_id, method, path, content_type, body, status, duration_ms, ids=None, sent_at=None):
+        entry = {
+            'ts': round(sent_at if sent_at is not None else time.time(), 6),
+            'sid': session_id,
+            'm': method,
+            'p': path,
+        }
+        if body:
+            entry['ct'] = content_type
+            entry['b'] = body
+        entry['s'] = status
+        entry['d'] = round(duration_ms, 3)
+        if ids:
+            entry['ids'] = ids
+        line = json.dumps(entry, separators=(',', ':'), ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def read_log(path):
+    """Read a capture log, skipping a torn final line from an interrupted capture"""
+    entries = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    entries.sort(key=lambda e: e['ts'])
+    return entries
+
+
+class CapturingSession(requests.Session):
+    """requests.Session that logs every request it sends to a TrafficLog"""
+
+    def __init__(self, log, session_id=None):
+        super().__init__()
+        self.log = log
+        self.session_id = session_id or uuid.uuid4().hex[:12]
+
+    def send(self, request, **kwargs):
+        sent_at = time.time()
+        start = time.perf_counter()
+        status = None
+        response = None
+        try:
+            response = super().send(request, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            url = urlsplit(request.url)
+            path = url.path + (f"?{url.query}" if url.query else '')
+            ids = response_ids(response.headers.get('Content-Type'), response.content) if response is not None else []
+            self.log.write(self.session_id, request.method, path, request.headers.get('Content-Type'),
+                           decode_body(request.body), status, duration_ms, ids=ids, sent_at=sent_at)
+
+
+def session_key(headers):
+    """Client session from the harness header or cookie; None if the client has neither"""
+    if headers.get('X-Harness-Session'):
+        return headers['X-Harness-Session']
+    for part in (headers.get('Cookie') or '').split(';'):
+        name, _, value = part.strip().partition('=')
+        if name == SESSION_COOKIE and value:
+            return value
+    return None
+
+
+def make_proxy_handler(target, log, prefix='/api'):
+    upstream = requests.Session()
+    # Cookies belong to the downstream clients, never to the shared upstream session
+    upstream.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    class CaptureProxyHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _forward(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else None
+            headers = {k: v for k, v in self.headers.items()
+                       if k.lower() not in HOP_BY_HOP_HEADERS and k.lower() != 'host'}
+            sent_at = time.time()
+            start = time.perf_counter()
+            try:
+                response = upstream.request(self.command, f"{target}{self.path}", data=body,
+                                            headers=headers, allow_redirects=False, timeout=120)
+            except requests.RequestException as e:
+                self.send_error(502, f"Upstream error: {type(e).__name__}")
+                return
+            duration_ms = (time.perf_counter() - start) * 1000
+
+            sid = session_key(self.headers)
+            self.send_response(response.status_code)
+            if sid is None:
+                sid = uuid.uuid4().hex[:12]
+                self.send_header('Set-Cookie', f"{SESSION_COOKIE}={sid}; Path=/; HttpOnly; SameSite=Lax")
+            for key, value in response.raw.headers.items():
+                if key.lower() not in HOP_BY_HOP_HEADERS:
+                    self.send_header(key, value)
+            self.send_header('Content-Length', str(len(response.content)))
+            self.end_headers()
+            self.wfile.write(response.content)
+
+            if self.path.startswith(prefix):
+                content_type = response.headers.get('Content-Type')
+                log.write(sid, self.command, self.path,
+                          self.headers.get('Content-Type'), decode_body(body), response.status_code,
+                          duration_ms, ids=response_ids(content_type, response.content), sent_at=sent_at)
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = do_HEAD = _forward
+
+    return CaptureProxyHandler
+
+
+def run_proxy(args, log):
+    server = ThreadingHTTPServer(('0.0.0.0', args.listen), make_proxy_handler(args.target.rstrip('/'), log))
+    print(f"🎙️  Capturing {args.target}/api via http://localhost:{args.listen} -> {log.path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return True
+
+
+# Tester modules in the repo root and the class each one defines
+TESTERS = {
+    'backend_test': ('ProjectManagementAPITester', 'run_all_tests'),
+    'enhanced_backend_test': ('EnhancedProjectManagementAPITester', 'run_all_enhanced_tests'),
+}
+
+
+def run_tester(args, log):
+    class_name, entrypoint = TESTERS[args.module]
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    module = importlib.import_module(args.module)
+    tester = getattr(module, class_name)()
+    if args.base_url:
+        tester.base_url = args.base_url.rstrip('/')
+    tester.session = CapturingSession(log)
+    return getattr(tester, entrypoint)()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--out', default=None, help="capture log to append to")
+    sub = parser.add_subparsers(dest='source', required=True)
+
+    proxy = sub.add_parser('proxy', parents=[common], help="reverse proxy that records /api traffic")
+    proxy.add_argument('--listen', type=int, default=8080)
+    proxy.add_argument('--target', default="http://localhost:3000")
+
+    tester = sub.add_parser('tester', parents=[common], help="run a backend tester with a capturing session")
+    tester.add_argument('module', choices=sorted(TESTERS))
+    tester.add_argument('--base-url', default=None)
+
+    args = parser.parse_args(argv)
+    out = args.out or os.path.join(RUNS_DIR, f"capture-{time.strftime('%Y%m%d-%H%M%S')}.jsonl")
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+    log = TrafficLog(out)
+    try:
+        success = run_proxy(args, log) if args.source == 'proxy' else run_tester(args, log)
+    finally:
+        log.close()
+    print(f"💾 {log.count} requests appended to {out}")
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+HTTP client used by every harness tool
+
+Wraps a requests.Session, signs in through the NextAuth credentials
+provider (the legacy /auth/login endpoint is gone) and times every call
+into an optional RunRecorder.
+"""
+
+import os
+import re
+import time
+import uuid
+from datetime import datetime
+
+import requests
+
+from .capture import CapturingSession
+from .config import BASE_URL, DEFAULT_PASSWORD
+from .timing import install as install_timing, response_timing
+
+# cuid()/uuid path segments are collapsed so samples aggregate per endpoint
+_ID_SEGMENT_RE = re.compile(r'/(?:c[a-z0-9]{20,}|[0-9a-f]{8}-[0-9a-f-]{27,})(?=/|$)')
+
+
+def trace_headers():
+    """W3C traceparent (sampled) plus a request id; returns (headers, trace id, request id)"""
+    trace_id = os.urandom(16).hex()
+    request_id = uuid.uuid4().hex
+    headers = {
+        'traceparent': f"00-{trace_id}-{os.urandom(8).hex()}-01",
+        'X-Request-Id': request_id,
+    }
+    return headers, trace_id, request_id
+
+
+def endpoint_name(method, path):
+    """Normalize "PATCH /tasks/clx..." into "PATCH /tasks/{id}" """
+    path = path.split('?', 1)[0]
+    return f"{method.upper()} {_ID_SEGMENT_RE.sub('/{id}', path) or '/'}"
+
+
+class ApiClient:
+    """Session-aware API client that records latency per endpoint"""
+
+    def __init__(self, base_url=BASE_URL, recorder=None, timeout=30, capture=None):
+        self.base_url = base_url.rstrip('/')
+        # capture: optional harness.capture.TrafficLog receiving every request
+        self.session = install_timing(CapturingSession(capture) if capture else requests.Session())
+        self.recorder = recorder
+        self.timeout = timeout
+        self.user = None
+
+    def request(self, method, path, endpoint=None, **kwargs):
+        """Send a request and record its latency; connection errors are recorded, then re-raised"""
+        kwargs.setdefault('timeout', self.timeout)
+        endpoint = endpoint or endpoint_name(method, path)
+        headers, trace_id, request_id = trace_headers()
+        kwargs['headers'] = {**headers, **(kwargs.get('headers') or {})}
+        ids = {'traceId': trace_id, 'requestId': request_id}
+        if self.recorder:
+            self.recorder.begin()
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+        except requests.RequestException as e:
+            latency_ms = (time.perf_counter() - start) * 1000
+            if self.recorder:
+                self.recorder.record(endpoint, latency_ms, error=type(e).__name__, **ids)
+            raise
+        finally:
+            if self.recorder:
+                self.recorder.end()
+        finished_at = time.perf_counter()
+        latency_ms = (finished_at - start) * 1000
+        if self.recorder:
+            error = f"HTTP {response.status_code}" if response.status_code >= 500 else None
+            self.recorder.record(endpoint, latency_ms, status=response.status_code,
+                                 size=len(response.content), error=error, **ids,
+                                 **(response_timing(response, finished_at) or {}))
+        return response
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.request('PATCH', path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request('PUT', path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request('DELETE', path, **kwargs)
+
+    def register(self, name, email, password=DEFAULT_PASSWORD):
+        """Create a user through /auth/register and return the user payload"""
+        response = self.post("/auth/register", json={
+            'name': name, 'email': email, 'password': password
+        })
+        if response.status_code != 200:
+            raise RuntimeError(f"Registration failed: {response.status_code} - {response.text[:200]}")
+        return response.json()['user']
+
+    def login(self, email, password=DEFAULT_PASSWORD):
+        """Sign in through the NextAuth credentials callback (JWT session cookie)"""
+        csrf = self.get("/auth/csrf").json()['csrfToken']
+        response = self.post("/auth/callback/credentials", data={
+            'csrfToken': csrf,
+            'email': email,
+            'password': password,
+            'json': 'true',
+        }, allow_redirects=False)
+        if response.status_code >= 400 or not self.is_authenticated:
+            raise RuntimeError(f"Login failed for {email}: {response.status_code}")
+        session = self.get("/auth/session").json()
+        self.user = session.get('user')
+        return self.user
+
+    def register_and_login(self, name, email=None, password=DEFAULT_PASSWORD):
+        """Register a fresh user (unique email by default) and sign in as them"""
+        email = email or f"harness.{datetime.now().timestamp()}@example.com"
+        self.register(name, email, password)
+        return self.login(email, password)
+
+    @property
+    def is_authenticated(self):
+        return any('next-auth.session-token' in c.name for c in self.session.cookies)
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Cold-start and first-hit latency benchmark
+
+Starts the Next.js server and the websocket server from scratch, records
+how long each process takes to accept connections, then measures the
+first hits and the steady-state latency of every route under app/api.
+The sign-in requests come first and carry the auth routes, Prisma client
+init and the first pool connections; the route first hits after them
+measure module load / compile on an already warm database path. A
+warm-up script that pre-touches all routes is written next to the
+results.
+
+    python -m harness.cold_start --mode start --steady 20
+"""
+
+import argparse
+import os
+import stat
+import sys
+import time
+
+import requests
+
+from .client import ApiClient, endpoint_name
+from .config import APP_PORT, BASE_URL, DEFAULT_PASSWORD, WS_PORT, WS_URL
+from .results import RunRecorder
+from .routes import discover_routes
+from .servers import next_server, websocket_server
+from .stats import format_ms, summarize
+
+WARMUP_TEMPLATE = """#!/bin/sh
+# Pre-touches every API route so route modules and Prisma are loaded
+# before the instance receives traffic. Generated by harness.cold_start.
+#
+#   BASE_URL=http://localhost:3000/api WARMUP_COOKIE='next-auth.session-token=...' ./warmup.sh
+BASE_URL="${{BASE_URL:-{base_url}}}"
+WS_URL="${{WS_URL:-{ws_url}}}"
+WARMUP_COOKIE="${{WARMUP_COOKIE:-}}"
+
+# Wait for the server to accept connections
+i=0
+until curl -s -o /dev/null "$BASE_URL/auth/csrf"; do
+  i=$((i + 1))
+  [ "$i" -ge 120 ] && echo "server did not come up" && exit 1
+  sleep 1
+done
+
+touch_route() {{
+  curl -s -o /dev/null -w "%{{http_code}} %{{time_total}}s $1 $2\\n" \\
+    -X "$1" -H "Cookie: $WARMUP_COOKIE" "$BASE_URL$2"
+}}
+
+{route_lines}
+
+curl -s -o /dev/null "$WS_URL/socket.io/?EIO=4&transport=polling"
+echo "warm-up complete"
+"""
+
+
+class ColdStartBenchmark:
+    def __init__(self, args):
+        self.args = args
+        self.recorder = RunRecorder('cold-start')
+        self.client = ApiClient(args.base_url, recorder=self.recorder)
+        self.routes = discover_routes()
+        self.processes = []
+        self.first_hits = []
+        self.process_ready = {}
+
+    def start_servers(self):
+        """Start the websocket server and Next.js, timing process readiness"""
+        ws = websocket_server(port=self.args.ws_port, log_path=self.recorder.artifact_path('websocket.log'))
+        app = next_server(self.args.mode, port=self.args.app_port, log_path=self.recorder.artifact_path('next.log'))
+        for process in (ws, app):
+            print(f"🚀 Starting {process.name}: {' '.join(process.command)}")
+            spawned = time.perf_counter()
+            process.start(timeout=self.args.start_timeout)
+            self.processes.append(process)
+            self.process_ready[process.name] = {
+                'readySec': process.ready_seconds,
+                'spawnedAt': spawned,
+            }
+            print(f"   listening after {process.ready_seconds:.2f}s")
+
+    def stop_servers(self):
+        for process in reversed(self.processes):
+            process.stop()
+
+    def authenticate(self):
+        """Sign in so later first hits go through the real session + Prisma path.
+
+        These are the first requests the fresh server sees: they pay for the
+        auth routes, Prisma client init and the first pool connections, so
+        they are recorded as first hits of their own, ahead of the route list.
+        """
+        print("\n⏱️  First hits (sign-in)")
+        since_spawn = time.perf_counter() - self.process_ready['next']['spawnedAt']
+        recorder, self.client.recorder = self.client.recorder, RunRecorder('cold-start-sign-in')
+        try:
+            if self.args.email:
+                self.client.login(self.args.email, self.args.password)
+            else:
+                self.client.register_and_login("Cold Start Bench")
+        finally:
+            sign_in, self.client.recorder = self.client.recorder, recorder
+        for sample in sign_in.samples:
+            self.first_hits.append({
+                'order': len(self.first_hits),
+                'phase': 'sign-in',
+                'endpoint': sample['endpoint'],
+                'status': sample['status'] or sample['error'],
+                'firstHitMs': sample['latencyMs'],
+                'sinceSpawnSec': since_spawn + sample['ts'],
+            })
+            print(f"   {sample['status'] or sample['error']} {format_ms(sample['latencyMs']):>9}  {sample['endpoint']}")
+        print(f"🔑 Signed in as {self.client.user['email']}")
+
+    def probe_route(self, route):
+        """GET if the route exports it; OPTIONS otherwise (loads the module without side effects)"""
+        method = 'GET' if 'GET' in route.methods else 'OPTIONS'
+        return method, route.build_path(self.args.param)
+
+    def measure_first_hits(self):
+        """First request to every route, in discovery order (Prisma and the pool are warm from sign-in)"""
+        print("\n⏱️  First hits (routes, after sign-in)")
+        next_spawned = self.process_ready['next']['spawnedAt']
+        # First hits live in their own section, not in the steady-state samples
+        recorder, self.client.recorder = self.client.recorder, None
+        for route in self.routes:
+            method, path = self.probe_route(route)
+            endpoint = endpoint_name(method, route.template)
+            started = time.perf_counter()
+            try:
+                status = self.client.request(method, path).status_code
+            except requests.RequestException as e:
+                status = type(e).__name__
+            latency_ms = (time.perf_counter() - started) * 1000
+            self.first_hits.append({
+                'order': len(self.first_hits),
+                'phase': 'routes',
+                'endpoint': endpoint,
+                'method': method,
+                'path': path,
+                'status': status,
+                'firstHitMs': latency_ms,
+                'sinceSpawnSec': time.perf_counter() - next_spawned,
+            })
+            print(f"   {status} {format_ms(latency_ms):>9}  {endpoint}")
+        self.client.recorder = recorder
+
+    def measure_websocket(self):
+        """Socket.IO polling handshake: first hit then steady state"""
+        url = f"{self.args.ws_url}/socket.io/?EIO=4&transport=polling"
+        timings = []
+        for _ in range(self.args.steady + 1):
+            started = time.perf_counter()
+            try:
+                requests.get(url, timeout=30)
+                timings.append((time.perf_counter() - started) * 1000)
+            except requests.RequestException:
+                timings.append(None)
+        first, steady = timings[0], [t for t in timings[1:] if t is not None]
+        self.first_hits.append({
+            'order': len(self.first_hits),
+            'endpoint': 'WS socket.io handshake',
+            'status': 'ok' if first is not None else 'error',
+            'firstHitMs': first,
+        })
+        return summarize(steady)
+
+    def measure_steady_state(self):
+        """Repeat every route after the first hits to get warm latency"""
+        print(f"\n🔁 Steady state ({self.args.steady} requests per route)")
+        for route in self.routes:
+            method, path = self.probe_route(route)
+            endpoint = endpoint_name(method, route.template)
+            for _ in range(self.args.steady):
+                try:
+                    self.client.request(method, path, endpoint=endpoint)
+                except requests.RequestException:
+                    pass
+
+    def write_warmup_script(self):
+        """Warm-up script ordered by first-hit cost (most expensive first)"""
+        http_hits = [h for h in self.first_hits if 'path' in h]
+        ordered = sorted(http_hits, key=lambda h: -(h['firstHitMs'] or 0))
+        lines = [
+            f"touch_route {hit['method']} '{hit['path']}'  # first hit {format_ms(hit['firstHitMs'])}"
+            for hit in ordered
+        ]
+        script = WARMUP_TEMPLATE.format(
+            base_url=self.args.base_url, ws_url=self.args.ws_url, route_lines='\n'.join(lines)
+        )
+        path = self.recorder.artifact_path('warmup.sh')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(script)
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        return path
+
+    def print_summary(self, ws_steady):
+        print("=" * 80)
+        print("COLD START SUMMARY")
+        print("=" * 80)
+        for name, info in self.process_ready.items():
+            print(f"🟢 {name} ready in {info['readySec']:.2f}s")
+        summary = self.recorder.endpoint_summary()
+        print(f"\n{'endpoint':<52} {'first':>9} {'p50':>9} {'p99':>9}")
+        for hit in self.first_hits:
+            steady = ws_steady if hit['endpoint'].startswith('WS ') else summary.get(hit['endpoint'], {})
+            print(f"{hit['endpoint'][:52]:<52} {format_ms(hit['firstHitMs']):>9} "
+                  f"{format_ms(steady.get('p50')):>9} {format_ms(steady.get('p99')):>9}")
+
+    def run(self):
+        print("=" * 80)
+        print("COLD START / FIRST-HIT BENCHMARK")
+        print("=" * 80)
+        print(f"Discovered {len(self.routes)} API routes")
+        try:
+            self.start_servers()
+            self.authenticate()
+            self.measure_first_hits()
+            ws_steady = self.measure_websocket()
+            self.measure_steady_state()
+        finally:
+            self.stop_servers()
+
+        self.recorder.add_section('coldStart', {
+            'mode': self.args.mode,
+            'processReady': {k: v['readySec'] for k, v in self.process_ready.items()},
+            'firstHits': self.first_hits,
+            'websocketSteady': ws_steady,
+        })
+        self.print_summary(ws_steady)
+        warmup = self.write_warmup_script()
+        print(f"\n📝 Warm-up script: {warmup}")
+        print(f"💾 Results: {self.recorder.save()}")
+        return True
+
+
+def parse_param(value):
+    name, _, param_value = value.partition('=')
+    return name, param_value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=['start', 'dev'], default='start',
+                        help="`next start` (after `next build`, as deployed) or `next dev`")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--ws-url', default=WS_URL)
+    parser.add_argument('--app-port', type=int, default=APP_PORT)
+    parser.add_argument('--ws-port', type=int, default=WS_PORT)
+    parser.add_argument('--steady', type=int, default=20, help="steady-state requests per route")
+    parser.add_argument('--start-timeout', type=int, default=180)
+    parser.add_argument('--email', help="existing user to sign in as (default: register a new one)")
+    parser.add_argument('--password', default=DEFAULT_PASSWORD)
+    parser.add_argument('--param', type=parse_param, action='append', default=[],
+                        help="value for a dynamic route segment, e.g. --param id=<projectId>")
+    args = parser.parse_args(argv)
+    args.param = dict(args.param)
+
+    benchmark = ColdStartBenchmark(args)
+    return 0 if benchmark.run() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+"""
+Shared configuration for the performance harness
+"""
+
+import os
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Same defaults as the backend testers; override for remote targets
+BASE_URL = os.environ.get('HARNESS_BASE_URL', "http://localhost:3000/api")
+WS_URL = os.environ.get('HARNESS_WS_URL', "http://localhost:3001")
+
+APP_PORT = int(os.environ.get('HARNESS_APP_PORT', 3000))
+WS_PORT = int(os.environ.get('HARNESS_WS_PORT', 3001))
+
+# Every run stores its measurements under RUNS_DIR/<run-id>/
+RUNS_DIR = os.environ.get('HARNESS_RUNS_DIR', os.path.join(REPO_ROOT, 'bench_runs'))
+
+# Golden database manifests and pg_dump snapshot files
+SNAPSHOTS_DIR = os.environ.get('HARNESS_SNAPSHOTS_DIR', os.path.join(REPO_ROOT, 'bench_snapshots'))
+
+# Password used for every user the harness registers
+DEFAULT_PASSWORD = "HarnessPass123!"
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Concurrency correctness under parallel task updates
+
+Several project members PATCH the same few tasks at once; every operation
+is recorded with its invoke/complete times, payload and outcome. Once the
+writers finish, the history is checked against what the app ended up
+with, the way a linearizability checker treats each task field as a
+register:
+
+    final state   every field's final value was written by an operation
+                  that is not followed, in real time, by another
+                  acknowledged write to that field (otherwise: lost update)
+    responses     each acknowledged PATCH returned its own write
+    activity log  exactly one TASK_UPDATED/TASK_COMPLETED row per
+                  acknowledged write, none for rejected ones, attributed to
+                  the writer and ordered consistently with real time
+                  (needs DATABASE_URL and psql; skipped otherwise)
+
+Timeouts and 5xx responses are "unknown": the write may or may not have
+happened, so either outcome is accepted for them.
+
+    python -m harness.consistency --writers 16 --tasks 3 --ops 100
+    DATABASE_URL=postgres://... python -m harness.consistency --writers 32 --tasks 1
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+
+import requests
+
+from .client import ApiClient
+from .config import BASE_URL
+from .db import Database, DatabaseError
+from .results import RunRecorder
+from .seed import ApiSeeder
+from .stats import format_ms, percentile
+
+FIELDS = ['title', 'status', 'priority']
+STATUSES = ['TODO', 'IN_PROGRESS', 'IN_REVIEW', 'DONE']
+PRIORITIES = ['LOW', 'MEDIUM', 'HIGH', 'URGENT']
+
+
+def check_final_state(history, final):
+    """Lost or phantom values per task field; final is {taskId: task payload}"""
+    violations = []
+    for task_id, task in final.items():
+        ops = [op for op in history if op['task'] == task_id and op['outcome'] != 'failed']
+        for field in FIELDS:
+            writes = [op for op in ops if field in op['payload']]
+            acknowledged = [op for op in writes if op['outcome'] == 'ok']
+            value = task.get(field)
+            candidates = [op for op in writes if op['payload'][field] == value]
+            if not candidates:
+                if acknowledged:
+                    violations.append({'kind': 'phantom-value', 'task': task_id, 'field': field, 'value': value})
+                continue
+            # The final value is legal if one of its writers may have been the last write to take effect:
+            # no acknowledged write to the field started after that writer had already completed.
+            last_invoke = max((op['invoke'] for op in acknowledged), default=float('-inf'))
+            if not any((op['complete'] if op['outcome'] == 'ok' else float('inf')) >= last_invoke
+                       for op in candidates):
+                overwritten_by = max(acknowledged, key=lambda op: op['invoke'])
+                violations.append({'kind': 'lost-update', 'task': task_id, 'field': field, 'value': value,
+                                   'lost': overwritten_by['id']})
+    return violations
+
+
+def check_responses(history):
+    """Acknowledged PATCHes must return the row with their own write applied"""
+    violations = []
+    for op in history:
+        if op['outcome'] != 'ok':
+            continue
+        returned = op.get('returned') or {}
+        for field, value in op['payload'].items():
+            if returned.get(field) != value:
+                violations.append({'kind': 'stale-response', 'op': op['id'], 'field': field,
+                                   'sent': value, 'returned': returned.get(field)})
+    return violations
+
+
+def check_activities(history, rows):
+    """rows: (opId or None, userId, createdAt epoch) per activity on the contended tasks"""
+    violations = []
+    by_op = {}
+    for op_id, user_id, created in rows:
+        by_op.setdefault(op_id, []).append((user_id, created))
+    for op in history:
+        found = by_op.get(op['id'], [])
+        if op['outcome'] == 'ok' and not found:
+            violations.append({'kind': 'missing-activity', 'op': op['id']})
+        elif op['outcome'] == 'failed' and found:
+            violations.append({'kind': 'phantom-activity', 'op': op['id']})
+        if len(found) > 1:
+            violations.append({'kind': 'duplicate-activity', 'op': op['id'], 'count': len(found)})
+        if found and any(user_id != op['userId'] for user_id, _ in found):
+            violations.append({'kind': 'misattributed-activity', 'op': op['id']})
+    unmatched = len(by_op.get(None, []))
+    if unmatched:
+        violations.append({'kind': 'unexpected-activity', 'count': unmatched})
+
+    # An operation that finished before another started must not be logged after it
+    logged = sorted((op for op in history if op['outcome'] == 'ok' and len(by_op.get(op['id'], [])) == 1),
+                    key=lambda op: op['invoke'])
+    latest_complete = None
+    for op in logged:
+        created = by_op[op['id']][0][1]
+        if latest_complete and latest_complete['complete'] < op['invoke'] \
+                and by_op[latest_complete['id']][0][1] > created:
+            violations.append({'kind': 'reordered-activity', 'op': op['id'], 'after': latest_complete['id']})
+        if latest_complete is None or op['complete'] > latest_complete['complete']:
+            latest_complete = op
+    return violations
+
+
+class ConsistencyChecker:
+    def __init__(self, args):
+        self.args = args
+        self.recorder = RunRecorder('consistency')
+        self.tag = f"cc{uuid.uuid4().hex[:6]}"
+        self.owner = ApiClient(args.base_url, recorder=self.recorder, timeout=args.timeout)
+        self.writers = []
+        self.tasks = []
+        self.project_id = None
+        self.history = []
+        self._lock = threading.Lock()
+        self.db = None
+        try:
+            self.db = Database(args.database_url)
+        except DatabaseError as e:
+            print(f"Activity log check skipped: {e}")
+
+    def setup(self):
+        print(f"🌱 {self.args.writers} writers on {self.args.tasks} shared tasks...")
+        self.owner.register_and_login("Consistency Owner")
+        seeder = ApiSeeder(self.owner, self.args.base_url, namespace=self.tag)
+        self.project_id = seeder.create_project()
+        self.tasks = seeder.add_tasks(self.project_id, self.args.tasks)
+        seeder.add_members(self.project_id, self.args.writers - 1)
+        self.writers = [self.owner]
+        for account in seeder.accounts:
+            client = ApiClient(self.args.base_url, recorder=self.recorder, timeout=self.args.timeout)
+            client.login(account['email'], account['password'])
+            self.writers.append(client)
+
+    def write(self, writer, client, n, rng):
+        op_id = f"{self.tag}-w{writer}-{n}"
+        payload = {'title': f"Contended {op_id}"}
+        if rng.random() < self.args.status_ratio:
+            payload['status'] = rng.choice(STATUSES)
+        if rng.random() < self.args.priority_ratio:
+            payload['priority'] = rng.choice(PRIORITIES)
+        op = {'id': op_id, 'writer': writer, 'userId': client.user['id'], 'task': rng.choice(self.tasks),
+              'payload': payload, 'invoke': time.perf_counter()}
+        try:
+            response = client.patch(f"/tasks/{op['task']}", json=payload)
+            op['httpStatus'] = response.status_code
+            if 200 <= response.status_code < 300:
+                op['outcome'] = 'ok'
+                op['returned'] = {f: response.json()['task'].get(f) for f in FIELDS}
+            else:
+                op['outcome'] = 'unknown' if response.status_code >= 500 else 'failed'
+        except requests.RequestException as e:
+            op['outcome'] = 'unknown'
+            op['error'] = type(e).__name__
+        op['complete'] = time.perf_counter()
+        with self._lock:
+            self.history.append(op)
+
+    def run_writer(self, writer, client, barrier):
+        rng = random.Random(f"{self.tag}-{writer}")
+        barrier.wait()
+        for n in range(self.args.ops):
+            self.write(writer, client, n, rng)
+
+    def final_state(self):
+        final = {}
+        for task_id in self.tasks:
+            response = self.owner.get(f"/tasks/{task_id}")
+            response.raise_for_status()
+            final[task_id] = response.json()['task']
+        return final
+
+    def activity_rows(self):
+        ids = ', '.join(f"'{task_id}'" for task_id in self.tasks)
+        rows = self.db.query(
+            'SELECT content, "userId", extract(epoch FROM "createdAt") FROM activities '
+            f"WHERE \"taskId\" IN ({ids}) AND type IN ('TASK_UPDATED', 'TASK_COMPLETED') "
+            f"AND content LIKE '%Contended {self.tag}-%'"
+        )
+        pattern = re.compile(re.escape(self.tag) + r'-w\d+-\d+')
+        result = []
+        for content, user_id, created in rows:
+            match = pattern.search(content)
+            result.append((match.group(0) if match else None, user_id, float(created)))
+        return result
+
+    def run(self):
+        print("=" * 80)
+        print("CONCURRENT TASK UPDATE CONSISTENCY")
+        print("=" * 80)
+        self.setup()
+        barrier = threading.Barrier(len(self.writers))
+        threads = [threading.Thread(target=self.run_writer, args=(i, client, barrier))
+                   for i, client in enumerate(self.writers)]
+        print(f"🚀 {len(threads)} writers x {self.args.ops} PATCHes...")
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        with open(self.recorder.artifact_path('history.jsonl'), 'w', encoding='utf-8') as f:
+            for op in sorted(self.history, key=lambda op: op['invoke']):
+                f.write(json.dumps(op) + "\n")
+
+        violations = check_responses(self.history) + check_final_state(self.history, self.final_state())
+        activity_checked = self.db is not None
+        if activity_checked:
+            violations += check_activities(self.history, self.activity_rows())
+
+        outcomes = {}
+        for op in self.history:
+            outcomes[op['outcome']] = outcomes.get(op['outcome'], 0) + 1
+        latencies = [(op['complete'] - op['invoke']) * 1000 for op in self.history if op['outcome'] == 'ok']
+        kinds = {}
+        for violation in violations:
+            kinds[violation['kind']] = kinds.get(violation['kind'], 0) + 1
+        summary = {
+            'writers': len(self.writers),
+            'tasks': len(self.tasks),
+            'operations': len(self.history),
+            'outcomes': outcomes,
+            'throughputOps': len(self.history) / elapsed,
+            'latencyMs': {'p50': percentile(latencies, 50), 'p99': percentile(latencies, 99)},
+            'activityChecked': activity_checked,
+            'violationsByKind': kinds,
+            'violations': violations[:200],
+        }
+        self.recorder.add_section('consistency', summary)
+
+        print(f"\n📊 {len(self.history)} operations in {elapsed:.1f}s ({summary['throughputOps']:.1f} ops/s), "
+              f"p50 {format_ms(summary['latencyMs']['p50'])} / p99 {format_ms(summary['latencyMs']['p99'])}")
+        print("   " + ", ".join(f"{name}: {count}" for name, count in sorted(outcomes.items())))
+        if violations:
+            for kind, count in sorted(kinds.items()):
+                print(f"🚨 {kind}: {count}")
+            for violation in violations[:10]:
+                print(f"   {violation}")
+        else:
+            checked = "final state, responses and activity log" if activity_checked else "final state and responses"
+            print(f"✅ History is consistent ({checked})")
+        print(f"\n💾 Results: {self.recorder.save()}")
+        return not violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--database-url', default=None, help="defaults to $DATABASE_URL; enables the activity check")
+    parser.add_argument('--writers', type=int, default=8, help="concurrent members (the first is the owner)")
+    parser.add_argument('--tasks', type=int, default=3, help="shared tasks; fewer means more contention")
+    parser.add_argument('--ops', type=int, default=50, help="PATCHes per writer")
+    parser.add_argument('--status-ratio', type=float, default=0.5, help="share of PATCHes that also set status")
+    parser.add_argument('--priority-ratio', type=float, default=0.5, help="share of PATCHes that also set priority")
+    parser.add_argument('--timeout', type=int, default=30)
+    args = parser.parse_args(argv)
+    return 0 if ConsistencyChecker(args).run() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
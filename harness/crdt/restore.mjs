@@ -0,0 +1,86 @@
+// Restore timings for lib/crdt/DocumentManager.js; driven by `python -m harness.documents`.
+//
+//   node --expose-gc harness/crdt/restore.mjs documents.json > restore.jsonl
+//
+// documents.json is a list of {label, document, peers} where document has the
+// exportDocument() shape. For each one it prints a JSON line with the parse,
+// importDocument() and exportDocument() round-trip times, the size of the Yjs
+// update that would carry the same state (presence of every historical peer
+// included), applying that update to a fresh Y.Doc, and the heap each open
+// document holds. Needs the app's node_modules (yjs, nanoid).
+//
+// DocumentManager.js is an ES module in a CommonJS package, so it is copied to
+// node_modules/.cache/harness/ as .mjs; bare imports still resolve from there.
+
+import fs from 'node:fs'
+import path from 'node:path'
+import { fileURLToPath, pathToFileURL } from 'node:url'
+import { performance } from 'node:perf_hooks'
+
+const repoRoot = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..', '..')
+const cacheDir = path.join(repoRoot, 'node_modules', '.cache', 'harness')
+fs.mkdirSync(cacheDir, { recursive: true })
+const modulePath = path.join(cacheDir, 'DocumentManager.mjs')
+fs.copyFileSync(path.join(repoRoot, 'lib', 'crdt', 'DocumentManager.js'), modulePath)
+
+const { DocumentManager } = await import(pathToFileURL(modulePath).href)
+const Y = await import('yjs')
+
+const OPEN_COPIES = 5  // documents kept open at once for the heap estimate
+const gc = globalThis.gc || (() => {})
+
+function time(fn) {
+  const start = performance.now()
+  const result = fn()
+  return [performance.now() - start, result]
+}
+
+function heapUsed() {
+  gc()
+  gc()
+  return process.memoryUsage().heapUsed
+}
+
+const entries = JSON.parse(fs.readFileSync(process.argv[2], 'utf8'))
+for (const { label, document, peers } of entries) {
+  const serialized = JSON.stringify(document)
+  const [parseMs, parsed] = time(() => JSON.parse(serialized))
+
+  const manager = new DocumentManager(`bench-${label}`)
+  const [importMs] = time(() => manager.importDocument(parsed))
+  const [exportMs, exported] = time(() => JSON.stringify(manager.exportDocument()))
+  manager.ydoc.transact(() => {
+    for (const peer of peers) {
+      manager.updatePresence(peer, { cursor: { x: 0, y: 0 }, selectedElementIds: [] })
+    }
+  })
+  const [encodeMs, update] = time(() => Y.encodeStateAsUpdateV2(manager.ydoc))
+  const [applyMs] = time(() => {
+    const fresh = new Y.Doc()
+    Y.applyUpdateV2(fresh, update)
+    fresh.destroy()
+  })
+  manager.destroy()
+
+  const before = heapUsed()
+  const open = []
+  for (let i = 0; i < OPEN_COPIES; i++) {
+    const copy = new DocumentManager(`bench-${label}-${i}`)
+    copy.importDocument(JSON.parse(serialized))
+    open.push(copy)
+  }
+  const heapPerDoc = (heapUsed() - before) / OPEN_COPIES
+  open.forEach(copy => copy.destroy())
+
+  process.stdout.write(JSON.stringify({
+    label,
+    parseMs,
+    importMs,
+    exportMs,
+    exportBytes: exported.length,
+    yjsUpdateBytes: update.length,
+    yjsEncodeMs: encodeMs,
+    yjsApplyMs: applyMs,
+    heapPerDocBytes: globalThis.gc ? heapPerDoc : null,
+  }) + '\n')
+}
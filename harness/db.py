@@ -0,0 +1,107 @@
+"""
+Direct Postgres access for seeding and inspection
+
+Uses the `psql` client rather than a Python driver so the harness needs
+nothing beyond the Postgres client tools. DATABASE_URL is the same
+connection string Prisma uses (its ``?schema=`` parameter is stripped,
+libpq does not understand it).
+"""
+
+import csv
+import io
+import os
+import random
+import shutil
+import string
+import subprocess
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_CUID_ALPHABET = string.ascii_lowercase + string.digits
+
+
+def libpq_url(url):
+    """Drop Prisma-only query parameters from a connection string"""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k not in ('schema', 'connection_limit', 'pool_timeout')]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def new_id(rng=random):
+    """cuid-shaped id (25 chars, leading 'c') for rows seeded outside Prisma"""
+    return 'c' + ''.join(rng.choice(_CUID_ALPHABET) for _ in range(24))
+
+
+def quote_ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+class DatabaseError(RuntimeError):
+    """psql exited with an error"""
+
+
+class Database:
+    def __init__(self, url=None):
+        url = url or os.environ.get('DATABASE_URL')
+        if not url:
+            raise DatabaseError("DATABASE_URL is not set")
+        if not shutil.which('psql'):
+            raise DatabaseError("psql is required for direct database access")
+        self.prisma_url = url
+        self.url = libpq_url(url)
+
+    @property
+    def name(self):
+        return urlsplit(self.url).path.lstrip('/')
+
+    def with_database(self, name):
+        """Same server and credentials, different database"""
+        clone = Database.__new__(Database)
+        clone.url = urlunsplit(urlsplit(self.url)._replace(path=f"/{name}"))
+        clone.prisma_url = urlunsplit(urlsplit(self.prisma_url)._replace(path=f"/{name}"))
+        return clone
+
+    def _psql(self, args, input=None, timeout=None):
+        result = subprocess.run(
+            ['psql', self.url, '-v', 'ON_ERROR_STOP=1', '-X', '-q'] + args,
+            input=input, capture_output=True, text=True, timeout=timeout
+        )
+        if result.returncode != 0:
+            raise DatabaseError(result.stderr.strip() or f"psql exited with {result.returncode}")
+        return result.stdout
+
+    def execute(self, sql, timeout=None):
+        """Run one or more statements; returns elapsed seconds"""
+        start = time.perf_counter()
+        self._psql(['-c', sql], timeout=timeout)
+        return time.perf_counter() - start
+
+    def query(self, sql, timeout=None):
+        """Rows as lists of strings (tab separated, unaligned output)"""
+        out = self._psql(['-A', '-t', '-F', '\t', '-c', sql], timeout=timeout)
+        return [line.split('\t') for line in out.splitlines() if line]
+
+    def scalar(self, sql):
+        rows = self.query(sql)
+        return rows[0][0] if rows else None
+
+    def copy_rows(self, table, columns, rows, timeout=None):
+        """Bulk insert with COPY ... FROM STDIN (CSV); returns the row count"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        count = 0
+        for row in rows:
+            writer.writerow(['\\N' if value is None else value for value in row])
+            count += 1
+        column_list = ', '.join(quote_ident(c) for c in columns)
+        self._psql(['-c', f"COPY {quote_ident(table)} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"],
+                   input=buffer.getvalue(), timeout=timeout)
+        return count
+
+    def explain_analyze(self, sql):
+        """Execution time (ms) reported by EXPLAIN ANALYZE"""
+        plan = self.query(f"EXPLAIN (ANALYZE, FORMAT TEXT) {sql}")
+        for (line,) in plan:
+            if line.strip().startswith('Execution Time:'):
+                return float(line.split(':')[1].split()[0])
+        return None
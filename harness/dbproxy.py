@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+"""
+Latency and fault injection proxy in front of Postgres
+
+A TCP proxy between the app processes and the database that adds
+round-trip latency, jitter, a bandwidth cap and connection resets. The
+faults can be changed while traffic flows, so each scenario phase can
+run under different network conditions:
+
+    # start both app processes on a proxied DATABASE_URL and sweep the added RTT
+    DATABASE_URL=postgres://... python -m harness.dbproxy sweep --rtt 0,1,2,5,10,20 --requests 30
+
+    # or run just the proxy and start the app against the URL it prints
+    DATABASE_URL=postgres://... python -m harness.dbproxy serve --listen 6543 --rtt 2 --jitter 0.5
+
+sweep runs a set of probes per phase: the multi-query routes
+(/dashboard/stats, /projects, PATCH /inbox, ...) and a Socket.IO
+workspace-update, which awaits its database save before confirming.
+Per probe it fits latency against the added RTT; the slope is the number
+of sequential database round trips on the request path. It then projects
+the probe's latency at --target-rtt, which estimates the cost of moving
+the database (e.g. to another availability zone). Phases with resets also
+count the workspace updates that were confirmed although the save failed
+("continues with broadcast even if DB save fails").
+
+--phases takes a JSON list instead of --rtt:
+    [{"name": "cross-az", "rttMs": 2, "jitterMs": 0.5},
+     {"name": "flaky", "rttMs": 2, "resetRate": 0.5},
+     {"name": "thin-pipe", "bandwidthKbps": 512}]
+rttMs is split evenly between the two directions; resetRate is average
+connection resets per second across the proxy.
+"""
+
+import argparse
+import json
+import os
+import queue
+import random
+import re
+import socket
+import struct
+import sys
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+from .client import ApiClient
+from .config import APP_PORT, WS_PORT
+from .overload import LogWatcher
+from .results import RunRecorder
+from .servers import next_server, websocket_server
+from .sockets import PollingSocket
+from .stats import format_ms, summarize
+
+NO_FAULTS = {'rttMs': 0.0, 'jitterMs': 0.0, 'bandwidthKbps': None, 'resetRate': 0.0}
+SAVE_FAILED_RE = re.compile(r'Database save failed')
+DEFAULT_PROBES = ['dashboard_stats', 'projects', 'project_detail', 'inbox_list', 'inbox_mark_read',
+                  'task_update', 'workspace_update']
+
+
+def _hard_close(sock):
+    """Close with SO_LINGER 0 so the peer sees a RST, like a dropped connection"""
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+    except OSError:
+        pass
+    sock.close()
+
+
+class _Pipe:
+    """One direction of a proxied connection: a reader stamps chunks with a due time, a writer releases them"""
+
+    def __init__(self, link, src, dst, direction):
+        self.link = link
+        self.src = src
+        self.dst = dst
+        self.direction = direction
+        self.queue = queue.Queue()
+        self.last_due = 0.0
+        self.next_free = 0.0
+
+    def start(self):
+        for target in (self._read, self._write):
+            threading.Thread(target=target, daemon=True).start()
+
+    def _read(self):
+        proxy = self.link.proxy
+        try:
+            while True:
+                data = self.src.recv(65536)
+                if not data:
+                    break
+                faults = proxy.faults
+                one_way = faults['rttMs'] / 2 + random.uniform(-faults['jitterMs'], faults['jitterMs']) / 2
+                # TCP never reorders, so jitter can delay a chunk but not overtake the previous one
+                self.last_due = max(time.perf_counter() + max(one_way, 0) / 1000, self.last_due)
+                self.queue.put((self.last_due, data))
+        except OSError:
+            pass
+        self.queue.put(None)
+
+    def _write(self):
+        proxy = self.link.proxy
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    self.dst.shutdown(socket.SHUT_WR)
+                    break
+                due, data = item
+                kbps = proxy.faults['bandwidthKbps']
+                if kbps:
+                    # A chunk is delivered once its last byte is through the link, even on an idle one
+                    due = max(due, self.next_free) + len(data) * 8 / (kbps * 1000)
+                    self.next_free = due
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                self.dst.sendall(data)
+                proxy.count(self.direction, len(data))
+        except OSError:
+            pass
+        self.link.pipe_done()
+
+
+class _Link:
+    """A client connection and its upstream connection"""
+
+    def __init__(self, proxy, client, upstream):
+        self.proxy = proxy
+        self.client = client
+        self.upstream = upstream
+        self.open_pipes = 2
+        self.closed = False
+        self._lock = threading.Lock()
+        self.pipes = [_Pipe(self, client, upstream, 'bytesUp'), _Pipe(self, upstream, client, 'bytesDown')]
+
+    def start(self):
+        for pipe in self.pipes:
+            pipe.start()
+
+    def pipe_done(self):
+        with self._lock:
+            self.open_pipes -= 1
+            done = self.open_pipes == 0
+        if done:
+            self.close()
+
+    def close(self, reset=False):
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+        for sock in (self.client, self.upstream):
+            if reset:
+                _hard_close(sock)
+            else:
+                sock.close()
+        self.proxy.forget(self)
+
+
+class FaultProxy:
+    """TCP proxy to upstream_host:upstream_port; apply() swaps the faults at any time"""
+
+    def __init__(self, upstream_host, upstream_port, listen_port=0, host='127.0.0.1'):
+        self.upstream = (upstream_host, upstream_port)
+        self.host = host
+        self.listen_port = listen_port
+        self.faults = dict(NO_FAULTS)
+        self.links = set()
+        self.counters = {'connections': 0, 'resets': 0, 'refused': 0, 'bytesUp': 0, 'bytesDown': 0}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._server = None
+
+    @property
+    def port(self):
+        return self._server.getsockname()[1]
+
+    def apply(self, faults):
+        self.faults = dict(NO_FAULTS, **{k: v for k, v in faults.items() if k in NO_FAULTS})
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def forget(self, link):
+        with self._lock:
+            self.links.discard(link)
+
+    def start(self):
+        self._server = socket.create_server((self.host, self.listen_port))
+        threading.Thread(target=self._accept, daemon=True).start()
+        threading.Thread(target=self._chaos, daemon=True).start()
+        return self
+
+    def _accept(self):
+        while not self._stop.is_set():
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                return
+            try:
+                upstream = socket.create_connection(self.upstream, timeout=10)
+                upstream.settimeout(None)
+            except OSError:
+                self.count('refused')
+                _hard_close(client)
+                continue
+            for sock in (client, upstream):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            link = _Link(self, client, upstream)
+            with self._lock:
+                self.links.add(link)
+                self.counters['connections'] += 1
+            link.start()
+
+    def _chaos(self):
+        """Resets random open connections at resetRate per second (Poisson arrivals)"""
+        while not self._stop.is_set():
+            rate = self.faults['resetRate']
+            if not rate:
+                self._stop.wait(0.1)
+                continue
+            if self._stop.wait(random.expovariate(rate)):
+                return
+            self.reset(1)
+
+    def reset(self, n=None):
+        """Reset n random open connections (all when n is None); returns how many"""
+        with self._lock:
+            links = list(self.links)
+        victims = links if n is None else random.sample(links, min(n, len(links)))
+        for link in victims:
+            link.close(reset=True)
+        self.count('resets', len(victims))
+        return len(victims)
+
+    def close(self):
+        self._stop.set()
+        if self._server:
+            self._server.close()
+        self.reset()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def proxied_url(database_url, port, host='127.0.0.1'):
+    """The same DATABASE_URL with its host:port pointed at the proxy"""
+    parts = urlsplit(database_url)
+    credentials = parts.netloc.rpartition('@')[0]
+    netloc = f"{credentials}@{host}:{port}" if credentials else f"{host}:{port}"
+    return urlunsplit(parts._replace(netloc=netloc))
+
+
+def fit_slope(points):
+    """Least-squares slope of [(x, y), ...]; None with fewer than two distinct x"""
+    if len({x for x, _ in points}) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    return (sum((x - mean_x) * (y - mean_y) for x, y in points)
+            / sum((x - mean_x) ** 2 for x, _ in points))
+
+
+class _WorkspaceProbe:
+    """A Socket.IO client that holds the edit lock and times workspace-update until update-confirmed"""
+
+    def __init__(self, ws_url, user_id, workspace_id):
+        self.user_id = user_id
+        self.workspace_id = workspace_id
+        self.events = []
+        self.socket = PollingSocket(ws_url, user_id, on_event=lambda name, data: self.events.append((name, data)))
+        self.socket.open()
+        self.socket.emit('join-workspace', {'workspaceId': workspace_id, 'userId': user_id})
+        self.revision = 0
+
+    def _wait_for(self, names, timeout):
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            for i, (name, data) in enumerate(self.events):
+                if name in names:
+                    del self.events[:i + 1]
+                    return name, data
+            if not self.socket.poll_once():
+                raise RuntimeError("Socket.IO session closed")
+        raise TimeoutError(f"no {'/'.join(names)} within {timeout}s")
+
+    def lock(self, timeout):
+        self.socket.emit('request-edit-lock', {'workspaceId': self.workspace_id, 'userId': self.user_id})
+        name, data = self._wait_for({'edit-lock-granted', 'edit-lock-denied'}, timeout)
+        if name == 'edit-lock-denied':
+            raise RuntimeError(f"edit lock denied: {data}")
+
+    def update(self, timeout):
+        """One timed update; re-takes the lock when the server's 30s lock timeout released it"""
+        for _ in range(2):
+            self.revision += 1
+            self.socket.emit('workspace-update', {
+                'workspaceId': self.workspace_id, 'userId': self.user_id, 'appState': {},
+                'elements': [{'id': 'probe', 'type': 'rectangle', 'version': self.revision}],
+            })
+            name, data = self._wait_for({'update-confirmed', 'error'}, timeout)
+            if name == 'update-confirmed':
+                return 200
+            if 'lock' not in (data or {}).get('message', ''):
+                return 500
+            self.lock(timeout)
+        return 403
+
+    def close(self):
+        self.socket.close()
+
+
+class DbLatencySweep:
+    def __init__(self, args):
+        self.args = args
+        self.recorder = RunRecorder('dbproxy')
+        self.phases = []
+        self.state = {}
+
+    def setup(self):
+        args = self.args
+        owner = ApiClient(args.base_url, timeout=args.timeout)
+        owner.register_and_login("DB Proxy Owner")
+        member = ApiClient(args.base_url, timeout=args.timeout)
+        member.register_and_login("DB Proxy Member")
+        project = owner.post("/projects", json={'name': "DB proxy sweep", 'description': "harness.dbproxy"})
+        project.raise_for_status()
+        project_id = project.json()['project']['id']
+        for i in range(args.tasks):
+            owner.post(f"/projects/{project_id}/tasks", json={'title': f"Proxy task {i}", 'priority': 'MEDIUM',
+                                                              'assigneeId': member.user['id'] if i % 2 else None})
+        # The invitation leaves an item in the member's inbox for the PATCH /inbox probe
+        owner.post(f"/projects/{project_id}/invite", json={'email': member.user['email'], 'role': 'MEMBER'})
+        tasks = owner.get(f"/projects/{project_id}/tasks").json()['tasks']
+        inbox_ids = [item['id'] for item in member.get("/inbox").json().get('items', [])]
+        self.state = {'owner': owner, 'member': member, 'project_id': project_id, 'task_id': tasks[0]['id'],
+                      'inbox_ids': inbox_ids, 'flip': 0}
+        if 'workspace_update' in args.probes:
+            workspace = owner.post(f"/projects/{project_id}/workspaces", json={'name': "Proxy board"})
+            workspace.raise_for_status()
+            probe = _WorkspaceProbe(args.ws_url, owner.user['id'], workspace.json()['workspace']['id'])
+            probe.lock(args.timeout)
+            self.state['workspace'] = probe
+
+    def probe(self, name):
+        s = self.state
+        if name == 'workspace_update':
+            return s['workspace'].update(self.args.timeout)
+        if name == 'dashboard_stats':
+            return s['owner'].get("/dashboard/stats").status_code
+        if name == 'projects':
+            return s['owner'].get("/projects").status_code
+        if name == 'project_detail':
+            return s['owner'].get(f"/projects/{s['project_id']}").status_code
+        if name == 'inbox_list':
+            return s['member'].get("/inbox").status_code
+        if name == 'inbox_mark_read':
+            s['flip'] ^= 1
+            action = 'mark_read' if s['flip'] else 'mark_unread'
+            return s['member'].patch("/inbox", json={'action': action, 'ids': s['inbox_ids']}).status_code
+        if name == 'task_update':
+            s['flip'] ^= 1
+            priority = 'HIGH' if s['flip'] else 'LOW'
+            return s['owner'].patch(f"/tasks/{s['task_id']}", json={'priority': priority}).status_code
+        raise ValueError(f"unknown probe {name!r}")
+
+    def run_phase(self, proxy, phase, ws_log):
+        args = self.args
+        faults = dict(NO_FAULTS, **{k: v for k, v in phase.items() if k in NO_FAULTS})
+        proxy.apply(faults)
+        before = dict(proxy.counters)
+        ws_log.new_errors()
+        for _ in range(args.warmup):
+            for name in args.probes:
+                self._timed(name)
+        latencies = {name: [] for name in args.probes}
+        errors = {name: 0 for name in args.probes}
+        for _ in range(args.requests):
+            for name in args.probes:  # interleaved, so drift hits every probe alike
+                ms, ok = self._timed(name)
+                self.recorder.record(name, ms, status=200 if ok else 500, error=None if ok else 'failed',
+                                     phase=phase['name'], transport='ws' if name == 'workspace_update' else 'http')
+                if ok:
+                    latencies[name].append(ms)
+                else:
+                    errors[name] += 1
+        result = {'name': phase['name'], 'faults': faults,
+                  'probes': {name: dict(summarize(latencies[name]), errors=errors[name]) for name in args.probes},
+                  'proxy': {k: proxy.counters[k] - before[k] for k in proxy.counters},
+                  'failedSaves': ws_log.new_errors()}
+        self.phases.append(result)
+        return result
+
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            ok = self.probe(name) < 400
+        except Exception:  # a reset mid-request surfaces as whatever the client raises
+            ok = False
+        return (time.perf_counter() - start) * 1000, ok
+
+    def print_phase(self, result, baseline):
+        f = result['faults']
+        extras = [f"jitter ±{f['jitterMs']:g}ms" if f['jitterMs'] else None,
+                  f"{f['bandwidthKbps']:g} kbps" if f['bandwidthKbps'] else None,
+                  f"{f['resetRate']:g} resets/s" if f['resetRate'] else None]
+        print(f"\n⏱️  {result['name']}: " + ', '.join([f"+{f['rttMs']:g}ms RTT"] + [e for e in extras if e]))
+        print(f"  {'probe':<18} {'p50':>9} {'p99':>9} {'Δp50':>9} {'errors':>7}")
+        for name, stats in result['probes'].items():
+            base = baseline['probes'][name].get('p50') if baseline else None
+            delta = stats['p50'] - base if stats.get('p50') is not None and base is not None else None
+            print(f"  {name:<18} {format_ms(stats.get('p50')):>9} {format_ms(stats.get('p99')):>9} "
+                  f"{(('-' if delta < 0 else '+') + format_ms(abs(delta))) if delta is not None else '-':>9} "
+                  f"{stats['errors']:>7}")
+        proxy = result['proxy']
+        line = f"  proxy: {proxy['connections']} new connections, {proxy['resets']} resets"
+        if result['failedSaves'] is not None:
+            line += f", {result['failedSaves']} failed workspace saves"
+        print(line)
+        confirmed = result['probes'].get('workspace_update', {}).get('count', 0)
+        if result['failedSaves'] and confirmed:
+            print(f"  🚨 workspace updates were confirmed and broadcast while {result['failedSaves']} saves failed")
+
+    def sensitivity(self):
+        """Per probe: ms added per ms of RTT (≈ sequential round trips) from the latency-only phases"""
+        clean = [p for p in self.phases if not p['faults']['resetRate'] and not p['faults']['bandwidthKbps']]
+        out = {}
+        for name in self.args.probes:
+            points = [(p['faults']['rttMs'], p['probes'][name]['p50']) for p in clean
+                      if p['probes'][name].get('p50') is not None]
+            slope = fit_slope(points)
+            if slope is None:
+                continue
+            base = min(points)[1]
+            out[name] = {'roundTrips': slope, 'baseP50Ms': base,
+                         'projectedP50Ms': base + slope * self.args.target_rtt}
+        return out
+
+    def run(self):
+        args = self.args
+        database_url = args.database_url or os.environ.get('DATABASE_URL')
+        if not database_url:
+            print("❌ DATABASE_URL is not set (or pass --database-url)")
+            return 1
+        upstream = urlsplit(database_url)
+        proxy = FaultProxy(upstream.hostname, upstream.port or 5432, listen_port=args.listen)
+        print("=" * 80)
+        print("DATABASE LATENCY AND FAULT SWEEP")
+        print("=" * 80)
+        with proxy:
+            env = {'DATABASE_URL': proxied_url(database_url, proxy.port)}
+            print(f"🔌 Proxy on 127.0.0.1:{proxy.port} → {upstream.hostname}:{upstream.port or 5432}")
+            ws_log_path = args.ws_log
+            servers = []
+            if not args.no_start:
+                ws_log_path = self.recorder.artifact_path('websocket.log')
+                servers = [websocket_server(port=args.ws_port, env=env, log_path=ws_log_path),
+                           next_server(args.mode, port=args.app_port, env=env,
+                                       log_path=self.recorder.artifact_path('next.log'))]
+            try:
+                for server in servers:
+                    print(f"🚀 Starting {server.name} on the proxied DATABASE_URL...")
+                    server.start()
+                self.setup()
+                ws_log = LogWatcher(ws_log_path, SAVE_FAILED_RE)
+                for phase in args.phases:
+                    self.print_phase(self.run_phase(proxy, phase, ws_log), self.phases[0])
+            finally:
+                if self.state.get('workspace'):
+                    self.state['workspace'].close()
+                for server in reversed(servers):
+                    server.stop()
+
+        sensitivity = self.sensitivity()
+        if sensitivity:
+            print(f"\n📈 Sensitivity to database RTT (projected at +{args.target_rtt:g}ms)")
+            print(f"  {'probe':<18} {'round trips':>12} {'p50 now':>9} {'projected':>10}")
+            for name, s in sorted(sensitivity.items(), key=lambda item: -item[1]['roundTrips']):
+                print(f"  {name:<18} {s['roundTrips']:>12.1f} {format_ms(s['baseP50Ms']):>9} "
+                      f"{format_ms(s['projectedP50Ms']):>10}")
+        self.recorder.add_section('dbproxy', {'phases': self.phases, 'sensitivity': sensitivity,
+                                              'targetRttMs': args.target_rtt})
+        print(f"\n💾 Results: {self.recorder.save()}")
+        return 0
+
+
+def load_phases(args):
+    if args.phases_file:
+        with open(args.phases_file) as f:
+            phases = json.load(f)
+    else:
+        phases = [{'rttMs': rtt, 'jitterMs': args.jitter, 'bandwidthKbps': args.bandwidth_kbps,
+                   'resetRate': args.reset_rate} for rtt in args.rtt]
+    for i, phase in enumerate(phases):
+        unknown = set(phase) - set(NO_FAULTS) - {'name'}
+        if unknown:
+            raise SystemExit(f"phase {i}: unknown keys {sorted(unknown)} (expected name, {', '.join(NO_FAULTS)})")
+        phase.setdefault('name', f"rtt+{phase.get('rttMs', 0):g}ms")
+    return phases
+
+
+def serve(args):
+    database_url = args.database_url or os.environ.get('DATABASE_URL')
+    if not database_url:
+        print("❌ DATABASE_URL is not set (or pass --database-url)")
+        return 1
+    upstream = urlsplit(database_url)
+    proxy = FaultProxy(upstream.hostname, upstream.port or 5432, listen_port=args.listen).start()
+    proxy.apply({'rttMs': args.rtt[0], 'jitterMs': args.jitter, 'bandwidthKbps': args.bandwidth_kbps,
+                 'resetRate': args.reset_rate})
+    print(f"🔌 Proxying 127.0.0.1:{proxy.port} → {upstream.hostname}:{upstream.port or 5432} with {proxy.faults}")
+    print(f"   DATABASE_URL={proxied_url(database_url, proxy.port)}")
+    try:
+        while True:
+            time.sleep(args.report_every)
+            print(f"📊 {proxy.counters} ({len(proxy.links)} open)", flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        proxy.close()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name in ('serve', 'sweep'):
+        p = sub.add_parser(name)
+        p.add_argument('--database-url', default=None, help="upstream database (defaults to $DATABASE_URL)")
+        p.add_argument('--listen', type=int, default=0, help="proxy port (default: a free one)")
+        p.add_argument('--rtt', type=lambda v: [float(x) for x in v.split(',')],
+                       default=[0, 1, 2, 5, 10, 20] if name == 'sweep' else [0],
+                       help="added round-trip ms (a list of phases for sweep)")
+        p.add_argument('--jitter', type=float, default=0.0, help="± ms of round-trip jitter")
+        p.add_argument('--bandwidth-kbps', type=float, default=None, help="per-direction, per-connection cap")
+        p.add_argument('--reset-rate', type=float, default=0.0, help="connection resets per second")
+
+    serve_parser = sub.choices['serve']
+    serve_parser.add_argument('--report-every', type=float, default=10.0, help="seconds between counter lines")
+
+    sweep = sub.choices['sweep']
+    sweep.add_argument('--phases', dest='phases_file', default=None, help="JSON list of phases (overrides --rtt)")
+    sweep.add_argument('--probe', dest='probes', action='append', default=None,
+                       help=f"probe to run (repeatable; default: {', '.join(DEFAULT_PROBES)})")
+    sweep.add_argument('--requests', type=int, default=30, help="timed requests per probe and phase")
+    sweep.add_argument('--warmup', type=int, default=3, help="untimed requests per probe after each fault change")
+    sweep.add_argument('--tasks', type=int, default=20, help="tasks in the probe project")
+    sweep.add_argument('--target-rtt', type=float, default=2.0, help="RTT to project latencies at (ms)")
+    sweep.add_argument('--timeout', type=float, default=30.0)
+    sweep.add_argument('--mode', default='start', choices=['start', 'dev'], help="next start or next dev")
+    sweep.add_argument('--app-port', type=int, default=APP_PORT)
+    sweep.add_argument('--ws-port', type=int, default=WS_PORT)
+    sweep.add_argument('--no-start', action='store_true',
+                       help="the app is already running against --listen; don't start it")
+    sweep.add_argument('--ws-log', default=None, help="websocket server log to count failed saves in (--no-start)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        return serve(args)
+    if args.no_start and not args.listen:
+        parser.error("--no-start needs --listen (the port the running app's DATABASE_URL points at)")
+    args.base_url = f"http://localhost:{args.app_port}/api"
+    args.ws_url = f"http://localhost:{args.ws_port}"
+    args.probes = args.probes or DEFAULT_PROBES
+    args.phases = load_phases(args)
+    return DbLatencySweep(args).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
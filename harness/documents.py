@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Collaborative document persistence and load-time benchmark
+
+Builds documents in the shape DocumentManager.exportDocument() produces
+({elements, appState, operations, versionVector}). Each has a long edit
+history spread over many peers: every create, update and delete stays in
+`operations`, and every peer that ever edited keeps a versionVector entry.
+The documents are then pushed through the endpoints that persist them:
+
+    python -m harness.documents --history 1000,10000,50000 --peers 10,200 --repeat 5
+
+Per document (one project each, so list loads stay isolated):
+  workspace  PATCH /projects/:id/workspaces/:id {data} and GET it back
+  note       PATCH /projects/:id/notes/:id {content: JSON} and GET /projects/:id/notes
+  restore    with node and the app's node_modules: JSON.parse, importDocument(),
+             exportDocument(), the equivalent Yjs update (including presence of
+             every historical peer), applying it, and heap per open document
+             (harness/crdt/restore.mjs)
+
+The first configuration whose load time or serialized size exceeds
+--load-budget-ms / --size-budget-kb is where history compaction (snapshot
+plus truncated operations) and versionVector/presence GC become necessary.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import shutil
+import string
+import subprocess
+import sys
+import time
+
+from .client import ApiClient
+from .config import BASE_URL, REPO_ROOT
+from .db import new_id
+from .results import RunRecorder
+from .stats import format_ms, summarize
+
+_NANOID_ALPHABET = string.ascii_letters + string.digits + '_-'
+ELEMENT_TYPES = ['rectangle', 'ellipse', 'diamond', 'arrow', 'text']
+RESTORE_SCRIPT = os.path.join(REPO_ROOT, 'harness', 'crdt', 'restore.mjs')
+MEASUREMENTS = {
+    'workspaceSave': "PATCH /projects/:id/workspaces/:id",
+    'workspaceLoad': "GET /projects/:id/workspaces/:id",
+    'noteSave': "PATCH /projects/:id/notes/:id",
+    'noteListLoad': "GET /projects/:id/notes",
+}
+KNOWN_FAILURES = {
+    'noteSave': "app bug: the route logs activity type NOTE_UPDATED, missing from enum ActivityType; "
+                "the note is written before the failing insert, so the notes list load still carries it",
+}
+
+
+def nanoid(rng):
+    return ''.join(rng.choice(_NANOID_ALPHABET) for _ in range(21))
+
+
+def build_document(operations, peers, live_elements, rng):
+    """An exportDocument()-shaped document and the peer ids that edited it"""
+    peer_ids = [new_id(rng) for _ in range(peers)]
+    elements, ops, version_vector = {}, [], {}
+    clock = 0
+    timestamp = 1_700_000_000_000
+
+    while len(ops) < operations:
+        user = rng.choice(peer_ids)
+        clock += 1
+        version_vector[user] = clock  # incrementClock(): the local clock only grows
+        timestamp += rng.randint(50, 5000)
+        roll = rng.random()
+        if not elements or len(elements) < live_elements or roll < 0.03:
+            element_id = nanoid(rng)
+            kind = rng.choice(ELEMENT_TYPES)
+            element = {
+                'id': element_id, 'type': kind,
+                'x': rng.randint(0, 4000), 'y': rng.randint(0, 4000),
+                'width': rng.randint(20, 400), 'height': rng.randint(20, 400),
+                'strokeColor': '#1e1e1e', 'backgroundColor': 'transparent',
+                'createdBy': user, 'createdAt': timestamp, 'updatedBy': user, 'updatedAt': timestamp,
+                'version': clock,
+            }
+            if kind == 'text':
+                element['text'] = f"Note {len(ops)}"
+            elements[element_id] = element
+            ops.append({'type': 'CREATE_ELEMENT', 'elementId': element_id, 'element': dict(element),
+                        'userId': user, 'timestamp': timestamp, 'version': clock})
+        elif roll < 0.06:
+            element_id = rng.choice(list(elements))
+            del elements[element_id]
+            ops.append({'type': 'DELETE_ELEMENT', 'elementId': element_id, 'userId': user,
+                        'timestamp': timestamp, 'version': clock})
+        else:
+            element_id = rng.choice(list(elements))
+            element = elements[element_id]
+            if element['type'] == 'text' and roll < 0.5:
+                changes = {'text': f"{element['text']} (edit {len(ops)})"[-200:]}
+            else:
+                changes = {'x': element['x'] + rng.randint(-20, 20), 'y': element['y'] + rng.randint(-20, 20)}
+            element.update(changes, updatedBy=user, updatedAt=timestamp, version=clock)
+            ops.append({'type': 'UPDATE_ELEMENT', 'elementId': element_id, 'changes': changes,
+                        'userId': user, 'timestamp': timestamp, 'version': clock})
+
+    document = {
+        'elements': elements,
+        'appState': {'viewBackgroundColor': '#ffffff', 'zoom': {'value': 1}, 'scrollX': 0, 'scrollY': 0,
+                     'gridSize': None},
+        'operations': ops,
+        'versionVector': version_vector,
+    }
+    return document, peer_ids
+
+
+def cell(measurement, width):
+    """p50 of a timed measurement, or the failing status when no attempt succeeded"""
+    if measurement.get('count'):
+        return f"{format_ms(measurement['p50']):>{width}}"
+    return f"{'HTTP ' + str(measurement.get('status')):>{width}}"
+
+
+def restore_timings(entries, path, timeout):
+    """Run harness/crdt/restore.mjs over the documents; returns {label: timings} or an error string"""
+    if not shutil.which('node'):
+        return "node is not installed"
+    if not os.path.isdir(os.path.join(REPO_ROOT, 'node_modules', 'yjs')):
+        return "the app's node_modules are missing (npm install)"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(entries, f)
+    result = subprocess.run(['node', '--expose-gc', RESTORE_SCRIPT, path], cwd=REPO_ROOT, capture_output=True,
+                            text=True, timeout=timeout)
+    if result.returncode != 0:
+        return result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"exit {result.returncode}"
+    return {row['label']: row for row in map(json.loads, result.stdout.splitlines())}
+
+
+class DocumentBenchmark:
+    def __init__(self, args):
+        self.args = args
+        self.recorder = RunRecorder('documents')
+        self.rng = random.Random(args.seed)
+        self.client = None
+
+    def timed(self, method, path, endpoint, **kwargs):
+        """Latency of the successful attempts; failures are counted, not raised, so one broken route
+        does not abort the run"""
+        latencies, size, status, errors = [], None, None, 0
+        for _ in range(self.args.repeat):
+            start = time.perf_counter()
+            response = self.client.request(method, path, endpoint=endpoint, **kwargs)
+            elapsed = (time.perf_counter() - start) * 1000  # includes the body, unlike response.elapsed
+            status = response.status_code
+            if response.ok:
+                latencies.append(elapsed)
+                size = len(response.content)
+            else:
+                errors += 1
+        return dict(summarize(latencies), responseBytes=size, status=status, errors=errors)
+
+    def measure(self, label, document):
+        client = self.client
+        project = client.post("/projects", json={'name': f"Documents {label}", 'description': "harness.documents"})
+        project.raise_for_status()
+        project_id = project.json()['project']['id']
+        content = json.dumps(document, separators=(',', ':'))
+
+        workspace = client.post(f"/projects/{project_id}/workspaces", json={'name': f"Board {label}"})
+        workspace.raise_for_status()
+        workspace_path = f"/projects/{project_id}/workspaces/{workspace.json()['workspace']['id']}"
+        note = client.post(f"/projects/{project_id}/notes", json={'title': f"Notes {label}", 'content': ''})
+        note.raise_for_status()
+        note_path = f"/projects/{project_id}/notes/{note.json()['note']['id']}"
+
+        result = {
+            'label': label, 'serializedBytes': len(content.encode('utf-8')),
+            'operations': len(document['operations']), 'peers': len(document['versionVector']),
+            'elements': len(document['elements']),
+            'workspaceSave': self.timed('PATCH', workspace_path, f"save workspace {label}", json={'data': document}),
+            'workspaceLoad': self.timed('GET', workspace_path, f"load workspace {label}"),
+            'noteSave': self.timed('PATCH', note_path, f"save note {label}", json={'content': content}),
+            'noteListLoad': self.timed('GET', f"/projects/{project_id}/notes", f"list notes {label}"),
+        }
+        if not self.args.keep:
+            client.delete(f"/projects/{project_id}")
+        return result
+
+    def run(self):
+        args = self.args
+        print("=" * 80)
+        print("COLLABORATIVE DOCUMENT PERSISTENCE AND LOAD TIME")
+        print("=" * 80)
+        self.client = ApiClient(args.base_url, recorder=self.recorder, timeout=args.timeout)
+        self.client.register_and_login("Documents Benchmark")
+
+        results, entries = [], []
+        for operations, peers in itertools.product(args.history, args.peers):
+            label = f"{operations}ops-{peers}peers"
+            document, peer_ids = build_document(operations, peers, args.elements, self.rng)
+            size_kb = len(json.dumps(document, separators=(',', ':'))) / 1024
+            print(f"📈 {label}: {size_kb:.0f}KB serialized, saving and loading...")
+            results.append(self.measure(label, document))
+            if not args.no_restore:
+                entries.append({'label': label, 'document': document, 'peers': peer_ids})
+
+        restore = "skipped (--no-restore)"
+        if entries:
+            print("🔄 Restoring through DocumentManager in node...")
+            restore = restore_timings(entries, self.recorder.artifact_path('documents.json'), args.timeout * 10)
+            if isinstance(restore, dict):
+                for result in results:
+                    result['restore'] = restore.get(result['label'])
+                os.remove(self.recorder.artifact_path('documents.json'))
+
+        print(f"\n{'document':<20} {'size':>9} {'ws save':>9} {'ws load':>9} {'note save':>10} {'notes GET':>10} "
+              f"{'import':>9} {'yjs':>9} {'apply':>9} {'heap/doc':>9}")
+        for r in results:
+            timings = r.get('restore') or {}
+            heap = timings.get('heapPerDocBytes')
+            print(f"{r['label']:<20} {r['serializedBytes'] / 1024:>8.0f}K "
+                  f"{cell(r['workspaceSave'], 9)} {cell(r['workspaceLoad'], 9)} "
+                  f"{cell(r['noteSave'], 10)} {cell(r['noteListLoad'], 10)} "
+                  f"{format_ms(timings.get('importMs')):>9} "
+                  f"{(str(round(timings['yjsUpdateBytes'] / 1024)) + 'K') if timings else '-':>9} "
+                  f"{format_ms(timings.get('yjsApplyMs')):>9} "
+                  f"{(f'{heap / 1024 / 1024:.1f}MB') if heap else '-':>9}")
+        if not isinstance(restore, dict):
+            print(f"\n⏳ Restore timings skipped: {restore}")
+
+        failures = {}
+        for key, route in MEASUREMENTS.items():
+            failed = sum(r[key]['errors'] for r in results)
+            if failed:
+                statuses = sorted({r[key]['status'] for r in results if r[key]['errors']})
+                failures[key] = {'route': route, 'failed': failed, 'attempts': args.repeat * len(results),
+                                 'statuses': statuses, 'cause': KNOWN_FAILURES.get(key)}
+                print(f"\n🐛 {route} failed {failed}/{args.repeat * len(results)} times "
+                      f"(HTTP {', '.join(map(str, statuses))})")
+                if KNOWN_FAILURES.get(key):
+                    print(f"   {KNOWN_FAILURES[key]}")
+
+        over = [r for r in results
+                if r['serializedBytes'] > args.size_budget_kb * 1024
+                or max(r['workspaceLoad'].get('p50') or 0, r['noteListLoad'].get('p50') or 0,
+                       (r.get('restore') or {}).get('importMs') or 0) > args.load_budget_ms]
+        if over:
+            first = min(over, key=lambda r: (r['operations'], r['peers']))
+            print(f"\n🚨 {first['label']} is the smallest document over budget "
+                  f"({args.load_budget_ms:g}ms load, {args.size_budget_kb:g}KB): compact the history "
+                  f"(snapshot + truncated operations) and drop idle peers from versionVector/presence before this")
+        else:
+            print(f"\n✅ Every document stays within {args.load_budget_ms:g}ms load and {args.size_budget_kb:g}KB")
+
+        self.recorder.add_section('documents', {
+            'elements': args.elements, 'repeat': args.repeat, 'loadBudgetMs': args.load_budget_ms,
+            'sizeBudgetKb': args.size_budget_kb, 'documents': results,
+            'restoreSkipped': None if isinstance(restore, dict) else restore, 'failures': failures,
+        })
+        print(f"\n💾 Results: {self.recorder.save()}")
+        return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--history', type=lambda v: [int(x) for x in v.split(',')], default=[1000, 10000, 50000],
+                        help="operations in each document's history")
+    parser.add_argument('--peers', type=lambda v: [int(x) for x in v.split(',')], default=[10, 200],
+                        help="distinct historical editors (versionVector entries)")
+    parser.add_argument('--elements', type=int, default=200, help="live elements per document")
+    parser.add_argument('--repeat', type=int, default=5, help="saves and loads per document")
+    parser.add_argument('--load-budget-ms', type=float, default=250.0)
+    parser.add_argument('--size-budget-kb', type=float, default=1024.0)
+    parser.add_argument('--no-restore', action='store_true', help="skip the node restore timings")
+    parser.add_argument('--keep', action='store_true', help="keep the benchmark projects")
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+    return DocumentBenchmark(args).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
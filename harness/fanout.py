@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Multi-tab notification fan-out benchmark
+
+Every simulated user keeps several Socket.IO tabs open, as power users
+do with 5-10 tabs, and each tab registers with user-connect. Notifications
+and read-state changes then arrive at a steady rate, and every tab records
+what it receives:
+
+    python -m harness.fanout --users 50 --tabs 5-10 --rate 20 --duration 60
+    python -m harness.fanout --path service --users 20 --tabs 5 --rate 5
+
+Two delivery paths:
+  direct   a publisher socket emits user-notification / notifications-read
+           to websocket-server.js, which fans out over userSockets
+           (needs only the websocket server)
+  service  POST /notifications/trigger and PATCH /notifications mark_read
+           go through NotificationService.sendRealTimeNotification
+           (needs the app; users are real accounts)
+
+Per path it reports the delivery latency for each tab and until the last
+tab, missing deliveries (tabs that were open but got nothing within
+--grace) and duplicates. The websocket server's RSS is taken before and
+after the tabs connect, giving memory per connected user and per socket
+(local runs, Linux /proc). --churn closes and reopens random tabs, which
+shows whether stale socket ids stay in userSockets.
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .client import ApiClient
+from .config import BASE_URL, WS_PORT, WS_URL
+from .results import RunRecorder
+from .servers import listening_pid, rss_bytes
+from .sockets import PollingSocket
+from .stats import format_ms, summarize
+
+
+def parse_tabs(value):
+    low, _, high = value.partition('-')
+    return int(low), int(high or low)
+
+
+class Tab:
+    """One browser tab: a notification socket whose receipts land in the benchmark's log"""
+
+    def __init__(self, bench, user_id, index):
+        self.bench = bench
+        self.user_id = user_id
+        self.id = f"{user_id}/{index}"
+        self.socket = PollingSocket(bench.args.ws_url, user_id, recorder=bench.recorder, on_event=self.on_event)
+
+    def on_event(self, event, data):
+        now = time.time()
+        data = data or {}
+        if event == 'notification-received':
+            notification = data.get('notification') or {}
+            if notification.get('id'):
+                self.bench.receipt(('notification', notification['id']), self.id, now)
+            elif data.get('type') == 'notifications_read':
+                # NotificationService sends read updates as user-notification, and the server drops the ids
+                self.bench.receipt(('service-read', self.user_id), self.id, now)
+        elif event == 'notifications-read-update':
+            self.bench.receipt(('read', ','.join(data.get('notificationIds') or [])), self.id, now)
+
+    def open(self):
+        self.socket.start()
+        return self
+
+    def close(self):
+        self.socket.close()
+
+
+class FanoutBenchmark:
+    def __init__(self, args):
+        self.args = args
+        self.recorder = RunRecorder('fanout')
+        self.rng = random.Random(args.seed)
+        self.users = []  # (user id, ApiClient or None)
+        self.tabs = {}  # user id -> [Tab]
+        self.sent = {}  # (kind, id) -> {'at', 'userId', 'expected': tab ids open when sent}
+        self.receipts = {}  # key -> {tab id: [receive times]}
+        self.service_read_tabs = []  # tabs open at each service-path mark_read
+        self.trigger_failures = 0
+        self._lock = threading.Lock()
+
+    def receipt(self, key, tab_id, at):
+        with self._lock:
+            self.receipts.setdefault(key, {}).setdefault(tab_id, []).append(at)
+
+    def expect(self, key, user_id, at):
+        expected = [tab.id for tab in self.tabs[user_id] if tab.socket.connected]
+        with self._lock:
+            self.sent[key] = {'at': at, 'userId': user_id, 'expected': expected}
+
+    # Setup
+
+    def create_users(self):
+        args = self.args
+        if 'service' not in args.paths:
+            tag = uuid.uuid4().hex[:6]
+            self.users = [(f"fanout-{tag}-{i}", None) for i in range(args.users)]
+            return
+        print(f"👥 Signing up {args.users} users...")
+        for i in range(args.users):
+            client = ApiClient(args.base_url, recorder=self.recorder, timeout=args.timeout)
+            client.register_and_login(f"Fanout User {i}")
+            self.users.append((client.user['id'], client))
+
+    def open_tabs(self):
+        low, high = self.args.tabs
+        for user_id, _ in self.users:
+            count = self.rng.randint(low, high)
+            self.tabs[user_id] = [Tab(self, user_id, i).open() for i in range(count)]
+        total = sum(len(tabs) for tabs in self.tabs.values())
+        deadline = time.time() + 30
+        while time.time() < deadline and sum(t.socket.connected for tabs in self.tabs.values() for t in tabs) < total:
+            time.sleep(0.1)
+        time.sleep(self.args.settle)  # user-connect is handled after the handshake
+        return total
+
+    def churn(self, stop):
+        """Close a random tab and open a fresh one in its place, --churn times per second"""
+        opened = 0
+        while not stop.wait(self.rng.expovariate(self.args.churn)):
+            user_id = self.rng.choice(list(self.tabs))
+            tabs = self.tabs[user_id]
+            victim = tabs.pop(self.rng.randrange(len(tabs)))
+            victim.close()
+            opened += 1
+            tabs.append(Tab(self, user_id, f"r{opened}").open())
+            self.recorder.count('fanout.churn')
+
+    # Traffic
+
+    def paced(self, send):
+        """Call send() --rate times per second (Poisson) for --duration; returns the count"""
+        args = self.args
+        end = time.time() + args.duration
+        next_at = time.time()
+        sent = 0
+        while next_at < end:
+            delay = next_at - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            send()
+            sent += 1
+            next_at += self.rng.expovariate(args.rate)
+        return sent
+
+    def run_direct(self):
+        publisher = PollingSocket(self.args.ws_url, recorder=self.recorder)
+        publisher.open()
+        publisher.start()
+        reads = []  # (due, user id, notification id)
+
+        def send():
+            now = time.time()
+            while reads and reads[0][0] <= now:
+                _, user_id, notification_id = reads.pop(0)
+                self.expect(('read', notification_id), user_id, time.time())
+                publisher.emit('notifications-read', {'userId': user_id, 'notificationIds': [notification_id]})
+            user_id, _ = self.rng.choice(self.users)
+            notification_id = uuid.uuid4().hex
+            self.expect(('notification', notification_id), user_id, time.time())
+            publisher.emit('user-notification', {
+                'userId': user_id, 'type': 'new_notification',
+                'notification': {'id': notification_id, 'type': 'TASK_ASSIGNED', 'title': "Fan-out probe"},
+            })
+            if self.rng.random() < self.args.read_ratio:
+                reads.append((now + self.args.read_delay, user_id, notification_id))
+
+        try:
+            return self.paced(send)
+        finally:
+            publisher.close()
+
+    def run_service(self):
+        args = self.args
+        clients = dict(self.users)
+        pool = ThreadPoolExecutor(max_workers=args.workers)
+
+        def trigger(user_id):
+            started = time.time()
+            response = clients[user_id].post("/notifications/trigger", json={'type': 'test_notification'},
+                                             endpoint="POST /notifications/trigger")
+            notification = response.json().get('notification') if response.ok else None
+            if not notification:
+                with self._lock:
+                    self.trigger_failures += 1
+                return
+            self.expect(('notification', notification['id']), user_id, started)
+            if self.rng.random() < args.read_ratio:
+                time.sleep(args.read_delay)
+                with self._lock:
+                    self.service_read_tabs.append(sum(t.socket.connected for t in self.tabs[user_id]))
+                clients[user_id].patch("/notifications", json={'action': 'mark_read',
+                                                               'notificationIds': [notification['id']]})
+
+        futures = []
+        sent = self.paced(lambda: futures.append(pool.submit(trigger, self.rng.choice(self.users)[0])))
+        for future in futures:
+            future.result()
+        pool.shutdown()
+        return sent
+
+    # Analysis
+
+    def analyze(self, keys, kind, endpoint):
+        """Delivery summary for one path; every delivery is also recorded as an `endpoint` socket sample"""
+        latencies, last_tab, expected, delivered, missing, duplicates, stray = [], [], 0, 0, 0, 0, 0
+        with self._lock:
+            sent = {k: v for k, v in self.sent.items() if k in keys and k[0] == kind}
+            receipts = {k: v for k, v in self.receipts.items() if k in sent}
+        for key, info in sent.items():
+            got = receipts.get(key, {})
+            expected += len(info['expected'])
+            times = []
+            for tab_id in info['expected']:
+                if tab_id in got:
+                    delivered += 1
+                    duplicates += len(got[tab_id]) - 1
+                    times.append((min(got[tab_id]) - info['at']) * 1000)
+                    self.recorder.record(endpoint, times[-1], transport='ws')
+                else:
+                    missing += 1
+            stray += sum(len(v) for tab_id, v in got.items() if tab_id not in info['expected'])
+            latencies.extend(times)
+            if times and len(times) == len(info['expected']):
+                last_tab.append(max(times))
+        return {'sent': len(sent), 'expectedDeliveries': expected, 'delivered': delivered, 'missing': missing,
+                'duplicates': duplicates, 'unexpected': stray, 'perTab': summarize(latencies),
+                'allTabs': summarize(last_tab)}
+
+    def service_reads(self):
+        """Read updates on the service path carry no ids, so they can only be counted"""
+        with self._lock:
+            received = sum(len(times) for key, tabs in self.receipts.items() if key[0] == 'service-read'
+                           for times in tabs.values())
+        expected = sum(self.service_read_tabs)
+        return {'sent': len(self.service_read_tabs), 'expectedDeliveries': expected,
+                'delivered': min(received, expected), 'missing': max(expected - received, 0),
+                'duplicates': max(received - expected, 0), 'unexpected': 0,
+                'perTab': summarize([]), 'allTabs': summarize([])}
+
+    def print_result(self, label, result):
+        per_tab, all_tabs = result['perTab'], result['allTabs']
+        rate = result['delivered'] / result['expectedDeliveries'] * 100 if result['expectedDeliveries'] else 0
+        print(f"  {label:<22} sent {result['sent']:>6}  delivered {result['delivered']:>7}/"
+              f"{result['expectedDeliveries']:<7} ({rate:5.1f}%)  missing {result['missing']:>5}  "
+              f"dup {result['duplicates']:>4}")
+        if per_tab['count']:
+            print(f"  {'':<22} per tab p50 {format_ms(per_tab['p50'])} p99 {format_ms(per_tab['p99'])}   "
+                  f"all tabs p50 {format_ms(all_tabs.get('p50'))} p99 {format_ms(all_tabs.get('p99'))}")
+
+    def memory(self, pid):
+        rss = rss_bytes(pid) if pid else None
+        return rss / 1024 / 1024 if rss else None
+
+    def run(self):
+        args = self.args
+        pid = args.ws_pid or listening_pid(args.ws_port)
+        print("=" * 80)
+        print("MULTI-TAB NOTIFICATION FAN-OUT")
+        print("=" * 80)
+        self.create_users()
+        baseline_mb = self.memory(pid)
+        total_tabs = self.open_tabs()
+        connected_mb = self.memory(pid)
+        print(f"🔌 {len(self.users)} users, {total_tabs} tabs connected")
+
+        memory = {'pid': pid, 'baselineMb': baseline_mb, 'connectedMb': connected_mb}
+        if baseline_mb is not None and connected_mb is not None:
+            grown = connected_mb - baseline_mb
+            memory.update(perUserKb=grown * 1024 / len(self.users), perSocketKb=grown * 1024 / total_tabs)
+            print(f"💾 websocket server RSS {baseline_mb:.1f}MB → {connected_mb:.1f}MB "
+                  f"({memory['perUserKb']:.1f}KB per user, {memory['perSocketKb']:.1f}KB per socket)")
+        else:
+            print("💾 websocket server memory unavailable (not local, or pass --ws-pid)")
+
+        stop = threading.Event()
+        churner = None
+        if args.churn:
+            churner = threading.Thread(target=self.churn, args=(stop,), daemon=True)
+            churner.start()
+        results = {}
+        try:
+            for path in args.paths:
+                print(f"\n⏱️  {path} path: {args.rate:g}/s for {args.duration:g}s...")
+                before = set(self.sent)
+                sent = self.run_direct() if path == 'direct' else self.run_service()
+                time.sleep(args.grace)
+                keys = set(self.sent) - before
+                notifications = self.analyze(keys, 'notification', f"ws notification-received ({path})")
+                results[path] = {'requested': sent, 'notifications': notifications}
+                if path == 'direct':
+                    results[path]['readUpdates'] = self.analyze(keys, 'read', "ws notifications-read-update (direct)")
+                else:
+                    results[path]['readUpdates'] = self.service_reads()
+                    results[path]['triggerFailures'] = self.trigger_failures
+        finally:
+            stop.set()
+            if churner:
+                churner.join(timeout=5)
+            memory['peakMb'] = self.memory(pid)
+            for tabs in self.tabs.values():
+                for tab in tabs:
+                    tab.close()
+
+        print("\n📊 Delivery")
+        for path, result in results.items():
+            self.print_result(f"{path} notifications", result['notifications'])
+            self.print_result(f"{path} read updates", result['readUpdates'])
+        service = results.get('service')
+        if service and service['notifications']['sent'] and not service['notifications']['delivered']:
+            print("\n🚨 No NotificationService notification reached any tab: sendRealTimeNotification only emits "
+                  "when its socket client exists, and initializeSocket() creates it only in the browser")
+        if any(r['notifications']['duplicates'] or r['readUpdates']['duplicates'] for r in results.values()):
+            print("\n🚨 Some tabs received the same event more than once")
+
+        self.recorder.add_section('fanout', {
+            'users': len(self.users), 'tabs': total_tabs, 'rate': args.rate, 'durationSec': args.duration,
+            'churnPerSec': args.churn, 'memory': memory, 'paths': results,
+        })
+        print(f"\n💾 Results: {self.recorder.save()}")
+        return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--ws-url', default=WS_URL)
+    parser.add_argument('--path', dest='paths', action='append', choices=['direct', 'service'], default=None,
+                        help="delivery path to measure (repeatable; default: direct)")
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--tabs', type=parse_tabs, default=(5, 10), help="tabs per user, N or MIN-MAX")
+    parser.add_argument('--rate', type=float, default=20.0, help="notifications per second, across all users")
+    parser.add_argument('--duration', type=float, default=60.0, help="seconds of traffic per path")
+    parser.add_argument('--read-ratio', type=float, default=0.5, help="share of notifications marked read")
+    parser.add_argument('--read-delay', type=float, default=2.0, help="seconds before a notification is read")
+    parser.add_argument('--churn', type=float, default=0.0, help="tab close/reopen events per second")
+    parser.add_argument('--grace', type=float, default=5.0, help="seconds to wait for late deliveries")
+    parser.add_argument('--settle', type=float, default=1.0, help="seconds after connecting before traffic")
+    parser.add_argument('--workers', type=int, default=16, help="concurrent API calls on the service path")
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--ws-port', type=int, default=WS_PORT, help="to find the websocket server's PID")
+    parser.add_argument('--ws-pid', type=int, default=None, help="websocket server PID (default: by --ws-port)")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+    args.paths = args.paths or ['direct']
+    return FanoutBenchmark(args).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
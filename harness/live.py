@@ -0,0 +1,194 @@
+"""
+Live terminal dashboard for long load runs
+
+Redraws once a second from a RunRecorder while the run is going:
+throughput, in-flight requests, error rate, rolling p50/p99 per
+endpoint (over the last --window seconds) and websocket connection and
+message rates. Websocket numbers come from the recorder's ws.* counters
+and gauges when a tool reports them, otherwise established connections
+to the websocket port are counted from /proc/net/tcp (local runs only).
+
+    with LiveDashboard(recorder):
+        runner.run()
+
+When stdout is not a terminal a single summary line is printed every
+interval instead, so CI logs stay readable.
+"""
+
+import sys
+import threading
+import time
+from collections import deque
+
+from .config import WS_PORT
+from .stats import format_ms, percentile
+
+CLEAR = "\x1b[H\x1b[2J"
+RED = "\x1b[31m"
+YELLOW = "\x1b[33m"
+BOLD = "\x1b[1m"
+RESET = "\x1b[0m"
+
+
+def established_connections(port):
+    """Established TCP connections to a local port, or None where /proc is unavailable"""
+    total = None
+    for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+        try:
+            with open(table, encoding='ascii') as f:
+                lines = f.readlines()[1:]
+        except OSError:
+            continue
+        total = total or 0
+        for line in lines:
+            fields = line.split()
+            local_port = int(fields[1].rsplit(':', 1)[1], 16)
+            if local_port == port and fields[3] == '01':
+                total += 1
+    return total
+
+
+class LiveDashboard:
+    def __init__(self, recorder, window=10, interval=1.0, ws_port=WS_PORT, stream=None, max_endpoints=15):
+        self.recorder = recorder
+        self.window = window
+        self.interval = interval
+        self.ws_port = ws_port
+        self.stream = stream or sys.stdout
+        self.max_endpoints = max_endpoints
+        self.tty = self.stream.isatty()
+        self.recent = deque()  # (recorder ts, endpoint, latency ms, error) inside the window
+        self.seen = 0
+        self.previous_counters = {}
+        self.rates = {}
+        self.peak_rps = 0.0
+        self.baseline_p99 = None
+        self.span = 1.0  # seconds covered by self.recent
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.stream.write(self.render() if self.tty else self.line() + "\n")
+            self.stream.flush()
+
+    def update(self):
+        """Pull new samples and counters from the recorder"""
+        new, counters, gauges, in_flight = self.recorder.snapshot(self.seen)
+        self.seen += len(new)
+        for s in new:
+            self.recent.append((s['ts'], s['endpoint'], s['latencyMs'], s['error']))
+        now = time.time() - self.recorder.started_at
+        while self.recent and self.recent[0][0] < now - self.window:
+            self.recent.popleft()
+
+        self.rates = {name: (value - self.previous_counters.get(name, 0)) / self.interval
+                      for name, value in counters.items()}
+        self.previous_counters = counters
+        self.span = min(self.window, max(now, 1.0))
+        last_second = sum(1 for r in self.recent if r[0] >= now - 1)
+        self.peak_rps = max(self.peak_rps, last_second)
+        return {
+            'elapsed': now,
+            'inFlight': in_flight,
+            'rps': last_second,
+            'windowRps': len(self.recent) / self.span,
+            'total': self.seen,
+            'gauges': gauges,
+        }
+
+    def endpoint_rows(self):
+        grouped = {}
+        for _, endpoint, latency, error in self.recent:
+            grouped.setdefault(endpoint, []).append((latency, error))
+        rows = []
+        for endpoint, items in grouped.items():
+            ok = [latency for latency, error in items if error is None]
+            errors = len(items) - len(ok)
+            rows.append({
+                'endpoint': endpoint,
+                'rps': len(items) / self.span,
+                'p50': percentile(ok, 50),
+                'p99': percentile(ok, 99),
+                'errorRate': errors / len(items),
+            })
+        return sorted(rows, key=lambda r: -r['rps'])
+
+    def websocket(self, gauges):
+        connections = gauges.get('ws.connections')
+        if connections is None:
+            connections = established_connections(self.ws_port)
+        return {
+            'connections': connections,
+            'connectRate': self.rates.get('ws.connect', 0),
+            'messagesIn': self.rates.get('ws.message_in', 0),
+            'messagesOut': self.rates.get('ws.message_out', 0),
+        }
+
+    def warnings(self, totals, rows):
+        """Early signs of a bad run: errors, rising tail latency, a growing queue"""
+        notes = []
+        errors = sum(r['errorRate'] * r['rps'] for r in rows)
+        throughput = sum(r['rps'] for r in rows)
+        if throughput and errors / throughput > 0.05:
+            notes.append(f"{RED}error rate {errors / throughput:.1%}{RESET}")
+        p99s = [r['p99'] for r in rows if r['p99'] is not None]
+        if p99s:
+            worst = max(p99s)
+            if self.baseline_p99 is None and totals['elapsed'] > self.window:
+                self.baseline_p99 = worst
+            elif self.baseline_p99 and worst > 3 * self.baseline_p99:
+                notes.append(f"{YELLOW}p99 {format_ms(worst)} is 3x the first window{RESET}")
+        if totals['inFlight'] > 2 * max(totals['rps'], 1) and self.peak_rps and totals['rps'] < 0.8 * self.peak_rps:
+            notes.append(f"{YELLOW}requests queueing: {totals['inFlight']} in flight at {totals['rps']} rps{RESET}")
+        return notes
+
+    def render(self):
+        totals = self.update()
+        rows = self.endpoint_rows()
+        ws = self.websocket(totals['gauges'])
+        error_rate = (sum(r['errorRate'] * r['rps'] for r in rows) / sum(r['rps'] for r in rows)) if rows else 0
+        out = [CLEAR, f"{BOLD}{self.recorder.name}{RESET}  {totals['elapsed']:.0f}s elapsed   (Ctrl-C to abort)",
+               "=" * 80,
+               f"RPS {totals['rps']:>6}   avg/{self.window}s {totals['windowRps']:>7.1f}   peak {self.peak_rps:>6}   "
+               f"in-flight {totals['inFlight']:>5}   errors {error_rate:>6.1%}   total {totals['total']}"]
+        connections = '-' if ws['connections'] is None else ws['connections']
+        out.append(f"WS  connections {connections:>5}   connects/s {ws['connectRate']:>6.1f}   "
+                   f"msgs in/s {ws['messagesIn']:>7.1f}   msgs out/s {ws['messagesOut']:>7.1f}")
+        out.append("")
+        out.append(f"{'endpoint':<44} {'rps':>7} {'p50':>9} {'p99':>9} {'err':>6}")
+        for r in rows[:self.max_endpoints]:
+            line = (f"{r['endpoint'][:44]:<44} {r['rps']:>7.1f} {format_ms(r['p50']):>9} "
+                    f"{format_ms(r['p99']):>9} {r['errorRate']:>6.1%}")
+            out.append(f"{RED}{line}{RESET}" if r['errorRate'] > 0.05 else line)
+        if len(rows) > self.max_endpoints:
+            out.append(f"... {len(rows) - self.max_endpoints} more endpoints")
+        for note in self.warnings(totals, rows):
+            out.append(f"⚠️  {note}")
+        return "\n".join(out) + "\n"
+
+    def line(self):
+        totals = self.update()
+        rows = self.endpoint_rows()
+        p99s = [r['p99'] for r in rows if r['p99'] is not None]
+        errors = sum(r['errorRate'] * r['rps'] * self.span for r in rows)
+        return (f"[{totals['elapsed']:>6.0f}s] rps={totals['rps']} in_flight={totals['inFlight']} "
+                f"errors/{self.window}s={errors:.0f} worst_p99={format_ms(max(p99s) if p99s else None)} "
+                f"total={totals['total']}")
+
@@ -0,0 +1,226 @@
+"""
+OpenMetrics / Prometheus export of harness measurements
+
+While a run is going, the recorder's samples are folded into latency
+histograms per HTTP endpoint and per socket event (samples recorded with
+transport='ws'), plus request counters, the in-flight gauge and every
+named event counter. harness.scenario also feeds a journey duration
+histogram per scenario and journey. They are served on
+http://127.0.0.1:<port>/metrics and/or rewritten to a textfile for the
+node_exporter textfile collector:
+
+    python -m harness.scenario production_mix.json --metrics-port 9464
+    python -m harness.replay capture.jsonl --metrics-textfile /var/lib/node_exporter/harness.prom
+
+Prometheus scrape config for the local stack:
+
+    scrape_configs:
+      - job_name: harness
+        scrape_interval: 1s
+        static_configs: [{targets: ['localhost:9464']}]
+
+Every series carries tool and run labels so several runs can be overlaid
+with server metrics on one Grafana timeline.
+"""
+
+import contextlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Latency histogram buckets, seconds
+BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+OPENMETRICS_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+PROMETHEUS_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items() if v is not None) + '}'
+
+
+def _observe(histograms, key, seconds):
+    hist = histograms.setdefault(key, {'buckets': [0] * len(BUCKETS), 'sum': 0.0, 'count': 0})
+    for i, bound in enumerate(BUCKETS):
+        if seconds <= bound:
+            hist['buckets'][i] += 1
+    hist['sum'] += seconds
+    hist['count'] += 1
+
+
+def _status_class(sample):
+    if sample['error'] and sample['status'] is None:
+        return 'error'
+    return f"{str(sample['status'])[0]}xx" if sample['status'] else 'none'
+
+
+class MetricsExporter:
+    """Aggregates a RunRecorder's samples into Prometheus metric families"""
+
+    def __init__(self, recorder, port=None, textfile=None, interval=5.0, host='127.0.0.1'):
+        self.recorder = recorder
+        self.port = port
+        self.textfile = textfile
+        self.interval = interval
+        self.host = host
+        self.seen = 0
+        self.histograms = {}  # endpoint -> {'buckets': [...], 'sum': s, 'count': n}
+        self.socket_events = {}  # socket event -> histogram, from transport='ws' samples
+        self.journeys = {}  # (scenario, journey) -> histogram, fed by observe_journey()
+        self.requests = {}  # (endpoint, status class) -> count
+        self.errors = {}  # endpoint -> count
+        self._lock = threading.Lock()
+        self._server = None
+        self._stop = threading.Event()
+        self._writer = None
+
+    def collect(self):
+        """Fold samples recorded since the last call into the aggregates"""
+        new, counters, gauges, in_flight = self.recorder.snapshot(self.seen)
+        with self._lock:
+            self.seen += len(new)
+            for sample in new:
+                endpoint = sample['endpoint']
+                if sample.get('transport') == 'ws':
+                    if sample['error'] is None:
+                        _observe(self.socket_events, endpoint, sample['latencyMs'] / 1000)
+                    continue
+                key = (endpoint, _status_class(sample))
+                self.requests[key] = self.requests.get(key, 0) + 1
+                if sample['error'] is not None:
+                    self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+                _observe(self.histograms, endpoint, sample['latencyMs'] / 1000)
+        return counters, gauges, in_flight
+
+    def observe_journey(self, scenario, journey, seconds):
+        """One finished scenario journey (harness.scenario calls this)"""
+        with self._lock:
+            _observe(self.journeys, (scenario, journey), seconds)
+
+    def render(self, openmetrics=False):
+        """Exposition text; OpenMetrics when asked for, Prometheus 0.0.4 otherwise"""
+        counters, gauges, in_flight = self.collect()
+        base = {'tool': self.recorder.name, 'run': self.recorder.run_id}
+        out = []
+
+        def family(name, kind, help_text):
+            # OpenMetrics names counter families without the _total suffix
+            declared = name[:-len('_total')] if openmetrics and kind == 'counter' else name
+            out.append(f"# HELP {declared} {help_text}")
+            out.append(f"# TYPE {declared} {kind}")
+
+        def histogram(name, help_text, table, label_names):
+            family(name, 'histogram', help_text)
+            for key, hist in sorted(table.items()):
+                labels = dict(base, **dict(zip(label_names, key)))
+                for bound, count in zip(BUCKETS, hist['buckets']):
+                    out.append(f"{name}_bucket{_labels(**labels, le=bound)} {count}")
+                out.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {hist['count']}")
+                out.append(f"{name}_sum{_labels(**labels)} {hist['sum']}")
+                out.append(f"{name}_count{_labels(**labels)} {hist['count']}")
+
+        with self._lock:
+            family('harness_requests_total', 'counter', "Requests sent by the harness")
+            for (endpoint, status), count in sorted(self.requests.items()):
+                out.append(f"harness_requests_total{_labels(**base, endpoint=endpoint, status=status)} {count}")
+
+            family('harness_request_errors_total', 'counter', "Requests that failed or returned 5xx")
+            for endpoint, count in sorted(self.errors.items()):
+                out.append(f"harness_request_errors_total{_labels(**base, endpoint=endpoint)} {count}")
+
+            histogram('harness_request_duration_seconds', "Client-observed request latency",
+                      {(endpoint,): hist for endpoint, hist in self.histograms.items()}, ['endpoint'])
+            histogram('harness_socket_event_duration_seconds', "Socket event latency (emit to receipt or ack)",
+                      {(event,): hist for event, hist in self.socket_events.items()}, ['event'])
+            histogram('harness_journey_duration_seconds', "Scenario journey duration, think time included",
+                      self.journeys, ['scenario', 'journey'])
+
+        family('harness_in_flight_requests', 'gauge', "Requests currently waiting for a response")
+        out.append(f"harness_in_flight_requests{_labels(**base)} {in_flight}")
+
+        family('harness_events_total', 'counter', "Named harness events (websocket messages, journeys, ...)")
+        for name, value in sorted(counters.items()):
+            out.append(f"harness_events_total{_labels(**base, event=name)} {value}")
+
+        family('harness_gauge', 'gauge', "Named harness gauges (open websocket connections, ...)")
+        for name, value in sorted(gauges.items()):
+            out.append(f"harness_gauge{_labels(**base, name=name)} {value}")
+
+        if openmetrics:
+            out.append("# EOF")
+        return "\n".join(out) + "\n"
+
+    def write_textfile(self):
+        """Atomic rewrite, so the textfile collector never reads a partial file"""
+        tmp = f"{self.textfile}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp, self.textfile)
+
+    def _handler(self):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+                body = exporter.render(openmetrics).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', OPENMETRICS_TYPE if openmetrics else PROMETHEUS_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def _write_loop(self):
+        while not self._stop.wait(self.interval):
+            self.write_textfile()
+
+    def start(self):
+        if self.port:
+            self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+            print(f"📈 Metrics on http://{self.host}:{self.port}/metrics")
+        if self.textfile:
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+            print(f"📈 Metrics textfile {self.textfile} (every {self.interval:g}s)")
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._writer:
+            self._writer.join(timeout=5)
+        if self.textfile:
+            self.write_textfile()  # final totals
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def add_arguments(parser):
+    parser.add_argument('--metrics-port', type=int, default=None, help="serve /metrics on this port during the run")
+    parser.add_argument('--metrics-textfile', default=None, help="rewrite metrics to this .prom file during the run")
+
+
+def exporter_for(args, recorder):
+    """MetricsExporter when --metrics-port/--metrics-textfile were passed, otherwise a no-op context"""
+    if args.metrics_port or args.metrics_textfile:
+        return MetricsExporter(recorder, port=args.metrics_port, textfile=args.metrics_textfile)
+    return contextlib.nullcontext()
@@ -0,0 +1,45 @@
+// Tracing preload for benchmark runs; the app itself carries no tracing code.
+//
+//   NODE_OPTIONS="--require ./harness/otel/register.js" \
+//   OTEL_EXPORTER_OTLP_ENDPOINT=http://127.0.0.1:4318 npm start
+//
+// Needs (dev only, not app dependencies):
+//   npm i --no-save @opentelemetry/api @opentelemetry/sdk-trace-node \
+//     @opentelemetry/exporter-trace-otlp-http @opentelemetry/instrumentation \
+//     @opentelemetry/instrumentation-http @prisma/instrumentation
+//
+// The HTTP instrumentation continues the harness's traceparent, Next.js
+// adds its route handler spans and Prisma adds one span per query, which
+// is what `python -m harness.tracing` splits into auth / db / serialization.
+
+try {
+  const { NodeTracerProvider, BatchSpanProcessor } = require('@opentelemetry/sdk-trace-node')
+  const { OTLPTraceExporter } = require('@opentelemetry/exporter-trace-otlp-http')
+  const { registerInstrumentations } = require('@opentelemetry/instrumentation')
+  const { HttpInstrumentation } = require('@opentelemetry/instrumentation-http')
+  const { PrismaInstrumentation } = require('@prisma/instrumentation')
+
+  const endpoint = (process.env.OTEL_EXPORTER_OTLP_ENDPOINT || 'http://127.0.0.1:4318').replace(/\/$/, '')
+  const provider = new NodeTracerProvider({
+    spanProcessors: [new BatchSpanProcessor(new OTLPTraceExporter({ url: `${endpoint}/v1/traces` }), {
+      scheduledDelayMillis: 1000,
+    })],
+  })
+  provider.register()
+
+  registerInstrumentations({
+    tracerProvider: provider,
+    instrumentations: [
+      new HttpInstrumentation({
+        // Only trace incoming API calls, not the exporter's own requests
+        ignoreIncomingRequestHook: (req) => !(req.url || '').startsWith('/api/'),
+        ignoreOutgoingRequestHook: () => true,
+      }),
+      new PrismaInstrumentation(),
+    ],
+  })
+
+  console.log(`[harness-otel] exporting spans to ${endpoint}`)
+} catch (error) {
+  console.warn(`[harness-otel] tracing disabled: ${error.message}`)
+}
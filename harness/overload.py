@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Overload and backpressure characterization
+
+Drives the app with an open-loop arrival rate (requests keep arriving on
+schedule however slow the server gets, like real users) that climbs in
+steps well past capacity, then drops back to the starting rate and
+measures how long the app takes to recover:
+
+    python -m harness.overload --rates 5,10,20,40,80,160 --stage-seconds 30 \\
+        --sockets 50 --app-log bench_runs/next.log
+
+Each arrival runs one flow step from harness.steps (the same flows as
+the backend testers; tester:<method> works too) as one of --users
+signed-in virtual users. Per stage the report shows offered vs achieved
+throughput, client-side queueing delay (arrivals waiting for a free
+worker), latency, timeouts, 5xx responses, Prisma pool errors counted in
+the app log, and Socket.IO disconnects among --sockets long-polling
+notification clients. The knee is the last stage that still kept up.
+"""
+
+import argparse
+import contextlib
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from . import metrics
+from .config import BASE_URL, WS_URL
+from .live import LiveDashboard
+from .results import RunRecorder
+from .sockets import PollingSocket
+from .stats import format_ms, percentile
+from .steps import VirtualUser, run_step
+
+DEFAULT_FLOWS = ['dashboard_stats', 'inbox_list', 'my_tasks', 'project_tasks', 'update_task']
+
+# Prisma connection pool exhaustion / database connection failures in the app log
+POOL_ERROR_RE = re.compile(r'P2024|P2037|P1001|Timed out fetching a new connection|too many (clients|connections)',
+                           re.I)
+
+
+class LogWatcher:
+    """Counts pool errors (or other pattern matches) appended to the app log since the last call"""
+
+    def __init__(self, path, pattern=POOL_ERROR_RE):
+        self.path = path
+        self.pattern = pattern
+        self.offset = 0
+        if path:
+            try:
+                with open(path, 'rb') as f:
+                    f.seek(0, 2)
+                    self.offset = f.tell()
+            except OSError:
+                self.path = None
+
+    def new_errors(self):
+        if not self.path:
+            return None
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read()
+            self.offset = f.tell()
+        return len(self.pattern.findall(chunk.decode('utf-8', errors='replace')))
+
+
+class OverloadRunner:
+    def __init__(self, args):
+        self.args = args
+        self.recorder = RunRecorder('overload')
+        self.users = []
+        self.sockets = []
+        self.arrivals = []  # one dict per arrival
+        self.stages = []
+        self.log = LogWatcher(args.app_log)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self.submitted = 0
+        self.t0 = None
+
+    def setup(self):
+        print(f"👥 Signing up {self.args.users} virtual users...")
+        for index in range(self.args.users):
+            vu = VirtualUser(index, self.args.base_url, recorder=self.recorder, namespace='overload')
+            vu.client.timeout = self.args.timeout
+            vu.sign_up()
+            for name in ('create_project', 'create_task', 'create_task'):
+                run_step(vu, name)
+            self.users.append(vu)
+        for index in range(self.args.sockets):
+            user = self.users[index % len(self.users)].client.user
+            self.sockets.append(PollingSocket(self.args.ws_url, user_id=user['id'], recorder=self.recorder).start())
+        if self.sockets:
+            print(f"🔌 {len(self.sockets)} Socket.IO clients connecting...")
+            time.sleep(2)
+
+    def arrive(self, index, scheduled, stage):
+        started = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+        vu = self.users[index % len(self.users)]
+        flow = self.args.flows[index % len(self.args.flows)]
+        outcome = 'ok'
+        try:
+            if not run_step(vu, flow):
+                outcome = 'failed'
+        except requests.Timeout:
+            outcome = 'timeout'
+        except Exception as e:
+            outcome = type(e).__name__
+        finished = time.perf_counter()
+        with self._lock:
+            self._in_flight -= 1
+            self.arrivals.append({'stage': stage, 'flow': flow, 'scheduled': scheduled, 'started': started,
+                                  'finished': finished, 'outcome': outcome})
+
+    def drive(self, pool, rate, seconds, stage):
+        """Submit arrivals on schedule at a fixed rate, whether or not earlier ones have finished"""
+        interval = 1.0 / rate
+        stage_start = time.perf_counter()
+        for i in range(int(rate * seconds)):
+            due = stage_start + i * interval
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(self.arrive, self.submitted, due, stage)
+            self.submitted += 1
+        remaining = stage_start + seconds - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def summarize_stage(self, stage, window):
+        arrivals = [a for a in self.arrivals if a['stage'] == stage]
+        ok = [a for a in arrivals if a['outcome'] == 'ok']
+        latencies = [(a['finished'] - a['started']) * 1000 for a in ok]
+        queue = [max(a['started'] - a['scheduled'], 0) * 1000 for a in arrivals]
+        # Recorder samples are stamped in seconds since the run started
+        since, until = window['started'] - self.t0, window['ended'] - self.t0
+        samples = [s for s in self.recorder.samples if since <= s['ts'] < until]
+        return {
+            'stage': stage,
+            'offeredRps': window['rate'],
+            'achievedRps': sum(1 for a in ok if a['finished'] <= window['ended']) / (until - since),
+            'arrivals': len(arrivals),
+            'ok': len(ok),
+            'failed': sum(1 for a in arrivals if a['outcome'] not in ('ok', 'timeout')),
+            'timeouts': sum(1 for a in arrivals if a['outcome'] == 'timeout'),
+            'http5xx': sum(1 for s in samples if (s['status'] or 0) >= 500),
+            'latencyMs': {'p50': percentile(latencies, 50), 'p99': percentile(latencies, 99)},
+            'queueMs': {'p50': percentile(queue, 50), 'p99': percentile(queue, 99)},
+            'maxInFlight': window['maxInFlight'],
+            'poolErrors': window['poolErrors'],
+            'wsDisconnects': window['wsDisconnects'],
+        }
+
+    def recovery_seconds(self, drop_at, baseline):
+        """Seconds after the drop until 1s buckets stay near the baseline for --settle seconds"""
+        buckets = {}
+        for a in self.arrivals:
+            if a['scheduled'] >= drop_at:
+                second = int(a['scheduled'] - drop_at)
+                buckets.setdefault(second, []).append(a)
+        limit = (baseline['latencyMs']['p50'] or 0) * self.args.recovery_factor
+        healthy = {}
+        for second, items in buckets.items():
+            ok = [a for a in items if a['outcome'] == 'ok']
+            p50 = percentile([(a['finished'] - a['started']) * 1000 for a in ok], 50)
+            healthy[second] = (len(ok) / len(items) >= 0.99 and p50 is not None and p50 <= max(limit, 1))
+        last = max(buckets) if buckets else -1
+        for second in range(last + 1):
+            window = [healthy.get(s, False) for s in range(second, second + self.args.settle)]
+            if len(window) == self.args.settle and all(window):
+                return second
+        return None
+
+    def knee(self):
+        baseline = self.stages[0]
+        kept_up = None
+        for stage in self.stages[:-1]:  # the last stage is the recovery
+            error_rate = 1 - stage['ok'] / max(stage['arrivals'], 1)
+            p99 = stage['latencyMs']['p99'] or float('inf')
+            if (stage['achievedRps'] >= 0.95 * stage['offeredRps'] and error_rate < 0.01
+                    and p99 <= 5 * (baseline['latencyMs']['p99'] or p99)):
+                kept_up = stage
+            else:
+                break
+        return kept_up
+
+    def run(self):
+        print("=" * 80)
+        print("OVERLOAD / BACKPRESSURE CHARACTERIZATION")
+        print("=" * 80)
+        self.setup()
+        plan = [(rate, self.args.stage_seconds) for rate in self.args.rates]
+        plan.append((self.args.rates[0], self.args.recover_seconds))
+        # perf_counter value at the recorder's start, to line arrivals up with sample timestamps
+        self.t0 = time.perf_counter() - (time.time() - self.recorder.started_at)
+        windows = []
+        with ThreadPoolExecutor(max_workers=self.args.max_in_flight) as pool:
+            for stage, (rate, seconds) in enumerate(plan):
+                label = "recovery" if stage == len(plan) - 1 else f"stage {stage + 1}/{len(plan) - 1}"
+                print(f"📈 {label}: {rate:g} rps for {seconds:g}s")
+                with self._lock:
+                    self._max_in_flight = self._in_flight
+                disconnects = self.recorder.counters.get('ws.disconnect', 0)
+                started = time.perf_counter()
+                self.drive(pool, rate, seconds, stage)
+                windows.append({'rate': rate, 'started': started, 'ended': time.perf_counter(),
+                                'maxInFlight': self._max_in_flight, 'poolErrors': self.log.new_errors(),
+                                'wsDisconnects': self.recorder.counters.get('ws.disconnect', 0) - disconnects})
+            print("⏳ Draining in-flight requests...")
+        for socket in self.sockets:
+            socket.close()
+
+        self.stages = [self.summarize_stage(stage, window) for stage, window in enumerate(windows)]
+        recovery = self.recovery_seconds(windows[-1]['started'], self.stages[0])
+        knee = self.knee()
+        self.recorder.add_section('overload', {
+            'flows': self.args.flows,
+            'stages': self.stages,
+            'recoverySec': recovery,
+            'kneeRps': knee['offeredRps'] if knee else None,
+            'socketReconnectMs': [ms for s in self.sockets for ms in s.reconnect_ms],
+        })
+        self.print_report(recovery, knee)
+        print(f"\n💾 Results: {self.recorder.save()}")
+        return recovery is not None
+
+    def print_report(self, recovery, knee):
+        print("=" * 80)
+        print(f"{'stage':<9} {'offered':>8} {'achieved':>9} {'queue p99':>10} {'p50':>9} {'p99':>9} "
+              f"{'timeout':>8} {'5xx':>5} {'pool':>5} {'ws drop':>8}")
+        for i, s in enumerate(self.stages):
+            name = 'recover' if i == len(self.stages) - 1 else str(i + 1)
+            pool_errors = '-' if s['poolErrors'] is None else s['poolErrors']
+            print(f"{name:<9} {s['offeredRps']:>8g} {s['achievedRps']:>9.1f} {format_ms(s['queueMs']['p99']):>10} "
+                  f"{format_ms(s['latencyMs']['p50']):>9} {format_ms(s['latencyMs']['p99']):>9} "
+                  f"{s['timeouts']:>8} {s['http5xx']:>5} {pool_errors:>5} {s['wsDisconnects']:>8}")
+        print()
+        if knee:
+            print(f"📊 Kept up to {knee['offeredRps']:g} rps (p99 {format_ms(knee['latencyMs']['p99'])})")
+        else:
+            print("🚨 Did not keep up even at the first stage")
+        if recovery is None:
+            print(f"🚨 Not recovered within {self.args.recover_seconds:g}s "
+                  f"of dropping back to {self.args.rates[0]:g} rps")
+        else:
+            print(f"✅ Recovered {recovery}s after dropping back to {self.args.rates[0]:g} rps")
+        reconnects = [ms for s in self.sockets for ms in s.reconnect_ms]
+        if reconnects:
+            print(f"🔌 {len(reconnects)} socket reconnects, p50 downtime {format_ms(percentile(reconnects, 50))}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--ws-url', default=WS_URL)
+    parser.add_argument('--rates', type=lambda v: [float(x) for x in v.split(',')], default=[5, 10, 20, 40, 80, 160],
+                        help="arrival rate per stage (rps); the first is also the recovery rate")
+    parser.add_argument('--stage-seconds', type=float, default=30)
+    parser.add_argument('--recover-seconds', type=float, default=60)
+    parser.add_argument('--flow', dest='flows', action='append', default=None,
+                        help="step from harness.steps (or tester:<method>); repeatable")
+    parser.add_argument('--users', type=int, default=20, help="signed-in virtual users sharing the arrivals")
+    parser.add_argument('--sockets', type=int, default=0, help="Socket.IO notification clients kept open")
+    parser.add_argument('--timeout', type=float, default=10, help="client timeout per request (s)")
+    parser.add_argument('--max-in-flight', type=int, default=256, help="worker threads; arrivals beyond queue")
+    parser.add_argument('--app-log', default=None, help="Next.js log to count Prisma pool errors in")
+    parser.add_argument('--recovery-factor', type=float, default=1.5, help="recovered when p50 <= baseline x this")
+    parser.add_argument('--settle', type=int, default=5, help="seconds that must stay healthy to count as recovered")
+    parser.add_argument('--live', action='store_true', help="live dashboard, refreshed every second")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    args.flows = args.flows or DEFAULT_FLOWS
+
+    runner = OverloadRunner(args)
+    with metrics.exporter_for(args, runner.recorder), \
+            LiveDashboard(runner.recorder) if args.live else contextlib.nullcontext():
+        recovered = runner.run()
+    return 0 if recovered else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Deep pagination and large-feed benchmark for the inbox and activity feeds
+
+Seeds one user with very large inbox and activity feeds (COPY straight
+into Postgres, see harness.seed.SqlSeeder) and measures:
+
+  * GET /api/inbox at page 1, 100 and 10,000 for every filter
+    (active/archived/all) with and without a type filter. The route only
+    has `take: limit`, so page N is reached the way a "load more" client
+    does it: limit = N * page size.
+  * GET /api/activity (fixed `take: 20`) as the feed grows.
+  * The same pages as SQL with OFFSET versus a keyset cursor
+    ("createdAt" < last seen), to show what cursor pagination would buy.
+  * PATCH /api/inbox "mark all read" (bulk_action, one upsert per item)
+    and mark_read with explicit id batches.
+
+    DATABASE_URL=postgres://... python -m harness.pagination --sizes 10000,100000,300000
+"""
+
+import argparse
+import sys
+import time
+
+import requests
+
+from .client import ApiClient
+from .config import BASE_URL
+from .db import Database, DatabaseError
+from .results import RunRecorder
+from .seed import ApiSeeder, SqlSeeder
+from .stats import format_ms, summarize
+
+FILTERS = ['active', 'archived', 'all']
+STATUS_SQL = {
+    'active': """AND status = 'ACTIVE'""",
+    'archived': """AND status = 'ARCHIVED'""",
+    'all': "",
+}
+
+
+class PaginationBenchmark:
+    def __init__(self, args):
+        self.args = args
+        self.recorder = RunRecorder('pagination')
+        self.client = ApiClient(args.base_url, recorder=self.recorder, timeout=args.timeout)
+        self.db = Database(args.database_url)
+        self.sql = SqlSeeder(self.db)
+        self.user_id = None
+        self.project_id = None
+        self.seeded = {'inbox': 0, 'activities': 0}
+        self.results = []
+
+    def setup(self):
+        self.client.register_and_login("Pagination Bench")
+        self.user_id = self.client.user['id']
+        self.project_id = ApiSeeder(self.client, self.args.base_url, namespace='pagination').create_project()
+
+    def grow(self, size):
+        inbox = size - self.seeded['inbox']
+        activities = int(size * self.args.activity_ratio) - self.seeded['activities']
+        start = time.perf_counter()
+        if inbox > 0:
+            self.sql.inbox_items(self.user_id, inbox, archived_ratio=self.args.archived_ratio,
+                                 start=self.seeded['inbox'])
+            self.seeded['inbox'] += inbox
+        if activities > 0:
+            self.sql.activities(self.user_id, self.project_id, activities, start=self.seeded['activities'])
+            self.seeded['activities'] += activities
+        self.db.execute('ANALYZE "inbox_items"; ANALYZE "activities"')
+        print(f"🌱 {self.seeded['inbox']} inbox items / {self.seeded['activities']} activities "
+              f"({time.perf_counter() - start:.1f}s)")
+
+    def timed(self, label, func, repeat):
+        timings = []
+        status = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            try:
+                response = func()
+                status = response.status_code
+                if status < 500:
+                    timings.append((time.perf_counter() - start) * 1000)
+            except requests.RequestException as e:
+                status = type(e).__name__
+        return {'label': label, 'status': status, **summarize(timings)}
+
+    def add_result(self, size, kind, result, **extra):
+        entry = {'size': size, 'kind': kind, **extra, **result}
+        self.results.append(entry)
+        print(f"   {kind:<10} {result['label']:<44} "
+              f"{format_ms(result.get('p50')):>9} {format_ms(result.get('max')):>9}")
+
+    def measure_inbox_pages(self, size):
+        page_size = self.args.page_size
+        for filter_name in FILTERS:
+            for item_type in [None, self.args.type]:
+                for page in self.args.pages:
+                    limit = page * page_size
+                    if limit > size + page_size:
+                        continue
+                    params = {'filter': filter_name, 'limit': limit}
+                    if item_type:
+                        params['type'] = item_type
+                    label = f"inbox {filter_name}{'/' + item_type if item_type else ''} page {page}"
+                    endpoint = f"GET /inbox {filter_name}{' type' if item_type else ''} page {page}"
+                    result = self.timed(label, lambda: self.client.get("/inbox", params=params, endpoint=endpoint),
+                                        self.args.repeat)
+                    self.add_result(size, 'api', result, filter=filter_name, type=item_type, page=page)
+                    self.measure_sql_page(size, filter_name, item_type, page)
+
+    def measure_sql_page(self, size, filter_name, item_type, page):
+        """OFFSET page versus keyset page for the same rows"""
+        page_size = self.args.page_size
+        where = f""""userId" = '{self.user_id}' {STATUS_SQL[filter_name]}"""
+        if item_type:
+            where += f""" AND type = '{item_type}'"""
+        offset = (page - 1) * page_size
+        order = 'ORDER BY "createdAt" DESC'
+        offset_sql = f'SELECT * FROM "inbox_items" WHERE {where} {order} OFFSET {offset} LIMIT {page_size}'
+        label = f"inbox {filter_name}{'/' + item_type if item_type else ''} page {page}"
+        self.add_result(size, 'sql offset', {'label': label, 'p50': self.db.explain_analyze(offset_sql)},
+                        filter=filter_name, type=item_type, page=page)
+        # Keyset page N continues after the last row of page N-1; page 1 has no cursor
+        cursor_sql = ''
+        if offset > 0:
+            cursor = self.db.scalar(f'SELECT "createdAt" FROM "inbox_items" WHERE {where} {order} '
+                                    f'OFFSET {offset - 1} LIMIT 1')
+            if not cursor:
+                return
+            cursor_sql = f' AND "createdAt" < \'{cursor}\''
+        keyset_sql = f'SELECT * FROM "inbox_items" WHERE {where}{cursor_sql} {order} LIMIT {page_size}'
+        self.add_result(size, 'sql keyset', {'label': label, 'p50': self.db.explain_analyze(keyset_sql)},
+                        filter=filter_name, type=item_type, page=page)
+
+    def measure_activity(self, size):
+        for scope, params in [('all', {}), ('project', {'projectId': self.project_id})]:
+            result = self.timed(f"activity {scope}", lambda: self.client.get(
+                "/activity", params=params, endpoint=f"GET /activity {scope}"), self.args.repeat)
+            self.add_result(size, 'api', result)
+
+    def reset_reads(self):
+        self.db.execute(f"""DELETE FROM "inbox_item_reads" WHERE "userId" = '{self.user_id}'""")
+
+    def measure_bulk(self, size):
+        """mark_read id batches always; mark-all-read only up to --bulk-max items"""
+        for batch in self.args.batches:
+            ids = [row[0] for row in self.db.query(
+                f"""SELECT id FROM "inbox_items" WHERE "userId" = '{self.user_id}' AND status = 'ACTIVE'
+                    ORDER BY "createdAt" DESC LIMIT {batch}""")]
+            result = self.timed(f"mark_read {len(ids)} ids", lambda: self.client.patch(
+                "/inbox", json={'action': 'mark_read', 'ids': ids}, endpoint=f"PATCH /inbox mark_read x{batch}"), 1)
+            self.add_result(size, 'bulk', result, batch=len(ids))
+            self.reset_reads()
+
+        if size > self.args.bulk_max:
+            print(f"   bulk       mark all read skipped ({size} > --bulk-max {self.args.bulk_max})")
+            return
+        result = self.timed("mark all read (bulk_action)", lambda: self.client.patch(
+            "/inbox", json={'action': 'bulk_action', 'ids': [], 'options': {'readAction': True}},
+            endpoint="PATCH /inbox bulk_action"), 1)
+        self.add_result(size, 'bulk', result)
+        if result.get('p50'):
+            active = int(self.db.scalar(
+                f"""SELECT count(*) FROM "inbox_items" WHERE "userId" = '{self.user_id}' AND status = 'ACTIVE'"""))
+            print(f"   bulk       {active} upserts -> {result['p50'] / max(active, 1):.2f}ms per item")
+        self.reset_reads()
+
+    def run(self):
+        print("=" * 80)
+        print("DEEP PAGINATION / LARGE FEED BENCHMARK")
+        print("=" * 80)
+        self.setup()
+        for size in self.args.sizes:
+            self.grow(size)
+            print(f"   {'kind':<10} {'measurement':<44} {'p50':>9} {'max':>9}")
+            self.measure_inbox_pages(size)
+            self.measure_activity(size)
+            self.measure_bulk(size)
+            print()
+
+        self.recorder.add_section('pagination', {
+            'pageSize': self.args.page_size,
+            'pages': self.args.pages,
+            'results': self.results,
+        })
+        print(f"💾 Results: {self.recorder.save()}")
+        return True
+
+
+def int_list(value):
+    return [int(x) for x in value.split(',')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--database-url', default=None, help="defaults to $DATABASE_URL")
+    parser.add_argument('--sizes', type=int_list, default=[10000, 100000, 500000], help="inbox items per step")
+    parser.add_argument('--activity-ratio', type=float, default=1.0, help="activities seeded per inbox item")
+    parser.add_argument('--archived-ratio', type=float, default=0.2)
+    parser.add_argument('--pages', type=int_list, default=[1, 100, 10000])
+    parser.add_argument('--page-size', type=int, default=50, help="the route's default limit")
+    parser.add_argument('--type', default='TASK_ASSIGNMENT', help="type used for the type-filtered pages")
+    parser.add_argument('--batches', type=int_list, default=[10, 100, 1000], help="mark_read id batch sizes")
+    parser.add_argument('--bulk-max', type=int, default=20000, help="largest feed for mark-all-read")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--timeout', type=int, default=600)
+    args = parser.parse_args(argv)
+
+    try:
+        benchmark = PaginationBenchmark(args)
+    except DatabaseError as e:
+        print(f"❌ {e}")
+        return 1
+    return 0 if benchmark.run() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Response payload size, serialization cost and compression report
+
+Grows one user's dataset step by step (tasks and members across a few
+projects) and, at every step, fetches each endpoint with identity, gzip
+and brotli Accept-Encoding. For every request it records wire size,
+time-to-first-byte and total download time, plus the client-side JSON
+parse time. Payload growth is fitted against dataset size on a log-log
+scale; endpoints whose exponent exceeds --superlinear are flagged.
+
+    python -m harness.payloads --scales 25,50,100,200,400 --projects 3
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+
+import requests
+
+from .client import ApiClient
+from .config import BASE_URL
+from .results import RunRecorder
+from .seed import ApiSeeder
+from .stats import format_ms, percentile
+
+ENCODINGS = ['identity', 'gzip', 'br']
+
+DEFAULT_ENDPOINTS = [
+    "/projects",
+    "/my-tasks",
+    "/projects/{project}",
+    "/projects/{project}/tasks",
+    "/dashboard/stats",
+    "/dashboard/recent-tasks",
+    "/activity",
+    "/inbox",
+    "/search?q=seed",
+]
+
+
+def measure_transfer(client, path, encoding, timeout=60):
+    """One GET split into TTFB and body download, keeping the raw (still encoded) bytes"""
+    start = time.perf_counter()
+    response = client.session.get(f"{client.base_url}{path}", headers={'Accept-Encoding': encoding},
+                                  stream=True, timeout=timeout)
+    ttfb = time.perf_counter() - start
+    raw = response.raw.read(decode_content=False)
+    total = time.perf_counter() - start
+    response.close()
+    return {
+        'status': response.status_code,
+        'contentEncoding': response.headers.get('Content-Encoding', 'identity'),
+        'wireBytes': len(raw),
+        'ttfbMs': ttfb * 1000,
+        'totalMs': total * 1000,
+        'raw': raw,
+    }
+
+
+def growth_exponent(xs, ys):
+    """Least-squares slope of log(y) against log(x); 1.0 means linear growth"""
+    points = [(math.log(x), math.log(y)) for x, y in zip(xs, ys) if x > 0 and y > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(p[0] for p in points) / len(points)
+    mean_y = sum(p[1] for p in points) / len(points)
+    var_x = sum((p[0] - mean_x) ** 2 for p in points)
+    if var_x == 0:
+        return None
+    return sum((p[0] - mean_x) * (p[1] - mean_y) for p in points) / var_x
+
+
+def linear_slope(xs, ys):
+    """Ordinary least-squares slope of y against x"""
+    if len(xs) < 2:
+        return None
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+
+
+class PayloadBenchmark:
+    def __init__(self, args):
+        self.args = args
+        self.recorder = RunRecorder('payloads')
+        self.owner = ApiClient(args.base_url)
+        self.seeder = ApiSeeder(self.owner, args.base_url, namespace='payload')
+        self.series = {}  # endpoint -> list of per-scale points
+
+    def dataset_rows(self):
+        """Rows the owner can see through nested includes"""
+        return self.seeder.total_tasks + self.seeder.total_members + len(self.seeder.projects)
+
+    def grow(self, tasks_per_project):
+        members = max(1, int(tasks_per_project * self.args.members_ratio))
+        for project_id in self.seeder.projects:
+            self.seeder.grow_to(project_id, tasks=tasks_per_project, members=members)
+
+    def measure_endpoint(self, template, rows):
+        path = template.replace('{project}', next(iter(self.seeder.projects)))
+        point = {'rows': rows}
+        for encoding in ENCODINGS:
+            samples = []
+            for _ in range(self.args.repeat):
+                try:
+                    samples.append(measure_transfer(self.owner, path, encoding))
+                except requests.RequestException as e:
+                    self.recorder.record(template, 0, error=type(e).__name__, encoding=encoding, rows=rows)
+            if not samples:
+                continue
+            for s in samples:
+                self.recorder.record(template, s['totalMs'], status=s['status'], size=s['wireBytes'],
+                                     encoding=encoding, contentEncoding=s['contentEncoding'],
+                                     ttfbMs=s['ttfbMs'], rows=rows)
+            point[encoding] = {
+                'contentEncoding': samples[-1]['contentEncoding'],
+                'wireBytes': samples[-1]['wireBytes'],
+                'ttfbMs': percentile([s['ttfbMs'] for s in samples], 50),
+                'totalMs': percentile([s['totalMs'] for s in samples], 50),
+            }
+            if encoding == 'identity':
+                start = time.perf_counter()
+                try:
+                    json.loads(samples[-1]['raw'])
+                    point['parseMs'] = (time.perf_counter() - start) * 1000
+                except ValueError:
+                    point['parseMs'] = None
+                point['bytes'] = samples[-1]['wireBytes']
+        self.series.setdefault(template, []).append(point)
+
+    def analyse(self):
+        """Growth exponent and TTFB cost per KB for each endpoint"""
+        analysis = {}
+        for endpoint, points in self.series.items():
+            points = [p for p in points if p.get('bytes')]
+            rows = [p['rows'] for p in points]
+            sizes = [p['bytes'] for p in points]
+            ttfbs = [p['identity']['ttfbMs'] for p in points]
+            exponent = growth_exponent(rows, sizes)
+            slope = linear_slope([s / 1024 for s in sizes], ttfbs)
+            analysis[endpoint] = {
+                'growthExponent': exponent,
+                'superlinear': exponent is not None and exponent > self.args.superlinear,
+                'ttfbMsPerKb': slope,
+                'largestBytes': max(sizes) if sizes else None,
+                'gzipRatio': self.ratio(points, 'gzip'),
+                'brRatio': self.ratio(points, 'br'),
+            }
+        return analysis
+
+    @staticmethod
+    def ratio(points, encoding):
+        last = points[-1] if points else None
+        if not last or encoding not in last or last[encoding]['contentEncoding'] != encoding:
+            return None
+        return last[encoding]['wireBytes'] / last['bytes']
+
+    def print_report(self, analysis):
+        print("=" * 80)
+        print("PAYLOAD SIZE REPORT")
+        print("=" * 80)
+        for endpoint, points in self.series.items():
+            print(f"\n{endpoint}")
+            print(f"   {'rows':>7} {'identity':>10} {'gzip':>10} {'br':>10} {'ttfb':>9} {'total':>9} {'parse':>9}")
+            for p in points:
+                sizes = []
+                for encoding in ENCODINGS:
+                    entry = p.get(encoding)
+                    if not entry:
+                        sizes.append('-')
+                    elif entry['contentEncoding'] != encoding:
+                        sizes.append('n/a')  # server ignored the requested encoding
+                    else:
+                        sizes.append(f"{entry['wireBytes'] / 1024:.1f}K")
+                identity = p.get('identity', {})
+                print(f"   {p['rows']:>7} {sizes[0]:>10} {sizes[1]:>10} {sizes[2]:>10} "
+                      f"{format_ms(identity.get('ttfbMs')):>9} {format_ms(identity.get('totalMs')):>9} "
+                      f"{format_ms(p.get('parseMs')):>9}")
+
+        print("\n" + "=" * 80)
+        print(f"{'endpoint':<32} {'exponent':>9} {'ttfb/KB':>9} {'gzip':>7} {'br':>7}")
+        for endpoint, a in analysis.items():
+            flag = "🚨" if a['superlinear'] else "  "
+            exponent = f"{a['growthExponent']:.2f}" if a['growthExponent'] is not None else '-'
+            slope = format_ms(a['ttfbMsPerKb']) if a['ttfbMsPerKb'] is not None else '-'
+            gzip = f"{a['gzipRatio']:.0%}" if a['gzipRatio'] else 'off'
+            br = f"{a['brRatio']:.0%}" if a['brRatio'] else 'off'
+            print(f"{flag}{endpoint[:30]:<30} {exponent:>9} {slope:>9} {gzip:>7} {br:>7}")
+        flagged = [e for e, a in analysis.items() if a['superlinear']]
+        if flagged:
+            print(f"\n🚨 Superlinear payload growth (exponent > {self.args.superlinear}): {', '.join(flagged)}")
+        else:
+            print("\n✅ No endpoint grows superlinearly with the dataset")
+
+    def run(self):
+        print("=" * 80)
+        print("PAYLOAD SIZE / COMPRESSION BENCHMARK")
+        print("=" * 80)
+        self.owner.register_and_login("Payload Bench Owner")
+        for _ in range(self.args.projects):
+            self.seeder.create_project()
+
+        for scale in self.args.scales:
+            print(f"🌱 Growing to {scale} tasks per project...")
+            self.grow(scale)
+            rows = self.dataset_rows()
+            print(f"📏 Measuring {len(self.args.endpoints)} endpoints at {rows} rows")
+            for template in self.args.endpoints:
+                self.measure_endpoint(template, rows)
+
+        analysis = self.analyse()
+        self.recorder.add_section('payloads', {'series': self.series, 'analysis': analysis,
+                                               'scales': self.args.scales})
+        self.print_report(analysis)
+        print(f"\n💾 Results: {self.recorder.save()}")
+        return not any(a['superlinear'] for a in analysis.values())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--scales', type=lambda v: [int(x) for x in v.split(',')], default=[25, 50, 100, 200],
+                        help="tasks per project at each measurement step")
+    parser.add_argument('--projects', type=int, default=3)
+    parser.add_argument('--members-ratio', type=float, default=0.05, help="members per task in each project")
+    parser.add_argument('--repeat', type=int, default=5, help="requests per endpoint/encoding/scale")
+    parser.add_argument('--superlinear', type=float, default=1.15, help="growth exponent that gets flagged")
+    parser.add_argument('--endpoint', dest='endpoints', action='append', default=None,
+                        help="endpoint to measure ({project} = first seeded project); repeatable")
+    args = parser.parse_args(argv)
+    args.endpoints = args.endpoints or DEFAULT_ENDPOINTS
+
+    benchmark = PayloadBenchmark(args)
+    return 0 if benchmark.run() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
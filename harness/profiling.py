@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Server-side CPU profiles, heap snapshots and flamegraphs per load phase
+
+Starts Next.js and the websocket server with the inspector enabled (or
+attaches to processes already started with --inspect), then runs each
+load phase while the V8 sampling profiler records every node process:
+
+    python -m harness.profiling \\
+        --phase "inbox read storm=inbox_read_storm" \\
+        --phase "production mix=production_mix" --users 30 --duration 60 --heap
+
+A phase is NAME=SCENARIO, where SCENARIO is a harness.scenario file. For
+every phase and process the run directory gets profiles/<phase>-<process>
+.cpuprofile (loads in Chrome DevTools or speedscope), .folded stacks (for
+flamegraph.pl), a rendered .svg flamegraph and, with --heap, heap
+snapshots taken before and after the phase. profiles/index.html links
+them all and results.json lists them under "profiles".
+
+Other tools can mark their own phases:
+
+    with PhaseProfiler(targets, out_dir, recorder).phase("lock contention"):
+        ...
+
+Talking to the inspector needs websocket-client (pip install websocket-client).
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+
+from .config import BASE_URL
+from .results import RunRecorder
+from .scenario import ScenarioRunner, load_scenario
+from .servers import next_server, websocket_server
+
+
+def _connect(ws_url, timeout):
+    try:
+        import websocket
+    except ImportError:
+        raise RuntimeError("websocket-client is required to talk to the inspector (pip install websocket-client)")
+    return websocket.create_connection(ws_url, timeout=timeout, suppress_origin=True)
+
+
+class InspectorSession:
+    """Minimal Chrome DevTools Protocol client for one node process"""
+
+    def __init__(self, name, ws_url, timeout=300):
+        self.name = name
+        self.ws_url = ws_url
+        self.ws = _connect(ws_url, timeout)
+        self._next_id = 0
+
+    def call(self, method, params=None, on_event=None):
+        """Send a command and wait for its result, passing events to on_event"""
+        self._next_id += 1
+        message_id = self._next_id
+        self.ws.send(json.dumps({'id': message_id, 'method': method, 'params': params or {}}))
+        while True:
+            message = json.loads(self.ws.recv())
+            if message.get('id') == message_id:
+                if 'error' in message:
+                    raise RuntimeError(f"{method} failed on {self.name}: {message['error'].get('message')}")
+                return message.get('result', {})
+            if on_event and 'method' in message:
+                on_event(message['method'], message.get('params', {}))
+
+    def start_profile(self, interval_us=1000):
+        self.call('Profiler.enable')
+        self.call('Profiler.setSamplingInterval', {'interval': interval_us})
+        self.call('Profiler.start')
+
+    def stop_profile(self):
+        return self.call('Profiler.stop')['profile']
+
+    def heap_snapshot(self, path):
+        """Stream a heap snapshot to path; returns its size in bytes"""
+        size = 0
+        with open(path, 'w', encoding='utf-8') as f:
+            def on_event(method, params):
+                nonlocal size
+                if method == 'HeapProfiler.addHeapSnapshotChunk':
+                    f.write(params['chunk'])
+                    size += len(params['chunk'])
+            self.call('HeapProfiler.enable')
+            self.call('HeapProfiler.takeHeapSnapshot', {'reportProgress': False}, on_event=on_event)
+        return size
+
+    def close(self):
+        self.ws.close()
+
+
+def discover_targets(inspector_url):
+    """DevTools websocket URLs behind an inspector HTTP endpoint (node --inspect=host:port)"""
+    response = requests.get(f"{inspector_url.rstrip('/')}/json/list", timeout=5)
+    return [t['webSocketDebuggerUrl'] for t in response.json() if t.get('webSocketDebuggerUrl')]
+
+
+def _frame_label(call_frame):
+    name = call_frame.get('functionName') or '(anonymous)'
+    url = call_frame.get('url') or ''
+    if not url:
+        return name
+    path = urlsplit(url).path or url
+    if 'node_modules/' in path:
+        path = 'node_modules/' + path.rsplit('node_modules/', 1)[1]
+    else:
+        path = os.path.basename(path)
+    return f"{name} {path}:{call_frame.get('lineNumber', 0) + 1}"
+
+
+def folded_stacks(profile):
+    """Collapse a .cpuprofile into {"root;caller;callee": microseconds}"""
+    nodes = {node['id']: node for node in profile['nodes']}
+    parents = {}
+    for node in profile['nodes']:
+        for child in node.get('children', []):
+            parents[child] = node['id']
+
+    self_time = {}
+    samples = profile.get('samples', [])
+    deltas = profile.get('timeDeltas', [])
+    for i, node_id in enumerate(samples):
+        # timeDeltas[i + 1] is the time spent in sample i
+        delta = deltas[i + 1] if i + 1 < len(deltas) else 0
+        self_time[node_id] = self_time.get(node_id, 0) + max(delta, 0)
+
+    folded = {}
+    for node_id, micros in self_time.items():
+        stack = []
+        current = node_id
+        while current is not None:
+            label = _frame_label(nodes[current]['callFrame'])
+            if label not in ('(root)', '(program)') or current == node_id:
+                stack.append(label)
+            current = parents.get(current)
+        stack = [s for s in reversed(stack) if s != '(root)']
+        if stack:
+            key = ';'.join(stack)
+            folded[key] = folded.get(key, 0) + micros
+    return folded
+
+
+def top_functions(folded, limit=10):
+    """Functions by self time (the leaf of each folded stack)"""
+    totals = {}
+    for stack, micros in folded.items():
+        leaf = stack.rsplit(';', 1)[-1]
+        totals[leaf] = totals.get(leaf, 0) + micros
+    return sorted(totals.items(), key=lambda x: -x[1])[:limit]
+
+
+def _color(name):
+    digest = hashlib.md5(name.encode('utf-8')).digest()
+    return f"rgb({205 + digest[0] % 50},{80 + digest[1] % 130},{digest[2] % 55})"
+
+
+def flamegraph_svg(folded, title, width=1200, row=16):
+    """Render folded stacks as a standalone SVG flamegraph (root at the bottom)"""
+    tree = {'value': 0, 'children': {}}
+    for stack, micros in folded.items():
+        tree['value'] += micros
+        node = tree
+        for frame in stack.split(';'):
+            node = node['children'].setdefault(frame, {'value': 0, 'children': {}})
+            node['value'] += micros
+
+    def depth(node):
+        return 1 + max((depth(c) for c in node['children'].values()), default=0)
+
+    levels = depth(tree)
+    height = levels * row + 40
+    total = tree['value'] or 1
+    rects = []
+
+    def draw(node, name, x, level):
+        w = node['value'] / total * (width - 20)
+        if w < 0.3:
+            return
+        y = height - 10 - level * row
+        label = html.escape(name)
+        share = node['value'] / total
+        rects.append(
+            f'<g><title>{label} ({node["value"] / 1000:.1f}ms, {share:.1%})</title>'
+            f'<rect x="{x + 10:.1f}" y="{y - row:.1f}" width="{w:.1f}" height="{row - 1}" '
+            f'fill="{_color(name)}" rx="2"/>'
+            + (f'<text x="{x + 13:.1f}" y="{y - 4:.1f}">{html.escape(name[:int(w / 7)])}</text>' if w > 35 else '')
+            + '</g>'
+        )
+        child_x = x
+        for child_name, child in sorted(node['children'].items()):
+            draw(child, child_name, child_x, level + 1)
+            child_x += child['value'] / total * (width - 20)
+
+    draw(tree, 'all', 0, 0)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="monospace" font-size="11">'
+        f'<rect width="100%" height="100%" fill="#fdfdf6"/>'
+        f'<text x="10" y="18" font-size="14">{html.escape(title)} ({total / 1000:.0f}ms sampled)</text>'
+        + ''.join(rects) + '</svg>'
+    )
+
+
+def _slug(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+class PhaseProfiler:
+    """Profiles every inspector target while a named load phase runs"""
+
+    def __init__(self, targets, out_dir, recorder=None, heap=False, interval_us=1000):
+        self.targets = targets  # [(process name, devtools ws url)]
+        self.out_dir = out_dir
+        self.recorder = recorder
+        self.heap = heap
+        self.interval_us = interval_us
+        self.phases = []
+        os.makedirs(out_dir, exist_ok=True)
+
+    def _artifact(self, filename):
+        return os.path.join(self.out_dir, filename)
+
+    @contextmanager
+    def phase(self, name):
+        sessions = [InspectorSession(target, url) for target, url in self.targets]
+        entry = {'phase': name, 'processes': {}}
+        try:
+            for session in sessions:
+                artifacts = entry['processes'].setdefault(session.name, {})
+                if self.heap:
+                    path = self._artifact(f"{_slug(name)}-{session.name}-before.heapsnapshot")
+                    session.heap_snapshot(path)
+                    artifacts['heapBefore'] = os.path.basename(path)
+                session.start_profile(self.interval_us)
+            started = time.perf_counter()
+            yield entry
+            entry['seconds'] = time.perf_counter() - started
+            for session in sessions:
+                self._collect(session, name, entry['processes'][session.name])
+        finally:
+            for session in sessions:
+                session.close()
+        self.phases.append(entry)
+        if self.recorder:
+            self.recorder.add_section('profiles', {'dir': os.path.relpath(self.out_dir, self.recorder.run_dir),
+                                                   'phases': self.phases})
+
+    def _collect(self, session, phase, artifacts):
+        base = f"{_slug(phase)}-{session.name}"
+        profile = session.stop_profile()
+        with open(self._artifact(f"{base}.cpuprofile"), 'w', encoding='utf-8') as f:
+            json.dump(profile, f)
+        folded = folded_stacks(profile)
+        with open(self._artifact(f"{base}.folded"), 'w', encoding='utf-8') as f:
+            for stack, micros in sorted(folded.items()):
+                f.write(f"{stack} {micros}\n")
+        with open(self._artifact(f"{base}.svg"), 'w', encoding='utf-8') as f:
+            f.write(flamegraph_svg(folded, f"{phase} - {session.name}"))
+        artifacts.update({
+            'cpuprofile': f"{base}.cpuprofile",
+            'folded': f"{base}.folded",
+            'flamegraph': f"{base}.svg",
+            'sampledMs': sum(folded.values()) / 1000,
+            'top': [{'function': fn, 'selfMs': micros / 1000} for fn, micros in top_functions(folded)],
+        })
+        if self.heap:
+            path = self._artifact(f"{base}-after.heapsnapshot")
+            session.heap_snapshot(path)
+            artifacts['heapAfter'] = os.path.basename(path)
+
+    def write_index(self):
+        """profiles/index.html linking every artifact, embedded flamegraphs included"""
+        parts = ['<!doctype html><meta charset="utf-8"><title>Profiles</title>',
+                 '<body style="font-family: sans-serif">']
+        for entry in self.phases:
+            parts.append(f"<h2>{html.escape(entry['phase'])} ({entry.get('seconds', 0):.0f}s)</h2>")
+            for process, artifacts in entry['processes'].items():
+                links = ' · '.join(f'<a href="{html.escape(artifacts[k])}">{k}</a>'
+                                   for k in ('cpuprofile', 'folded', 'heapBefore', 'heapAfter') if k in artifacts)
+                parts.append(f"<h3>{html.escape(process)}</h3><p>{links}</p>")
+                if 'flamegraph' in artifacts:
+                    parts.append(f'<object data="{html.escape(artifacts["flamegraph"])}" type="image/svg+xml" '
+                                 f'style="width: 100%"></object>')
+        path = self._artifact('index.html')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(parts))
+        return path
+
+    def print_summary(self):
+        for entry in self.phases:
+            print(f"\n🔥 {entry['phase']}")
+            for process, artifacts in entry['processes'].items():
+                print(f"   {process} ({artifacts.get('sampledMs', 0):.0f}ms sampled)")
+                for top in artifacts.get('top', [])[:5]:
+                    print(f"      {format(top['selfMs'], '.1f'):>9}ms  {top['function'][:90]}")
+
+
+def start_inspected_servers(recorder, next_mode):
+    """Start both servers with --inspect; returns (servers, [(name, ws url)])"""
+    servers = [
+        websocket_server(log_path=recorder.artifact_path('websocket.log'), inspect=True),
+        next_server(next_mode, log_path=recorder.artifact_path('next.log'), inspect=True),
+    ]
+    for server in servers:
+        print(f"🚀 Starting {server.name} with the inspector enabled...")
+        server.start()
+    time.sleep(2)  # let forked workers print their debugger URLs too
+    targets = []
+    for server in servers:
+        urls = server.inspector_urls()
+        targets.extend((server.name if i == 0 else f"{server.name}-{i}", url) for i, url in enumerate(urls))
+    return servers, targets
+
+
+def parse_phase(value):
+    name, _, scenario = value.partition('=')
+    if not scenario:
+        raise argparse.ArgumentTypeError("phases look like NAME=SCENARIO")
+    return name.strip(), scenario.strip()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--phase', dest='phases', type=parse_phase, action='append', required=True,
+                        help="NAME=SCENARIO; repeatable, run in order")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--inspector', action='append', default=None,
+                        help="attach to a running node --inspect endpoint (e.g. http://127.0.0.1:9229) "
+                             "instead of starting the servers; repeatable")
+    parser.add_argument('--next-mode', default='start', choices=['start', 'dev'])
+    parser.add_argument('--users', type=int, default=None)
+    parser.add_argument('--duration', type=float, default=30, help="seconds per phase")
+    parser.add_argument('--interval-us', type=int, default=1000, help="sampling interval (microseconds)")
+    parser.add_argument('--heap', action='store_true', help="heap snapshots before and after each phase")
+    args = parser.parse_args(argv)
+
+    recorder = RunRecorder('profiling')
+    servers = []
+    try:
+        if args.inspector:
+            targets = [(f"node-{i}", url) for i, base in enumerate(args.inspector) for url in discover_targets(base)]
+        else:
+            servers, targets = start_inspected_servers(recorder, args.next_mode)
+        if not targets:
+            print("❌ No inspector targets found")
+            return 1
+        print(f"🔬 Profiling {', '.join(name for name, _ in targets)}")
+
+        profiler = PhaseProfiler(targets, recorder.artifact_path('profiles'), recorder,
+                                 heap=args.heap, interval_us=args.interval_us)
+        for name, scenario_path in args.phases:
+            scenario = load_scenario(scenario_path)
+            runner = ScenarioRunner(scenario, args.base_url, users=args.users, duration=args.duration,
+                                    think_scale=0, recorder=recorder)
+            print(f"▶️  Phase '{name}': {scenario.get('name')} with {runner.users} users for {runner.duration:g}s")
+            with profiler.phase(name):
+                runner.run()
+        index = profiler.write_index()
+        profiler.print_summary()
+    except (RuntimeError, OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        for server in reversed(servers):
+            server.stop()
+
+    print(f"\n📊 Flamegraphs: {index}")
+    print(f"💾 Results: {recorder.save()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
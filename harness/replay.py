@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Time-scaled replay of captured /api traffic
+
+Replays a harness.capture log against a running app. Every captured
+session gets its own cookie jar and replays its requests strictly in
+order; sessions run concurrently. Timing is scaled by --speed
+(1 = real time, 10 = ten times faster, 0 = as fast as possible) and
+--clones multiplies every session to amplify the load.
+
+    python -m harness.replay bench_runs/capture-20261019-101500.jsonl --speed 10 --clones 5
+
+Ids created during the original capture (projects, tasks, invitations...)
+are remapped to the ids the app returns during replay, and e-mail
+addresses are suffixed per clone so registrations do not collide.
+"""
+
+import argparse
+import contextlib
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import requests
+
+from .capture import read_log, response_ids
+from .client import endpoint_name, trace_headers
+from . import metrics
+from .live import LiveDashboard
+from .results import RunRecorder
+from .stats import format_ms, summarize
+
+_ID_RE = re.compile(r'\bc[a-z0-9]{20,}\b')
+_EMAIL_RE = re.compile(r'([A-Za-z0-9._%+-]+)(@|%40)([A-Za-z0-9.-]+\.[A-Za-z]{2,})')
+_CSRF_RE = re.compile(r'(csrfToken=)[^&]*')
+
+
+def group_sessions(entries):
+    """Split log entries into per-session request lists (keeps capture order)"""
+    sessions = {}
+    for entry in entries:
+        sessions.setdefault(entry['sid'], []).append(entry)
+    return sessions
+
+
+class IdMap:
+    """Captured id -> replayed id, shared by all sessions of one clone"""
+
+    def __init__(self):
+        self._map = {}
+        self._lock = threading.Lock()
+
+    def learn(self, captured_ids, replayed_ids):
+        with self._lock:
+            for old, new in zip(captured_ids, replayed_ids):
+                if old != new:
+                    self._map.setdefault(old, new)
+
+    def rewrite(self, text):
+        if not text or not self._map:
+            return text
+        with self._lock:
+            return _ID_RE.sub(lambda m: self._map.get(m.group(0), m.group(0)), text)
+
+
+class TrafficReplayer:
+    def __init__(self, entries, target, speed=1.0, clones=1, tag=None, recorder=None, timeout=60):
+        self.sessions = group_sessions(entries)
+        self.t0 = entries[0]['ts'] if entries else 0
+        self.target = target.rstrip('/')
+        self.speed = speed
+        self.clones = clones
+        self.tag = tag or time.strftime('%H%M%S')
+        self.recorder = recorder or RunRecorder('replay')
+        self.timeout = timeout
+        self.id_maps = [IdMap() for _ in range(clones)]
+        self.lags = []
+        self.status_mismatches = 0
+        self._lock = threading.Lock()
+        self._started = None
+
+    def rewrite_emails(self, text, clone):
+        """alice@x.com -> alice+r<tag>c<clone>@x.com so each clone has its own users"""
+        if not text:
+            return text
+        suffix = f"+r{self.tag}c{clone}"
+        return _EMAIL_RE.sub(
+            lambda m: f"{m.group(1)}{suffix if m.group(2) == '@' else quote(suffix)}{m.group(2)}{m.group(3)}",
+            text
+        )
+
+    def due_at(self, entry):
+        if not self.speed:
+            return 0.0
+        return (entry['ts'] - self.t0) / self.speed
+
+    def replay_session(self, entries, clone):
+        session = requests.Session()
+        id_map = self.id_maps[clone]
+        csrf_token = None
+        for entry in entries:
+            due = self.due_at(entry)
+            wait = due - (time.perf_counter() - self._started)
+            if wait > 0:
+                time.sleep(wait)
+            lag_ms = max(0.0, (time.perf_counter() - self._started - due) * 1000)
+
+            path = self.rewrite_emails(id_map.rewrite(entry['p']), clone)
+            body = self.rewrite_emails(id_map.rewrite(entry.get('b')), clone)
+            if body and csrf_token and 'csrfToken=' in body:
+                body = _CSRF_RE.sub(lambda m: m.group(1) + csrf_token, body)
+            headers, trace_id, request_id = trace_headers()
+            if entry.get('ct'):
+                headers['Content-Type'] = entry['ct']
+            endpoint = endpoint_name(entry['m'], path[4:] if path.startswith('/api/') else path)
+
+            self.recorder.begin()
+            start = time.perf_counter()
+            try:
+                response = session.request(entry['m'], f"{self.target}{path}",
+                                           data=body.encode('utf-8') if body else None, headers=headers,
+                                           allow_redirects=False, timeout=self.timeout)
+            except requests.RequestException as e:
+                self.recorder.record(endpoint, (time.perf_counter() - start) * 1000, error=type(e).__name__,
+                                     lagMs=lag_ms, clone=clone, traceId=trace_id, requestId=request_id)
+                continue
+            finally:
+                self.recorder.end()
+            latency_ms = (time.perf_counter() - start) * 1000
+            error = f"HTTP {response.status_code}" if response.status_code >= 500 else None
+            self.recorder.record(endpoint, latency_ms, status=response.status_code, size=len(response.content),
+                                 error=error, lagMs=lag_ms, clone=clone, traceId=trace_id, requestId=request_id)
+
+            if entry.get('ids'):
+                id_map.learn(entry['ids'], response_ids(response.headers.get('Content-Type'), response.content))
+            if path.startswith('/api/auth/csrf') and response.ok:
+                csrf_token = response.json().get('csrfToken', csrf_token)
+            with self._lock:
+                self.lags.append(lag_ms)
+                if entry.get('s') is not None and entry['s'] != response.status_code:
+                    self.status_mismatches += 1
+
+    def run(self, max_workers=512):
+        jobs = [(entries, clone) for clone in range(self.clones) for entries in self.sessions.values()]
+        self._started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(max_workers, max(1, len(jobs)))) as pool:
+            futures = [pool.submit(self.replay_session, entries, clone) for entries, clone in jobs]
+            for future in futures:
+                future.result()
+        return time.perf_counter() - self._started
+
+    def print_summary(self, elapsed):
+        total = len(self.recorder.samples)
+        print("=" * 80)
+        print("REPLAY SUMMARY")
+        print("=" * 80)
+        print(f"📊 Sessions: {len(self.sessions)} x {self.clones} clone(s), {total} requests in {elapsed:.1f}s "
+              f"({total / elapsed if elapsed else 0:.1f} req/s)")
+        lag = summarize(self.lags)
+        print(f"⏱️  Schedule lag p50 {format_ms(lag.get('p50'))}, p99 {format_ms(lag.get('p99'))}")
+        print(f"⚠️  Status differs from capture: {self.status_mismatches}")
+        print(f"\n{'endpoint':<48} {'count':>6} {'err':>5} {'p50':>9} {'p99':>9}")
+        for endpoint, stats in self.recorder.endpoint_summary().items():
+            print(f"{endpoint[:48]:<48} {stats['total']:>6} {stats['errors']:>5} "
+                  f"{format_ms(stats.get('p50')):>9} {format_ms(stats.get('p99')):>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('log', help="capture log written by harness.capture")
+    parser.add_argument('--target', default="http://localhost:3000", help="app origin (paths include /api)")
+    parser.add_argument('--speed', type=float, default=1.0, help="time scale; 0 = as fast as possible")
+    parser.add_argument('--clones', type=int, default=1, help="replay every session this many times in parallel")
+    parser.add_argument('--max-workers', type=int, default=512)
+    parser.add_argument('--tag', default=None, help="e-mail suffix tag (default: current time)")
+    parser.add_argument('--live', action='store_true', help="live dashboard, refreshed every second")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    entries = read_log(args.log)
+    if not entries:
+        print(f"❌ No requests in {args.log}")
+        return 1
+
+    recorder = RunRecorder('replay')
+    recorder.meta.update({'log': args.log, 'speed': args.speed, 'clones': args.clones})
+    replayer = TrafficReplayer(entries, args.target, speed=args.speed, clones=args.clones,
+                               tag=args.tag, recorder=recorder)
+    print(f"▶️  Replaying {len(entries)} requests from {len(replayer.sessions)} sessions "
+          f"at {'max' if not args.speed else f'{args.speed:g}x'} speed")
+    with metrics.exporter_for(args, recorder), LiveDashboard(recorder) if args.live else contextlib.nullcontext():
+        elapsed = replayer.run(args.max_workers)
+    recorder.add_section('replay', {
+        'elapsedSec': elapsed,
+        'scheduleLag': summarize(replayer.lags),
+        'statusMismatches': replayer.status_mismatches,
+    })
+    replayer.print_summary(elapsed)
+    print(f"\n💾 Results: {recorder.save()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
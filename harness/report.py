@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Cross-run comparative performance report
+
+Reads stored runs (RUNS_DIR/<run-id>/results.json) and writes one
+self-contained HTML file (inline SVG and CSS, nothing fetched) that puts
+them side by side, oldest first, the first being the baseline:
+
+  * latency distributions per HTTP endpoint and per socket event
+    (samples recorded with transport='ws': workspace-update in
+    harness.dbproxy, notification deliveries in harness.fanout)
+  * completed requests per second over each run, plus offered/achieved
+    load curves from harness.overload and harness.standin calibrate
+  * database queries per request (mean over every traced request) from
+    harness.tracing sections
+  * significant changes against the baseline: a two-sided Mann-Whitney U
+    test on the raw samples, Bonferroni corrected over every comparison,
+    and only flagged when the p50 moved by at least --min-change
+  * links to each run's results.json and profiles/index.html
+
+    python -m harness.report bench_runs/20250101-120000-scenario bench_runs/20250108-120000-scenario
+    python -m harness.report --name scenario --last 5
+    python -m harness.report --name scenario --commit 1a2b3c4 --commit 5d6e7f8 --out release.html
+"""
+
+import argparse
+import glob
+import html
+import math
+import os
+import sys
+from datetime import datetime
+
+from .config import RUNS_DIR
+from .results import load_run
+from .stats import format_ms, mann_whitney, summarize
+
+COLORS = ['#4e79a7', '#f28e2b', '#59a14f', '#e15759', '#76b7b2', '#edc948', '#b07aa1', '#9c755f']
+CSS = """
+body { font: 14px/1.4 system-ui, sans-serif; margin: 2em; color: #222; }
+table { border-collapse: collapse; margin: 0.5em 0 1.5em; }
+th, td { padding: 3px 10px; border-bottom: 1px solid #ddd; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+.worse { background: #fde2e1; } .better { background: #e1f5e1; }
+.swatch { display: inline-block; width: 10px; height: 10px; margin-right: 4px; }
+svg text { font: 11px system-ui, sans-serif; }
+.muted { color: #888; }
+"""
+
+
+# Loading
+
+def find_runs(runs_dir, name=None, commits=None, last=None):
+    """Stored run directories, oldest first, filtered by harness name and commit"""
+    runs = []
+    for path in glob.glob(os.path.join(runs_dir, '*', 'results.json')):
+        try:
+            run = load_run(path)
+        except (OSError, ValueError):
+            continue
+        meta = run.get('meta') or {}
+        if name and meta.get('name') != name:
+            continue
+        if commits and not any((meta.get('commit') or '').startswith(c) for c in commits):
+            continue
+        runs.append((meta.get('startedAt') or '', os.path.dirname(path), run))
+    runs.sort(key=lambda entry: entry[0])
+    return [(run_dir, run) for _, run_dir, run in runs[-last if last else 0:]]
+
+
+def resolve(path, runs_dir):
+    """A run given as a directory, a results.json or a bare run id"""
+    if not os.path.exists(path) and os.path.isdir(os.path.join(runs_dir, path)):
+        path = os.path.join(runs_dir, path)
+    return (path if os.path.isdir(path) else os.path.dirname(path)), load_run(path)
+
+
+def latencies_by(run, transport):
+    """Successful sample latencies per endpoint for one transport ('http' or 'ws')"""
+    grouped = {}
+    for sample in run.get('samples') or []:
+        if sample.get('error') is None and sample.get('latencyMs') is not None \
+                and (sample.get('transport') or 'http') == transport:
+            grouped.setdefault(sample['endpoint'], []).append(sample['latencyMs'])
+    return grouped
+
+
+def throughput(run, bucket):
+    """(seconds, completed requests/s) per bucket over the run"""
+    stamps = [s['ts'] for s in run.get('samples') or [] if s.get('ts') is not None]
+    if not stamps:
+        return []
+    counts = [0] * (int(max(stamps) // bucket) + 1)
+    for ts in stamps:
+        counts[int(ts // bucket)] += 1
+    return [(i * bucket, n / bucket) for i, n in enumerate(counts)]
+
+
+def load_curves(run):
+    """Offered vs achieved throughput from the overload and calibration sections"""
+    sections = run.get('sections') or {}
+    curves = {}
+    if sections.get('overload'):
+        curves['overload (offered → achieved rps)'] = [(s['offeredRps'], s['achievedRps'])
+                                                       for s in sections['overload'].get('stages') or []]
+    if sections.get('calibration'):
+        curves['calibration (workers → rps)'] = [(level['concurrency'], level['rps'])
+                                                 for level in sections['calibration'].get('levels') or []]
+    return curves
+
+
+def query_counts(run):
+    """Mean database queries per request per endpoint, from a harness.tracing section.
+
+    Returns (counts, tail_only). Runs recorded before tracing kept a count over
+    every traced request only have the p90+ slow rows to average, which
+    overstates the per-request mean, so tail_only marks them.
+    """
+    endpoints = ((run.get('sections') or {}).get('tracing') or {}).get('endpoints') or {}
+    counts, tail_only = {}, False
+    for endpoint, entry in endpoints.items():
+        if 'queries' in entry:
+            if entry['queries'].get('count'):
+                counts[endpoint] = entry['queries']['mean']
+            continue
+        rows = [r['queries'] for r in entry.get('slow') or [] if r.get('queries') is not None]
+        if rows:
+            counts[endpoint] = sum(rows) / len(rows)
+            tail_only = True
+    return counts, tail_only
+
+
+def compare(runs, alpha, min_change):
+    """Per endpoint/socket event and run after the baseline: p50 change and whether it is significant.
+
+    Bonferroni runs over every (endpoint, transport, run) pair at once, so the
+    family-wise error rate stays at alpha whatever the transport mix.
+    """
+    grouped = {transport: [latencies_by(run, transport) for _, run in runs] for transport in ('http', 'ws')}
+    pairs = [(endpoint, transport, i) for transport, by_run in grouped.items() for endpoint in by_run[0]
+             for i in range(1, len(runs)) if endpoint in by_run[i]]
+    threshold = alpha / max(len(pairs), 1)
+    changes = []
+    for endpoint, transport, i in pairs:
+        base_values, values = grouped[transport][0][endpoint], grouped[transport][i][endpoint]
+        base, other = summarize(base_values), summarize(values)
+        change = (other['p50'] - base['p50']) / base['p50'] if base['p50'] else None
+        p_value = mann_whitney(base_values, values)
+        significant = p_value is not None and p_value < threshold and change is not None \
+            and abs(change) >= min_change
+        changes.append({'endpoint': endpoint, 'transport': transport, 'run': i, 'baseP50': base['p50'],
+                        'p50': other['p50'], 'change': change, 'pValue': p_value, 'threshold': threshold,
+                        'significant': significant})
+    return changes
+
+
+# Rendering
+
+def run_label(run):
+    meta = run.get('meta') or {}
+    return f"{run.get('runId')} ({meta.get('commit') or 'no commit'})"
+
+
+def legend(runs):
+    return ' '.join(f'<span><span class="swatch" style="background:{COLORS[i % len(COLORS)]}"></span>'
+                    f'{html.escape(run_label(run))}</span>' for i, (_, run) in enumerate(runs))
+
+
+def distribution_svg(stats_per_run, width=640):
+    """min–max whisker, p50–p90 box and p99 tick per run on a shared log axis"""
+    present = [(i, s) for i, s in enumerate(stats_per_run) if s and s.get('count')]
+    low = max(min(s['min'] for _, s in present), 0.01)
+    high = max(max(s['max'] for _, s in present), low * 1.01)
+    span = math.log(high) - math.log(low)
+
+    def x(value):
+        return 10 + (math.log(max(value, low)) - math.log(low)) / span * (width - 120)
+
+    rows = []
+    for row, (i, s) in enumerate(present):
+        y, color = 10 + row * 16, COLORS[i % len(COLORS)]
+        rows.append(f'<line x1="{x(s["min"]):.1f}" x2="{x(s["max"]):.1f}" y1="{y + 5}" y2="{y + 5}" '
+                    f'stroke="{color}"/>'
+                    f'<rect x="{x(s["p50"]):.1f}" y="{y}" width="{max(x(s["p90"]) - x(s["p50"]), 1):.1f}" '
+                    f'height="10" fill="{color}"/>'
+                    f'<line x1="{x(s["p99"]):.1f}" x2="{x(s["p99"]):.1f}" y1="{y - 1}" y2="{y + 11}" '
+                    f'stroke="{color}" stroke-width="2"/>'
+                    f'<text x="{width - 105}" y="{y + 9}">p50 {format_ms(s["p50"])} · n={s["count"]}</text>')
+    height = 20 + len(present) * 16
+    axis = (f'<text x="10" y="{height}">{format_ms(low)}</text>'
+            f'<text x="{width - 160}" y="{height}" text-anchor="end">{format_ms(high)} (log)</text>')
+    return f'<svg width="{width}" height="{height + 4}">{"".join(rows)}{axis}</svg>'
+
+
+def line_chart(series, x_label, y_label, width=640, height=220):
+    """One polyline per run; series is [(run index, [(x, y), ...])]"""
+    points = [p for _, values in series for p in values]
+    if not points:
+        return '<p class="muted">no data</p>'
+    max_x = max(p[0] for p in points) or 1
+    max_y = max(p[1] for p in points) or 1
+    lines = []
+    for i, values in series:
+        coords = ' '.join(f'{40 + vx / max_x * (width - 50):.1f},{height - 20 - vy / max_y * (height - 30):.1f}'
+                          for vx, vy in values)
+        lines.append(f'<polyline points="{coords}" fill="none" stroke="{COLORS[i % len(COLORS)]}" '
+                     f'stroke-width="1.5"/>')
+    return (f'<svg width="{width}" height="{height}"><line x1="40" y1="{height - 20}" x2="{width - 10}" '
+            f'y2="{height - 20}" stroke="#999"/><line x1="40" y1="10" x2="40" y2="{height - 20}" stroke="#999"/>'
+            f'{"".join(lines)}<text x="42" y="12">{max_y:.0f} {html.escape(y_label)}</text>'
+            f'<text x="{width - 10}" y="{height - 5}" text-anchor="end">{max_x:g} {html.escape(x_label)}</text>'
+            f'</svg>')
+
+
+def latency_section(title, runs, transport):
+    grouped = [latencies_by(run, transport) for _, run in runs]
+    endpoints = sorted({endpoint for g in grouped for endpoint in g})
+    if not endpoints:
+        return f'<h2>{title}</h2><p class="muted">no samples</p>'
+    parts = [f'<h2>{title}</h2>']
+    for endpoint in endpoints:
+        stats = [summarize(g[endpoint]) if endpoint in g else None for g in grouped]
+        parts.append(f'<h3>{html.escape(endpoint)}</h3>{distribution_svg(stats)}')
+    return ''.join(parts)
+
+
+def changes_table(changes, runs):
+    if not changes:
+        return '<p class="muted">nothing to compare: the runs share no endpoints or socket events</p>'
+    rows = []
+    for c in sorted(changes, key=lambda c: (not c['significant'], c['endpoint'], c['run'])):
+        css = ('worse' if c['change'] > 0 else 'better') if c['significant'] else ''
+        change = f"{c['change'] * 100:+.1f}%" if c['change'] is not None else '-'
+        p_value = f"{c['pValue']:.2g}" if c['pValue'] is not None else 'n<8'
+        rows.append(f'<tr class="{css}"><td>{html.escape(c["endpoint"])}</td><td>{c["transport"]}</td>'
+                    f'<td>{html.escape(runs[c["run"]][1].get("runId") or "")}</td>'
+                    f'<td>{format_ms(c["baseP50"])}</td><td>{format_ms(c["p50"])}</td><td>{change}</td>'
+                    f'<td>{p_value}</td></tr>')
+    return ('<table><tr><th>endpoint / event</th><th>transport</th><th>run</th><th>baseline p50</th>'
+            '<th>p50</th><th>change</th><th>p</th></tr>' + ''.join(rows) + '</table>')
+
+
+def runs_table(runs, out_dir):
+    rows = []
+    for i, (run_dir, run) in enumerate(runs):
+        meta = run.get('meta') or {}
+        links = [f'<a href="{html.escape(os.path.relpath(os.path.join(run_dir, "results.json"), out_dir))}">'
+                 'results.json</a>']
+        profiles = (run.get('sections') or {}).get('profiles') or {}
+        if profiles.get('dir'):
+            index = os.path.join(run_dir, profiles['dir'], 'index.html')
+            links.append(f'<a href="{html.escape(os.path.relpath(index, out_dir))}">profiles</a>')
+        rows.append(f'<tr><td><span class="swatch" style="background:{COLORS[i % len(COLORS)]}"></span>'
+                    f'{html.escape(run.get("runId") or "")}</td><td>{html.escape(meta.get("commit") or "-")}</td>'
+                    f'<td>{html.escape(meta.get("startedAt") or "-")}</td>'
+                    f'<td>{(meta.get("durationSec") or 0):.0f}s</td><td>{len(run.get("samples") or [])}</td>'
+                    f'<td>{html.escape(", ".join(sorted(run.get("sections") or {})) or "-")}</td>'
+                    f'<td>{" · ".join(links)}</td></tr>')
+    return ('<table><tr><th>run</th><th>commit</th><th>started</th><th>duration</th><th>samples</th>'
+            '<th>sections</th><th></th></tr>' + ''.join(rows) + '</table>')
+
+
+def queries_table(runs):
+    counted = [query_counts(run) for _, run in runs]
+    counts = [c for c, _ in counted]
+    endpoints = sorted({endpoint for c in counts for endpoint in c})
+    if not endpoints:
+        return '<p class="muted">no harness.tracing sections in these runs</p>'
+    header = ''.join(f'<th>{html.escape(run.get("runId") or "")}{" (p90+ requests)" if tail else ""}</th>'
+                     for (_, run), (_, tail) in zip(runs, counted))
+    rows = ''.join(f'<tr><td>{html.escape(endpoint)}</td>'
+                   + ''.join(f'<td>{c[endpoint]:.1f}</td>' if endpoint in c else '<td>-</td>' for c in counts)
+                   + '</tr>' for endpoint in endpoints)
+    note = ('<p class="muted">(p90+ requests): older runs that only stored the slow tail; '
+            'not comparable with per-request means</p>' if any(tail for _, tail in counted) else '')
+    return f'<table><tr><th>endpoint</th>{header}</tr>{rows}</table>{note}'
+
+
+def render(runs, changes, args, out_dir):
+    curves = {}
+    for i, (_, run) in enumerate(runs):
+        for name, values in load_curves(run).items():
+            curves.setdefault(name, []).append((i, values))
+    significant = [c for c in changes if c['significant']]
+    parts = [
+        f'<!doctype html><meta charset="utf-8"><title>Performance report</title><style>{CSS}</style>',
+        f'<h1>Performance report</h1><p class="muted">Generated {datetime.now().isoformat(timespec="seconds")}; '
+        f'baseline {html.escape(runs[0][1].get("runId") or "")}. Changes need p &lt; {args.alpha:g} '
+        f'(Bonferroni over {len(changes)} comparisons) and a p50 move of at least {args.min_change * 100:g}%.</p>',
+        f'<p>{legend(runs)}</p>',
+        runs_table(runs, out_dir),
+        f'<h2>Significant changes ({len(significant)})</h2>', changes_table(changes, runs),
+        '<h2>Throughput</h2><h3>completed requests per second</h3>',
+        line_chart([(i, throughput(run, args.bucket)) for i, (_, run) in enumerate(runs)], 's', 'rps'),
+    ]
+    for name, series in curves.items():
+        parts.append(f'<h3>{html.escape(name)}</h3>{line_chart(series, "", "rps")}')
+    parts += [
+        '<h2>Database queries per request</h2>', queries_table(runs),
+        latency_section('HTTP endpoint latency', runs, 'http'),
+        latency_section('Socket event latency', runs, 'ws'),
+    ]
+    return '\n'.join(parts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('runs', nargs='*', help="run directories, results.json files or run ids (oldest first)")
+    parser.add_argument('--runs-dir', default=RUNS_DIR)
+    parser.add_argument('--name', help="select stored runs of this harness tool (meta.name)")
+    parser.add_argument('--commit', action='append', help="select stored runs at this commit (repeatable)")
+    parser.add_argument('--last', type=int, default=None, help="keep only the newest N selected runs")
+    parser.add_argument('--alpha', type=float, default=0.01, help="family-wise significance level")
+    parser.add_argument('--min-change', type=float, default=0.05, help="smallest p50 change worth flagging")
+    parser.add_argument('--bucket', type=float, default=1.0, help="seconds per throughput point")
+    parser.add_argument('--out', default=None, help="defaults to RUNS_DIR/report-<timestamp>.html")
+    args = parser.parse_args(argv)
+
+    if args.runs:
+        runs = [resolve(path, args.runs_dir) for path in args.runs]
+    else:
+        runs = find_runs(args.runs_dir, args.name, args.commit, args.last)
+    if not runs:
+        print(f"❌ No stored runs matched in {args.runs_dir}")
+        return 1
+
+    print("=" * 80)
+    print(f"PERFORMANCE REPORT ({len(runs)} runs, baseline {runs[0][1].get('runId')})")
+    print("=" * 80)
+    changes = compare(runs, args.alpha, args.min_change)
+    for c in changes:
+        if c['significant']:
+            icon = '🔴' if c['change'] > 0 else '🟢'
+            print(f"{icon} {c['endpoint'][:40]:<40} {runs[c['run']][1].get('runId')}: {format_ms(c['baseP50'])} → "
+                  f"{format_ms(c['p50'])} ({c['change'] * 100:+.1f}%, p={c['pValue']:.2g})")
+    if not any(c['significant'] for c in changes):
+        print(f"✅ No significant changes across {len(changes)} comparisons")
+
+    out = args.out or os.path.join(args.runs_dir, f"report-{datetime.now().strftime('%Y%m%d-%H%M%S')}.html")
+    out_dir = os.path.dirname(os.path.abspath(out))
+    os.makedirs(out_dir, exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        f.write(render(runs, changes, args, out_dir))
+    print(f"\n📄 Report: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Recording and persisting benchmark measurements
+
+Each harness run writes RUNS_DIR/<run-id>/results.json so runs can be
+compared later instead of scrolling away in the terminal.
+"""
+
+import json
+import os
+import subprocess
+import threading
+import time
+from datetime import datetime
+
+from .config import REPO_ROOT, RUNS_DIR
+from .stats import summarize
+
+
+def git_commit():
+    """Short commit hash of the working tree, or None outside a git checkout"""
+    try:
+        out = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=REPO_ROOT, capture_output=True, text=True, timeout=10
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class RunRecorder:
+    """Thread-safe collector of per-request samples for a single run"""
+
+    def __init__(self, name, runs_dir=RUNS_DIR):
+        self.name = name
+        self.run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{name}"
+        self.run_dir = os.path.join(runs_dir, self.run_id)
+        self.started_at = time.time()
+        self.samples = []
+        self.sections = {}
+        self.counters = {}  # e.g. ws.connect, ws.message_in
+        self.gauges = {}  # e.g. ws.connections
+        self.in_flight = 0
+        self.meta = {
+            'name': name,
+            'commit': git_commit(),
+            'startedAt': datetime.now().isoformat(),
+        }
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, latency_ms, status=None, size=None, error=None, **extra):
+        """Store one request sample"""
+        sample = {
+            'endpoint': endpoint,
+            'latencyMs': latency_ms,
+            'status': status,
+            'bytes': size,
+            'error': error,
+            'ts': time.time() - self.started_at,
+        }
+        sample.update(extra)
+        with self._lock:
+            self.samples.append(sample)
+        return sample
+
+    def begin(self):
+        """Mark a request as in flight; pair with end()"""
+        with self._lock:
+            self.in_flight += 1
+
+    def end(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def count(self, name, n=1):
+        """Bump a named event counter (websocket messages, reconnects, ...)"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def set_gauge(self, name, value):
+        with self._lock:
+            self.gauges[name] = value
+
+    def add_section(self, key, data):
+        """Attach benchmark-specific results (stored next to the samples)"""
+        with self._lock:
+            self.sections[key] = data
+
+    def snapshot(self, since_index=0):
+        """(samples recorded from since_index on, counters, gauges, in flight), read consistently"""
+        with self._lock:
+            return self.samples[since_index:], dict(self.counters), dict(self.gauges), self.in_flight
+
+    def latencies(self, endpoint=None, ok_only=True):
+        """Latencies in ms, optionally filtered by endpoint"""
+        with self._lock:
+            samples = list(self.samples)
+        return [
+            s['latencyMs'] for s in samples
+            if (endpoint is None or s['endpoint'] == endpoint)
+            and (not ok_only or s['error'] is None)
+        ]
+
+    def endpoint_summary(self):
+        """Latency summary and error counts per endpoint"""
+        with self._lock:
+            samples = list(self.samples)
+        grouped = {}
+        for sample in samples:
+            grouped.setdefault(sample['endpoint'], []).append(sample)
+        summary = {}
+        for endpoint, items in sorted(grouped.items()):
+            stats = summarize([s['latencyMs'] for s in items if s['error'] is None])
+            stats['errors'] = sum(1 for s in items if s['error'] is not None)
+            stats['total'] = len(items)
+            summary[endpoint] = stats
+        return summary
+
+    def artifact_path(self, filename):
+        """Path for an extra artifact stored alongside results.json"""
+        os.makedirs(self.run_dir, exist_ok=True)
+        return os.path.join(self.run_dir, filename)
+
+    def save(self):
+        """Write results.json and return its path"""
+        os.makedirs(self.run_dir, exist_ok=True)
+        self.meta['finishedAt'] = datetime.now().isoformat()
+        self.meta['durationSec'] = time.time() - self.started_at
+        with self._lock:
+            payload = {
+                'runId': self.run_id,
+                'meta': self.meta,
+                'endpoints': None,
+                'sections': self.sections,
+                'counters': self.counters,
+                'gauges': self.gauges,
+                'samples': self.samples,
+            }
+        payload['endpoints'] = self.endpoint_summary()
+        path = os.path.join(self.run_dir, 'results.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2, default=str)
+        return path
+
+
+def load_run(path):
+    """Load a stored run from its directory or its results.json"""
+    if os.path.isdir(path):
+        path = os.path.join(path, 'results.json')
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
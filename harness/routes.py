@@ -0,0 +1,82 @@
+"""
+Discovery of the Next.js API routes under app/api
+"""
+
+import os
+import re
+
+from .config import REPO_ROOT
+
+API_DIR = os.path.join(REPO_ROOT, 'app', 'api')
+HTTP_METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+# Values that make catch-all segments hit a real handler
+DEFAULT_PARAMS = {'nextauth': 'session'}
+
+_METHOD_RE = re.compile(r'^export\s+(?:async\s+function|const)\s+(GET|POST|PUT|PATCH|DELETE)\b', re.MULTILINE)
+_EXPORT_RE = re.compile(r'^export\s*\{([^}]*)\}', re.MULTILINE)
+_SEGMENT_RE = re.compile(r'^\[(\[)?(\.\.\.)?(\w+)\]?\]$')
+
+
+class ApiRoute:
+    """A route.js file and the HTTP methods it exports"""
+
+    def __init__(self, template, methods, file):
+        self.template = template  # e.g. "/projects/[id]/tasks"
+        self.methods = methods
+        self.file = file
+
+    @property
+    def params(self):
+        """Names of the dynamic segments in the route template"""
+        names = []
+        for segment in self.template.strip('/').split('/'):
+            match = _SEGMENT_RE.match(segment)
+            if match:
+                names.append(match.group(3))
+        return names
+
+    def build_path(self, values=None):
+        """Fill the dynamic segments; unknown params get a placeholder id"""
+        values = values or {}
+        parts = []
+        for segment in self.template.strip('/').split('/'):
+            match = _SEGMENT_RE.match(segment)
+            if not match:
+                if segment:
+                    parts.append(segment)
+                continue
+            optional, _, name = match.groups()
+            value = values.get(name, DEFAULT_PARAMS.get(name))
+            if value is None and optional:
+                continue
+            parts.append(str(value if value is not None else 'harness-placeholder'))
+        return '/' + '/'.join(parts)
+
+    def __repr__(self):
+        return f"ApiRoute({self.template!r}, {self.methods!r})"
+
+
+def discover_routes(api_dir=API_DIR):
+    """Walk app/api and return every route with at least one exported method"""
+    routes = []
+    for root, _, files in os.walk(api_dir):
+        if 'route.js' not in files:
+            continue
+        path = os.path.join(root, 'route.js')
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        methods = _METHOD_RE.findall(source)
+        # `export { handler as GET, handler as POST }` (NextAuth)
+        for block in _EXPORT_RE.findall(source):
+            for item in block.split(','):
+                alias = item.split(' as ')[-1].strip()
+                if alias in HTTP_METHODS and alias not in methods:
+                    methods.append(alias)
+        if not methods:
+            # Empty placeholder routes (e.g. health, tasks) fail to compile
+            continue
+        relative = os.path.relpath(root, api_dir).replace(os.sep, '/')
+        template = '/' if relative == '.' else '/' + relative
+        routes.append(ApiRoute(template, methods, path))
+    return sorted(routes, key=lambda r: r.template)
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Weighted user-journey traffic mixes
+
+A scenario file (JSON, or YAML when PyYAML is installed) composes steps
+from harness.steps into journeys. Every virtual user signs up, runs the
+setup steps once, then keeps picking a journey by weight until the run
+ends, pausing for the configured think time between steps:
+
+    {
+      "name": "production-mix",
+      "users": 50, "duration": 300, "rampUp": 30,
+      "thinkTime": [1, 4],
+      "setup": ["create_project", "create_task", "create_task"],
+      "journeys": [
+        {"name": "dashboard", "weight": 70,
+         "steps": ["dashboard_stats", {"think": [2, 5]}, "inbox_list"]},
+        ...
+      ]
+    }
+
+A step is a name, {"step": name, "params": {...}}, or {"think": secs | [min, max]}.
+
+    python -m harness.scenario harness/scenarios/production_mix.json --users 20 --duration 120
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+from .config import BASE_URL
+from . import metrics
+from .live import LiveDashboard
+from .results import RunRecorder
+from .stats import format_ms, summarize
+from .steps import STEPS, VirtualUser, run_step
+
+SCENARIOS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scenarios')
+
+
+class ScenarioError(ValueError):
+    """Raised for malformed scenario files"""
+
+
+def load_scenario(path):
+    """Load and validate a scenario file; bare names resolve to harness/scenarios, with or without
+    their .json/.yml/.yaml extension"""
+    if not os.path.exists(path):
+        for candidate in (path, path + '.json', path + '.yml', path + '.yaml'):
+            if os.path.exists(os.path.join(SCENARIOS_DIR, candidate)):
+                path = os.path.join(SCENARIOS_DIR, candidate)
+                break
+    with open(path, encoding='utf-8') as f:
+        if path.endswith(('.yml', '.yaml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ScenarioError("PyYAML is required for YAML scenarios (pip install pyyaml)")
+            scenario = yaml.safe_load(f)
+        else:
+            scenario = json.load(f)
+    validate_scenario(scenario)
+    return scenario
+
+
+def normalize_step(entry):
+    """Turn the three step spellings into a dict with either 'step' or 'think'"""
+    if isinstance(entry, str):
+        return {'step': entry, 'params': {}}
+    if 'think' in entry:
+        return {'think': entry['think']}
+    return {'step': entry['step'], 'params': entry.get('params', {})}
+
+
+def validate_steps(entries, where):
+    for entry in entries:
+        name = normalize_step(entry).get('step')
+        if name and not name.startswith('tester:') and name not in STEPS:
+            raise ScenarioError(f"Unknown step {name!r} in {where}")
+
+
+def validate_scenario(scenario):
+    journeys = scenario.get('journeys') or []
+    if not journeys:
+        raise ScenarioError("Scenario needs at least one journey")
+    validate_steps(scenario.get('setup', []), "setup")
+    for journey in journeys:
+        if journey.get('weight', 1) <= 0:
+            raise ScenarioError(f"Journey {journey.get('name')!r} needs a positive weight")
+        validate_steps(journey.get('steps', []), f"journey {journey.get('name')!r}")
+
+
+def think_seconds(spec, rng, scale=1.0):
+    """think: 2 | [1, 4] | {"min": 1, "max": 4}"""
+    if spec is None:
+        return 0.0
+    if isinstance(spec, (int, float)):
+        return spec * scale
+    if isinstance(spec, dict):
+        spec = [spec.get('min', 0), spec.get('max', spec.get('min', 0))]
+    return rng.uniform(spec[0], spec[1]) * scale
+
+
+class ScenarioRunner:
+    def __init__(self, scenario, base_url=BASE_URL, users=None, duration=None, think_scale=1.0, recorder=None):
+        self.scenario = scenario
+        self.base_url = base_url
+        self.users = users or scenario.get('users', 10)
+        self.duration = duration or scenario.get('duration', 60)
+        self.ramp_up = scenario.get('rampUp', 0)
+        self.think_scale = think_scale
+        self.recorder = recorder or RunRecorder(f"scenario-{scenario.get('name', 'mix')}")
+        self.journeys = scenario['journeys']
+        self.weights = [j.get('weight', 1) for j in self.journeys]
+        self.stop_event = threading.Event()
+        self.journey_stats = {j['name']: {'runs': 0, 'failed': 0, 'durations': []} for j in self.journeys}
+        self.step_failures = {}
+        self.setup_failures = 0
+        self.exporter = None  # MetricsExporter fed with journey durations, when metrics are exported
+        self._lock = threading.Lock()
+
+    def run_entry(self, vu, entry):
+        """Run one step (or think pause); returns False if the step failed"""
+        item = normalize_step(entry)
+        if 'think' in item:
+            self.stop_event.wait(think_seconds(item['think'], vu.rng, self.think_scale))
+            return True
+        try:
+            success = run_step(vu, item['step'], item['params'])
+        except Exception as e:
+            success = False
+            item['step'] = f"{item['step']} ({type(e).__name__})"
+        if not success:
+            with self._lock:
+                self.step_failures[item['step']] = self.step_failures.get(item['step'], 0) + 1
+        return success
+
+    def run_journey(self, vu, journey):
+        started = time.perf_counter()
+        success = True
+        default_think = self.scenario.get('thinkTime')
+        for index, entry in enumerate(journey['steps']):
+            if self.stop_event.is_set():
+                return
+            if index and default_think and 'think' not in normalize_step(entry):
+                self.stop_event.wait(think_seconds(default_think, vu.rng, self.think_scale))
+            success = self.run_entry(vu, entry) and success
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            stats = self.journey_stats[journey['name']]
+            stats['runs'] += 1
+            stats['failed'] += 0 if success else 1
+            stats['durations'].append(elapsed * 1000)
+        if self.exporter:
+            self.exporter.observe_journey(self.scenario.get('name', 'mix'), journey['name'], elapsed)
+        self.recorder.count(f"journey.{journey['name']}")
+        if not success:
+            self.recorder.count(f"journey.{journey['name']}.failed")
+
+    def virtual_user(self, index):
+        if self.ramp_up and self.users > 1:
+            if self.stop_event.wait(self.ramp_up * index / self.users):
+                return
+        vu = VirtualUser(index, self.base_url, recorder=self.recorder,
+                         namespace=self.scenario.get('name', 'vu'))
+        try:
+            vu.sign_up()
+            for entry in self.scenario.get('setup', []):
+                self.run_entry(vu, entry)
+        except Exception:
+            with self._lock:
+                self.setup_failures += 1
+            return
+        while not self.stop_event.is_set():
+            journey = vu.rng.choices(self.journeys, weights=self.weights)[0]
+            self.run_journey(vu, journey)
+
+    def run(self):
+        threads = [threading.Thread(target=self.virtual_user, args=(i,), daemon=True) for i in range(self.users)]
+        for thread in threads:
+            thread.start()
+        try:
+            self.stop_event.wait(self.duration + self.ramp_up)
+        except KeyboardInterrupt:
+            print("\n🛑 Aborted")
+        self.stop_event.set()
+        for thread in threads:
+            thread.join(timeout=60)
+
+    def summary(self):
+        total_runs = sum(s['runs'] for s in self.journey_stats.values()) or 1
+        return {
+            name: {
+                'runs': stats['runs'],
+                'failed': stats['failed'],
+                'share': stats['runs'] / total_runs,
+                'durationMs': summarize(stats['durations']),
+            }
+            for name, stats in self.journey_stats.items()
+        }
+
+    def print_summary(self):
+        print("=" * 80)
+        print(f"SCENARIO SUMMARY: {self.scenario.get('name')}")
+        print("=" * 80)
+        total_weight = sum(self.weights)
+        print(f"{'journey':<28} {'target':>7} {'actual':>7} {'runs':>6} {'fail':>5} {'p50':>9} {'p99':>9}")
+        for journey, (name, stats) in zip(self.journeys, self.summary().items()):
+            target = journey.get('weight', 1) / total_weight
+            print(f"{name[:28]:<28} {target:>7.0%} {stats['share']:>7.0%} {stats['runs']:>6} {stats['failed']:>5} "
+                  f"{format_ms(stats['durationMs'].get('p50')):>9} {format_ms(stats['durationMs'].get('p99')):>9}")
+        if self.setup_failures:
+            print(f"\n❌ {self.setup_failures} virtual user(s) failed to sign up or run setup")
+        if self.step_failures:
+            print("\n🚨 FAILED STEPS:")
+            for name, count in sorted(self.step_failures.items(), key=lambda x: -x[1]):
+                print(f"   • {name}: {count}")
+        print(f"\n{'endpoint':<48} {'count':>6} {'err':>5} {'p50':>9} {'p99':>9}")
+        for endpoint, stats in self.recorder.endpoint_summary().items():
+            print(f"{endpoint[:48]:<48} {stats['total']:>6} {stats['errors']:>5} "
+                  f"{format_ms(stats.get('p50')):>9} {format_ms(stats.get('p99')):>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('scenario', help="scenario file (or a name under harness/scenarios)")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--users', type=int, default=None, help="override the scenario's virtual users")
+    parser.add_argument('--duration', type=float, default=None, help="override the scenario's duration (s)")
+    parser.add_argument('--think-scale', type=float, default=1.0, help="multiply think times (0 = no think)")
+    parser.add_argument('--live', action='store_true', help="live dashboard, refreshed every second")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        scenario = load_scenario(args.scenario)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    runner = ScenarioRunner(scenario, args.base_url, users=args.users, duration=args.duration,
+                            think_scale=args.think_scale)
+    runner.recorder.meta.update({'scenario': scenario.get('name'), 'users': runner.users,
+                                 'durationTarget': runner.duration})
+    print(f"▶️  {scenario.get('name')}: {runner.users} users for {runner.duration:g}s against {args.base_url}")
+    with metrics.exporter_for(args, runner.recorder) as exporter, \
+            LiveDashboard(runner.recorder) if args.live else contextlib.nullcontext():
+        runner.exporter = exporter
+        runner.run()
+    runner.recorder.add_section('scenario', {'name': scenario.get('name'), 'journeys': runner.summary(),
+                                             'stepFailures': runner.step_failures})
+    runner.print_summary()
+    print(f"\n💾 Results: {runner.recorder.save()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
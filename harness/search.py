@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Search and typeahead benchmark
+
+Seeds users and tasks (COPY into Postgres) from a fixed vocabulary so
+every query in the corpus has a known selectivity class:
+
+    common     one of five words, ~20% of rows
+    uncommon   one of a hundred words, ~1% of rows
+    prefix     2-3 letter prefixes of the common words (what typeahead sends)
+    rare       a per-row reference token, a single row
+    no-match   letters that never occur in seeded text
+
+At every table size the corpus runs against /api/search (projects, tasks
+and members, three ILIKE scans) and /api/users/search (the whole users
+table). The invite dialog's typeahead is then simulated: concurrent
+sessions type an email keystroke by keystroke, once per debounce setting
+(0 = today's behaviour, a request per keystroke and no cancellation).
+Classes whose p95 exceeds --budget are reported as needing an index;
+--trigram re-measures the largest size with pg_trgm GIN indexes.
+
+    DATABASE_URL=postgres://... python -m harness.search --sizes 1000,10000,100000
+"""
+
+import argparse
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .client import ApiClient
+from .config import BASE_URL
+from .db import Database, DatabaseError
+from .results import RunRecorder
+from .seed import ApiSeeder, SqlSeeder
+from .stats import format_ms, percentile, summarize
+
+TASK_WORDS = ['design', 'review', 'deploy', 'migrate', 'refactor']
+FIRST_NAMES = ['alex', 'casey', 'jordan', 'taylor', 'morgan']
+_SYLLABLES = ['ka', 'lo', 'mi', 'ne', 'ru', 'sa', 'ti', 'vo', 'be', 'du']
+CLASSES = ['common', 'uncommon', 'prefix', 'rare', 'no-match']
+MIN_QUERY = 2  # both routes return nothing below two characters
+
+# Typing model for the invite dialog
+KEYSTROKE_MS = (60, 220)
+PAUSE_MS = (400, 900)
+PAUSE_CHANCE = 0.1
+
+# pg_trgm indexes created (and dropped again) by --trigram
+TRIGRAM_INDEXES = {
+    'harness_trgm_tasks_title': ('tasks', 'title'),
+    'harness_trgm_tasks_description': ('tasks', 'description'),
+    'harness_trgm_users_name': ('users', 'name'),
+    'harness_trgm_users_email': ('users', 'email'),
+    'harness_trgm_users_username': ('users', 'username'),
+}
+
+
+def group_word(i):
+    """One of 100 four-letter words built from two syllables"""
+    return _SYLLABLES[(i // 10) % 10] + _SYLLABLES[i % 10]
+
+
+class Vocabulary:
+    """Deterministic text for seeded row i, tagged per run so reruns stay unique"""
+
+    def __init__(self, tag):
+        self.tag = tag  # digits only, so it can never match a word query
+
+    def ref(self, i):
+        return f"r{self.tag}{i:07d}x"
+
+    def task(self, i):
+        word = TASK_WORDS[i % len(TASK_WORDS)]
+        return (f"{word.title()} {group_word(i % 100)} {self.ref(i)}",
+                f"Seeded search task: {word} work for {group_word(i % 100)}")
+
+    def user(self, i):
+        first = FIRST_NAMES[i % len(FIRST_NAMES)]
+        last = group_word(i % 100)
+        return {
+            'name': f"{first.title()} {last.title()}",
+            'email': f"{first}.{last}.{self.ref(i)}@search.example.com",
+            'username': f"{first}_{self.ref(i)}",
+        }
+
+    def corpus(self, words, size, rng, per_class=3):
+        """Queries per selectivity class for a table of size rows"""
+        queries = {
+            'common': rng.sample(words, min(per_class, len(words))),
+            'uncommon': [group_word(rng.randrange(100)) for _ in range(per_class)],
+            'prefix': [w[:rng.choice([2, 3])] for w in rng.sample(words, min(per_class, len(words)))],
+            'rare': [self.ref(rng.randrange(size)) for _ in range(per_class)],
+            'no-match': [''.join(rng.choice('qxzj') for _ in range(6)) for _ in range(per_class)],
+        }
+        return [{'q': q, 'class': cls} for cls in CLASSES for q in queries[cls]]
+
+
+def typing_schedule(term, rng):
+    """Keystroke offsets (ms) for typing term, with the occasional pause"""
+    times, at = [], 0.0
+    for _ in term:
+        times.append(at)
+        at += rng.uniform(*KEYSTROKE_MS)
+        if rng.random() < PAUSE_CHANCE:
+            at += rng.uniform(*PAUSE_MS)
+    return times
+
+
+def debounced_requests(term, times, debounce_ms):
+    """(send offset ms, prefix) pairs a client with this debounce would send"""
+    fires = []
+    for k, at in enumerate(times):
+        prefix = term[:k + 1]
+        if len(prefix) < MIN_QUERY:
+            continue
+        if debounce_ms:
+            next_at = times[k + 1] if k + 1 < len(times) else None
+            if next_at is not None and next_at - at < debounce_ms:
+                continue
+            at += debounce_ms
+        fires.append((at, prefix))
+    return fires
+
+
+class SearchBenchmark:
+    def __init__(self, args):
+        self.args = args
+        self.recorder = RunRecorder('search')
+        self.owner = ApiClient(args.base_url, recorder=self.recorder)
+        self.db = Database(args.database_url)
+        self.sql = SqlSeeder(self.db)
+        self.rng = random.Random(args.seed)
+        self.vocab = Vocabulary(f"{uuid.uuid4().int % 10 ** 8:08d}")  # not from --seed: reruns must differ
+        self.project_id = None
+        self.seeded = {'users': 0, 'tasks': 0}
+        self.queries = []
+        self.typeahead = []
+
+    def setup(self):
+        self.owner.register_and_login("Search Bench Owner")
+        self.project_id = ApiSeeder(self.owner, self.args.base_url, namespace='search').create_project()
+
+    def grow(self, size):
+        start = time.perf_counter()
+        users = size - self.seeded['users']
+        if users > 0:
+            ids = self.sql.users(users, self.vocab.user, start=self.seeded['users'])
+            members = ids[::max(1, round(1 / self.args.member_ratio))] if self.args.member_ratio else []
+            self.sql.project_members(self.project_id, members)
+            self.seeded['users'] = size
+        tasks = int(size * self.args.task_ratio) - self.seeded['tasks']
+        if tasks > 0:
+            self.sql.tasks(self.project_id, self.owner.user['id'], tasks, self.vocab.task,
+                           start=self.seeded['tasks'])
+            self.seeded['tasks'] += tasks
+        self.db.execute('ANALYZE "users"; ANALYZE "tasks"; ANALYZE "project_members"')
+        table_users = int(self.db.scalar('SELECT count(*) FROM "users"'))
+        print(f"🌱 {self.seeded['users']} seeded users ({table_users} in table), {self.seeded['tasks']} tasks "
+              f"({time.perf_counter() - start:.1f}s)")
+        return {'users': table_users, 'tasks': self.seeded['tasks']}
+
+    def selectivity(self, table, columns, query, rows):
+        pattern = query.replace("'", "''")
+        where = ' OR '.join(f'"{c}" ILIKE \'%{pattern}%\'' for c in columns)
+        matched = int(self.db.scalar(f'SELECT count(*) FROM "{table}" WHERE {where}'))
+        return matched / rows if rows else None
+
+    def measure_corpus(self, sizes, label=''):
+        targets = [
+            ('/search', TASK_WORDS, 'tasks', ['title', 'description'], sizes['tasks']),
+            ('/users/search', FIRST_NAMES, 'users', ['name', 'email'], sizes['users']),
+        ]
+        for path, words, table, columns, rows in targets:
+            for entry in self.vocab.corpus(words, min(self.seeded[table], rows), self.rng, self.args.per_class):
+                timings = []
+                for _ in range(self.args.repeat):
+                    start = time.perf_counter()
+                    try:
+                        response = self.owner.get(path, params={'q': entry['q']},
+                                                  endpoint=f"GET {path} [{entry['class']}]{label}")
+                    except requests.RequestException:
+                        continue
+                    if response.status_code == 200:
+                        timings.append((time.perf_counter() - start) * 1000)
+                result = {'endpoint': path, 'rows': rows, 'variant': label.strip() or 'baseline',
+                          **entry, 'selectivity': self.selectivity(table, columns, entry['q'], rows),
+                          **summarize(timings), 'p95': percentile(timings, 95)}
+                self.queries.append(result)
+
+    def typeahead_session(self, term, debounce_ms, rng):
+        client = ApiClient(self.args.base_url, recorder=self.recorder)
+        client.session.cookies.update(self.owner.session.cookies)
+        times = typing_schedule(term, rng)
+        fires = debounced_requests(term, times, debounce_ms)
+        completions = []
+        start = time.perf_counter()
+
+        def send(seq, prefix):
+            try:
+                response = client.get("/users/search", params={'q': prefix},
+                                      endpoint=f"GET /users/search typeahead debounce={debounce_ms}")
+                status = response.status_code
+            except requests.RequestException as e:
+                status = type(e).__name__
+            completions.append((time.perf_counter() - start, seq, status))
+
+        with ThreadPoolExecutor(max_workers=max(1, len(fires))) as pool:
+            for seq, (at, prefix) in enumerate(fires):
+                delay = at / 1000 - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(send, seq, prefix)
+
+        # The dialog shows whichever response lands last and never cancels older ones
+        completions.sort()
+        newest_seen, stale = -1, 0
+        for _, seq, _ in completions:
+            if seq < newest_seen:
+                stale += 1
+            newest_seen = max(newest_seen, seq)
+        final = [c for c in completions if c[1] == len(fires) - 1]
+        settle_ms = (final[0][0] * 1000 - times[-1]) if final else None
+        return {
+            'requests': len(fires),
+            'keystrokes': len(term),
+            'stale': stale,
+            'wrongFinal': bool(completions) and completions[-1][1] != len(fires) - 1,
+            'settleMs': settle_ms,
+        }
+
+    def measure_typeahead(self, sizes):
+        for debounce in self.args.debounce:
+            sessions = []
+            rngs = [random.Random(self.rng.random()) for _ in range(self.args.sessions)]
+            terms = [self.vocab.user(r.randrange(self.seeded['users']))['email'].split('@')[0] for r in rngs]
+            with ThreadPoolExecutor(max_workers=self.args.sessions) as pool:
+                for result in pool.map(lambda a: self.typeahead_session(a[0], debounce, a[1]), zip(terms, rngs)):
+                    sessions.append(result)
+            self.typeahead.append({
+                'rows': sizes['users'],
+                'debounceMs': debounce,
+                'sessions': len(sessions),
+                'requestsPerSession': sum(s['requests'] for s in sessions) / len(sessions),
+                'keystrokesPerSession': sum(s['keystrokes'] for s in sessions) / len(sessions),
+                'staleResponses': sum(s['stale'] for s in sessions),
+                'wrongFinal': sum(1 for s in sessions if s['wrongFinal']),
+                'settleMs': summarize([s['settleMs'] for s in sessions if s['settleMs'] is not None]),
+            })
+
+    def trigram(self, sizes):
+        """Re-measure the corpus with pg_trgm GIN indexes, then drop them"""
+        try:
+            self.db.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            for name, (table, column) in TRIGRAM_INDEXES.items():
+                self.db.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" '
+                                f'USING gin ("{column}" gin_trgm_ops)')
+        except DatabaseError as e:
+            print(f"⚠️  pg_trgm unavailable, skipping the index comparison: {e}")
+            return
+        try:
+            self.db.execute('ANALYZE "users"; ANALYZE "tasks"')
+            self.measure_corpus(sizes, label=' trigram')
+        finally:
+            self.db.execute('; '.join(f'DROP INDEX IF EXISTS "{name}"' for name in TRIGRAM_INDEXES))
+
+    def index_thresholds(self):
+        """Smallest table size at which each endpoint/class blows the latency budget"""
+        thresholds = {}
+        for q in self.queries:
+            if q['variant'] != 'baseline' or q['p95'] is None:
+                continue
+            key = (q['endpoint'], q['class'])
+            if q['p95'] > self.args.budget and (key not in thresholds or q['rows'] < thresholds[key]):
+                thresholds[key] = q['rows']
+        return thresholds
+
+    def print_report(self, thresholds):
+        print("=" * 80)
+        print("SEARCH LATENCY BY TABLE SIZE AND SELECTIVITY")
+        print("=" * 80)
+        print(f"{'endpoint':<15} {'variant':<9} {'rows':>8} {'class':<9} {'select.':>8} {'p50':>9} {'p95':>9}")
+        grouped = {}
+        for q in self.queries:
+            grouped.setdefault((q['endpoint'], q['variant'], q['rows'], q['class']), []).append(q)
+        for (endpoint, variant, rows, cls), entries in grouped.items():
+            p50 = [e['p50'] for e in entries if e.get('p50') is not None]
+            p95 = [e['p95'] for e in entries if e['p95'] is not None]
+            sel = [e['selectivity'] for e in entries if e['selectivity'] is not None]
+            print(f"{endpoint:<15} {variant:<9} {rows:>8} {cls:<9} "
+                  f"{(sum(sel) / len(sel) if sel else 0):>8.2%} "
+                  f"{format_ms(max(p50) if p50 else None):>9} {format_ms(max(p95) if p95 else None):>9}")
+
+        print("\n" + "=" * 80)
+        print("TYPEAHEAD (/users/search, invite dialog)")
+        print("=" * 80)
+        print(f"{'rows':>8} {'debounce':>9} {'req/sess':>9} {'keys':>6} {'stale':>6} {'wrong':>6} "
+              f"{'settle p50':>11} {'p99':>9}")
+        for t in self.typeahead:
+            print(f"{t['rows']:>8} {t['debounceMs']:>7}ms {t['requestsPerSession']:>9.1f} "
+                  f"{t['keystrokesPerSession']:>6.1f} {t['staleResponses']:>6} {t['wrongFinal']:>6} "
+                  f"{format_ms(t['settleMs'].get('p50')):>11} {format_ms(t['settleMs'].get('p99')):>9}")
+
+        print()
+        if thresholds:
+            for (endpoint, cls), rows in sorted(thresholds.items()):
+                print(f"🚨 {endpoint} [{cls}] exceeds {self.args.budget:g}ms p95 from {rows} rows: "
+                      f"needs a trigram or full-text index")
+        else:
+            print(f"✅ Every query class stays under {self.args.budget:g}ms p95 at the sizes measured")
+
+    def run(self):
+        print("=" * 80)
+        print("SEARCH / TYPEAHEAD BENCHMARK")
+        print("=" * 80)
+        self.setup()
+        sizes = None
+        for size in self.args.sizes:
+            sizes = self.grow(size)
+            print(f"🔎 Query corpus at {sizes['users']} users / {sizes['tasks']} tasks")
+            self.measure_corpus(sizes)
+            print(f"⌨️  Typeahead: {self.args.sessions} sessions x debounce {self.args.debounce}")
+            self.measure_typeahead(sizes)
+        if self.args.trigram and sizes:
+            print("🧪 Re-measuring with pg_trgm indexes")
+            self.trigram(sizes)
+
+        thresholds = self.index_thresholds()
+        self.recorder.add_section('search', {
+            'budgetMs': self.args.budget,
+            'queries': self.queries,
+            'typeahead': self.typeahead,
+            'indexNeededFrom': {f"{e} [{c}]": rows for (e, c), rows in thresholds.items()},
+        })
+        self.print_report(thresholds)
+        print(f"\n💾 Results: {self.recorder.save()}")
+        return not thresholds
+
+
+def int_list(value):
+    return [int(x) for x in value.split(',')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--database-url', default=None, help="defaults to $DATABASE_URL")
+    parser.add_argument('--sizes', type=int_list, default=[1000, 10000, 100000], help="seeded users per step")
+    parser.add_argument('--task-ratio', type=float, default=1.0, help="tasks seeded per user")
+    parser.add_argument('--member-ratio', type=float, default=0.05, help="share of users added to the project")
+    parser.add_argument('--per-class', type=int, default=3, help="queries per selectivity class")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--sessions', type=int, default=10, help="concurrent typeahead sessions")
+    parser.add_argument('--debounce', type=int_list, default=[0, 150, 300], help="debounce settings (ms)")
+    parser.add_argument('--budget', type=float, default=100.0, help="p95 budget per search request (ms)")
+    parser.add_argument('--trigram', action='store_true', help="compare against pg_trgm GIN indexes")
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    try:
+        benchmark = SearchBenchmark(args)
+    except DatabaseError as e:
+        print(f"❌ {e}")
+        return 1
+    return 0 if benchmark.run() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
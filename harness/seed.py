@@ -0,0 +1,192 @@
+"""
+Dataset seeding helpers
+
+ApiSeeder grows data through the public endpoints, so everything it
+creates goes through the same validation and side effects (activities,
+labels, notifications) as real traffic. SqlSeeder bulk-loads rows with
+COPY for datasets far too large to create through the API (hundreds of
+thousands of inbox items or millions of activities).
+"""
+
+import json
+import random
+import secrets
+import uuid
+from datetime import datetime, timedelta
+
+from .client import ApiClient
+from .config import BASE_URL, DEFAULT_PASSWORD
+from .db import new_id
+
+INBOX_TYPES = ['TASK_ASSIGNMENT', 'MENTION', 'PROJECT_INVITATION', 'TASK_UPDATE', 'COMMENT', 'SYSTEM']
+ACTIVITY_TYPES = ['TASK_CREATED', 'TASK_UPDATED', 'TASK_COMPLETED', 'TASK_ASSIGNED', 'TASK_COMMENTED']
+
+
+class ApiSeeder:
+    """Creates projects, tasks and members for one owner through the API"""
+
+    def __init__(self, owner, base_url=BASE_URL, namespace='seed'):
+        self.owner = owner  # signed-in ApiClient
+        self.base_url = base_url
+        self.namespace = namespace
+        self.projects = {}  # projectId -> {'tasks': [...], 'members': [...]}
+        self.accounts = []  # every member registered, with credentials
+
+    def create_project(self, name=None):
+        response = self.owner.post("/projects", json={
+            'name': name or f"{self.namespace} project {len(self.projects) + 1}",
+            'description': f"Seeded by the performance harness ({self.namespace})",
+        })
+        if response.status_code != 201:
+            raise RuntimeError(f"Project creation failed: {response.status_code} - {response.text[:200]}")
+        project_id = response.json()['project']['id']
+        self.projects[project_id] = {'tasks': [], 'members': []}
+        return project_id
+
+    def add_tasks(self, project_id, count, assign_to_owner=True, due_spread_days=None):
+        """Create count tasks; due dates spread over +/- due_spread_days when given"""
+        created = self.projects[project_id]['tasks']
+        for i in range(count):
+            payload = {
+                'title': f"{self.namespace} task {len(created) + 1}",
+                'description': f"Seeded task {i} for payload and pagination benchmarks",
+                'priority': ['LOW', 'MEDIUM', 'HIGH', 'URGENT'][i % 4],
+            }
+            if assign_to_owner and self.owner.user:
+                payload['assigneeId'] = self.owner.user['id']
+            if due_spread_days:
+                offset = (i * 7919) % (2 * due_spread_days) - due_spread_days
+                payload['dueDate'] = (datetime.now() + timedelta(days=offset)).isoformat()
+            response = self.owner.post(f"/projects/{project_id}/tasks", json=payload)
+            if response.status_code != 201:
+                raise RuntimeError(f"Task creation failed: {response.status_code} - {response.text[:200]}")
+            created.append(response.json()['task']['id'])
+        return created
+
+    def add_members(self, project_id, count, role='MEMBER'):
+        """Register count users and run the invite -> accept flow for each"""
+        members = self.projects[project_id]['members']
+        for _ in range(count):
+            member = ApiClient(self.base_url)
+            email = f"{self.namespace}.member.{uuid.uuid4().hex[:10]}@example.com"
+            member.register_and_login(f"{self.namespace} member", email, DEFAULT_PASSWORD)
+            invite = self.owner.post(f"/projects/{project_id}/invite", json={'email': email, 'role': role})
+            if invite.status_code != 201:
+                raise RuntimeError(f"Invite failed: {invite.status_code} - {invite.text[:200]}")
+            accept = member.post("/inbox/invitations", json={
+                'invitationId': invite.json()['invitation']['id'], 'action': 'accept'
+            })
+            if accept.status_code != 200:
+                raise RuntimeError(f"Accept failed: {accept.status_code} - {accept.text[:200]}")
+            members.append(member.user['id'])
+            self.accounts.append({'id': member.user['id'], 'email': email, 'password': DEFAULT_PASSWORD})
+        return members
+
+    def grow_to(self, project_id, tasks=None, members=None, **task_kwargs):
+        """Top a project up to the given task/member counts"""
+        state = self.projects[project_id]
+        if tasks is not None and len(state['tasks']) < tasks:
+            self.add_tasks(project_id, tasks - len(state['tasks']), **task_kwargs)
+        if members is not None and len(state['members']) < members:
+            self.add_members(project_id, members - len(state['members']))
+        return state
+
+    @property
+    def total_tasks(self):
+        return sum(len(p['tasks']) for p in self.projects.values())
+
+    @property
+    def total_members(self):
+        return sum(len(p['members']) for p in self.projects.values())
+
+
+def _timestamp(value):
+    return value.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+
+
+class SqlSeeder:
+    """Bulk-loads rows straight into Postgres; newest rows first, spaced in time"""
+
+    def __init__(self, db, seed=42, batch_size=50000):
+        self.db = db
+        self.rng = random.Random(seed)  # data shape only: ratios and ordering repeat across runs
+        self._ids = random.Random(secrets.randbits(64))  # primary keys must not, or reruns collide in COPY
+        self.batch_size = batch_size
+        self.newest = datetime.utcnow()
+
+    def _copy_batches(self, table, columns, make_row, count, start=0):
+        done = 0
+        while done < count:
+            size = min(self.batch_size, count - done)
+            self.db.copy_rows(table, columns, (make_row(start + done + i) for i in range(size)))
+            done += size
+        return done
+
+    def inbox_items(self, user_id, count, archived_ratio=0.2, types=INBOX_TYPES,
+                    newest=None, spacing=timedelta(minutes=1), start=0):
+        """Seed count inbox items; a share is ARCHIVED, the rest ACTIVE.
+        start continues the timeline of an earlier call when topping up."""
+        newest = newest or self.newest
+        columns = ['id', 'title', 'content', 'type', 'status', 'metadata', 'createdAt', 'userId']
+
+        def row(i):
+            status = 'ARCHIVED' if self.rng.random() < archived_ratio else 'ACTIVE'
+            item_type = types[i % len(types)]
+            return [new_id(self._ids), f"Seeded {item_type.lower()} #{i}", "Seeded by the performance harness",
+                    item_type, status, json.dumps({'priority': 'MEDIUM', 'seeded': True}),
+                    _timestamp(newest - spacing * i), user_id]
+
+        return self._copy_batches('inbox_items', columns, row, count, start)
+
+    def activities(self, user_id, project_id, count, task_ids=None, types=ACTIVITY_TYPES,
+                   newest=None, spacing=timedelta(seconds=30), start=0):
+        """Seed count activity rows for a project (optionally spread over tasks)"""
+        newest = newest or self.newest
+        columns = ['id', 'type', 'content', 'metadata', 'createdAt', 'userId', 'projectId', 'taskId']
+
+        def row(i):
+            task_id = task_ids[i % len(task_ids)] if task_ids else None
+            return [new_id(self._ids), types[i % len(types)], f"seeded activity #{i}", None,
+                    _timestamp(newest - spacing * i), user_id, project_id, task_id]
+
+        return self._copy_batches('activities', columns, row, count, start)
+
+    def users(self, count, profile, start=0):
+        """Seed count users; profile(i) returns their name, email and username. Returns the ids."""
+        columns = ['id', 'email', 'name', 'username', 'createdAt', 'updatedAt']
+        ids = []
+
+        def row(i):
+            user_id = new_id(self._ids)
+            ids.append(user_id)
+            p = profile(i)
+            now = _timestamp(self.newest - timedelta(seconds=i))
+            return [user_id, p['email'], p['name'], p.get('username'), now, now]
+
+        self._copy_batches('users', columns, row, count, start)
+        return ids
+
+    def tasks(self, project_id, creator_id, count, text=None, start=0, assignee_id=None, due=None, status=None):
+        """Seed count tasks in one project; text(i) returns (title, description), due(i) a datetime or None
+        and status(i) a TaskStatus. Returns the ids."""
+        columns = ['id', 'title', 'description', 'status', 'priority', 'dueDate', 'position', 'createdAt',
+                   'updatedAt', 'projectId', 'creatorId', 'assigneeId']
+        ids = []
+
+        def row(i):
+            task_id = new_id(self._ids)
+            ids.append(task_id)
+            title, description = text(i) if text else (f"Seeded task #{i}", None)
+            due_date = due(i) if due else None
+            now = _timestamp(self.newest - timedelta(seconds=i))
+            return [task_id, title, description, status(i) if status else 'TODO',
+                    ['LOW', 'MEDIUM', 'HIGH', 'URGENT'][i % 4], _timestamp(due_date) if due_date else None, i,
+                    now, now, project_id, creator_id, assignee_id]
+
+        self._copy_batches('tasks', columns, row, count, start)
+        return ids
+
+    def project_members(self, project_id, user_ids, role='MEMBER'):
+        columns = ['id', 'role', 'userId', 'projectId']
+        return self._copy_batches('project_members', columns,
+                                  lambda i: [new_id(self._ids), role, user_ids[i], project_id], len(user_ids))
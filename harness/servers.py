@@ -0,0 +1,171 @@
+"""
+Starting and stopping the app processes for local benchmarks
+"""
+
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from .config import APP_PORT, REPO_ROOT, WS_PORT
+
+_DEBUGGER_RE = re.compile(r'Debugger listening on (ws://\S+)')
+
+
+def wait_for_port(port, host='127.0.0.1', timeout=120, process=None):
+    """Block until the port accepts connections; returns seconds waited"""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Process exited with code {process.returncode} before listening on {port}")
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return time.perf_counter() - start
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError(f"Nothing listening on {host}:{port} after {timeout}s")
+
+
+def _next_bin():
+    local = os.path.join(REPO_ROOT, 'node_modules', '.bin', 'next')
+    return [local] if os.path.exists(local) else ['npx', 'next']
+
+
+class ServerProcess:
+    """A child process (Next.js or websocket server) with a readiness probe"""
+
+    def __init__(self, name, command, port, env=None, log_path=None):
+        self.name = name
+        self.command = command
+        self.port = port
+        self.env = env or {}
+        self.log_path = log_path
+        self.process = None
+        self.ready_seconds = None
+        self._log = None
+
+    def start(self, timeout=120):
+        """Spawn the process and wait until its port accepts connections"""
+        env = dict(os.environ)
+        env.update(self.env)
+        self._log = open(self.log_path, 'w', encoding='utf-8') if self.log_path else subprocess.DEVNULL
+        self.process = subprocess.Popen(
+            self.command, cwd=REPO_ROOT, env=env,
+            stdout=self._log, stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+        self.ready_seconds = wait_for_port(self.port, timeout=timeout, process=self.process)
+        return self.ready_seconds
+
+    def stop(self, timeout=15):
+        """Terminate the whole process group (npx/next spawn children)"""
+        if self.process and self.process.poll() is None:
+            try:
+                os.killpg(self.process.pid, signal.SIGTERM)
+                self.process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.process.pid, signal.SIGKILL)
+                self.process.wait()
+            except ProcessLookupError:
+                pass
+        if self._log not in (None, subprocess.DEVNULL):
+            self._log.close()
+        self._log = None
+
+    def inspector_urls(self):
+        """DevTools websocket URLs printed by every node process started with --inspect"""
+        if not self.log_path or not os.path.exists(self.log_path):
+            return []
+        with open(self.log_path, encoding='utf-8', errors='replace') as f:
+            return _DEBUGGER_RE.findall(f.read())
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _inspect_env(env, log_path):
+    """Enable the inspector on a random port for the process and any node children"""
+    if not log_path:
+        raise ValueError("inspect=True needs a log_path to read the debugger URLs from")
+    env = dict(env or {})
+    options = env.get('NODE_OPTIONS', os.environ.get('NODE_OPTIONS', ''))
+    env['NODE_OPTIONS'] = f"{options} --inspect=127.0.0.1:0".strip()
+    return env
+
+
+def next_server(mode='start', port=APP_PORT, env=None, log_path=None, inspect=False):
+    """Next.js in production (`next start`, needs a prior build) or dev mode"""
+    command = _next_bin() + [mode, '--hostname', '0.0.0.0', '--port', str(port)]
+    if inspect:
+        env = _inspect_env(env, log_path)
+    return ServerProcess('next', command, port, env=env, log_path=log_path)
+
+
+def websocket_server(script='websocket-server.js', port=WS_PORT, env=None, log_path=None, inspect=False):
+    """The Socket.IO workspace/notification server"""
+    env = dict(env or {})
+    env.setdefault('PORT', str(port))
+    if inspect:
+        env = _inspect_env(env, log_path)
+    return ServerProcess('websocket', ['node', script], port, env=env, log_path=log_path)
+
+
+def standin_server(port=APP_PORT, ws_port=WS_PORT, log_path=None):
+    """The in-memory stand-in (harness.standin) serving both the API and Socket.IO"""
+    command = [sys.executable, '-m', 'harness.standin', 'serve', '--port', str(port), '--ws-port', str(ws_port)]
+    return ServerProcess('standin', command, port, log_path=log_path)
+
+
+def free_port(host='127.0.0.1'):
+    """An unused TCP port to start a private server on"""
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def listening_pid(port):
+    """PID of the local process listening on port (Linux /proc), or None"""
+    inodes = set()
+    for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+        try:
+            with open(table, encoding='ascii') as f:
+                lines = f.readlines()[1:]
+        except OSError:
+            continue
+        for line in lines:
+            fields = line.split()
+            if int(fields[1].rsplit(':', 1)[1], 16) == port and fields[3] == '0A':
+                inodes.add(f"socket:[{fields[9]}]")
+    for pid in os.listdir('/proc') if inodes else []:
+        if not pid.isdigit():
+            continue
+        try:
+            fds = os.listdir(f"/proc/{pid}/fd")
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                if os.readlink(f"/proc/{pid}/fd/{fd}") in inodes:
+                    return int(pid)
+            except OSError:
+                continue
+    return None
+
+
+def rss_bytes(pid):
+    """Resident set size of a local process, or None"""
+    try:
+        with open(f"/proc/{pid}/status", encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Golden database snapshots for repeatable benchmark runs
+
+The app always talks to the database in DATABASE_URL (the "work"
+database). `build` recreates it from the migrations, seeds a baseline
+dataset through the running app and saves it as a golden copy; `restore`
+then drops the work database and clones it back from the golden one with
+CREATE DATABASE ... TEMPLATE, which takes seconds instead of re-seeding.
+`dump` and `load` move a golden copy to and from a pg_dump file for
+machines where it has not been built yet.
+
+    python -m harness.snapshot build --projects 5 --tasks 50 --members 3
+    python -m harness.snapshot restore           # before every benchmark run
+    python -m harness.snapshot dump --file golden.dump
+    python -m harness.snapshot load --file golden.dump && python -m harness.snapshot restore
+
+Cloning needs every other connection to the source database closed, so
+open connections (the app's Prisma pool included) are terminated first;
+Prisma reconnects on the next query. Because it can reconnect before the
+clone starts, busy databases are terminated and retried, and drops use
+DROP DATABASE ... WITH (FORCE) on PostgreSQL 13 and later.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from .client import ApiClient
+from .config import BASE_URL, DEFAULT_PASSWORD, REPO_ROOT, SNAPSHOTS_DIR
+from .db import Database, DatabaseError, quote_ident
+from .results import git_commit
+from .seed import ApiSeeder
+
+
+BUSY_ERROR = 'is being accessed by other users'
+
+
+class Snapshots:
+    """Golden copies of the work database, named <work>_<name>"""
+
+    def __init__(self, db, attempts=20):
+        self.db = db
+        self.admin = db.with_database('postgres')
+        self.attempts = attempts
+        self._force_drop = None
+
+    def golden_name(self, name):
+        return f"{self.db.name}_{name}"
+
+    def manifest_path(self, name):
+        return os.path.join(SNAPSHOTS_DIR, f"{name}.json")
+
+    def exists(self, database):
+        return self.admin.scalar(f"SELECT 1 FROM pg_database WHERE datname = '{database}'") == '1'
+
+    def disconnect(self, database):
+        self.admin.execute(f"SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                           f"WHERE datname = '{database}' AND pid <> pg_backend_pid()")
+
+    def while_busy(self, database, sql):
+        """Terminate connections to database and run sql; again if a client reconnected in between"""
+        for attempt in range(self.attempts):
+            self.disconnect(database)
+            try:
+                return self.admin.execute(sql)
+            except DatabaseError as e:
+                if BUSY_ERROR not in str(e) or attempt == self.attempts - 1:
+                    raise
+                time.sleep(0.05 * (attempt + 1))
+
+    def drop(self, database):
+        if self._force_drop is None:
+            self._force_drop = int(self.admin.scalar("SHOW server_version_num")) >= 130000
+        if self._force_drop:
+            self.admin.execute(f"DROP DATABASE IF EXISTS {quote_ident(database)} WITH (FORCE)")
+        else:
+            self.while_busy(database, f"DROP DATABASE IF EXISTS {quote_ident(database)}")
+
+    def clone(self, source, target):
+        """target becomes a file-level copy of source"""
+        self.drop(target)
+        self.while_busy(source, f"CREATE DATABASE {quote_ident(target)} TEMPLATE {quote_ident(source)}")
+
+    def recreate_work(self):
+        """Empty work database with the schema from prisma/migrations"""
+        self.drop(self.db.name)
+        self.admin.execute(f"CREATE DATABASE {quote_ident(self.db.name)}")
+        result = subprocess.run(['npx', 'prisma', 'migrate', 'deploy'], cwd=REPO_ROOT,
+                                env={**os.environ, 'DATABASE_URL': self.db.prisma_url},
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise DatabaseError(f"prisma migrate deploy failed: {result.stderr.strip()[-500:]}")
+
+    def save(self, name):
+        start = time.perf_counter()
+        self.clone(self.db.name, self.golden_name(name))
+        return time.perf_counter() - start
+
+    def restore(self, name):
+        golden = self.golden_name(name)
+        if not self.exists(golden):
+            raise DatabaseError(f"No golden database {golden}; run `python -m harness.snapshot build` first")
+        start = time.perf_counter()
+        self.clone(golden, self.db.name)
+        return time.perf_counter() - start
+
+    def dump(self, name, path):
+        if not shutil.which('pg_dump'):
+            raise DatabaseError("pg_dump is required to write snapshot files")
+        start = time.perf_counter()
+        result = subprocess.run(['pg_dump', '--format=custom', '--no-owner', '--file', path,
+                                 self.db.with_database(self.golden_name(name)).url],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise DatabaseError(result.stderr.strip())
+        return time.perf_counter() - start
+
+    def load(self, name, path, jobs=4):
+        """Recreate the golden database from a pg_dump file"""
+        if not shutil.which('pg_restore'):
+            raise DatabaseError("pg_restore is required to load snapshot files")
+        golden = self.golden_name(name)
+        start = time.perf_counter()
+        self.drop(golden)
+        self.admin.execute(f"CREATE DATABASE {quote_ident(golden)}")
+        result = subprocess.run(['pg_restore', '--no-owner', f'--jobs={jobs}', '--dbname',
+                                 self.db.with_database(golden).url, path],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise DatabaseError(result.stderr.strip())
+        return time.perf_counter() - start
+
+    def list(self):
+        prefix = f"{self.db.name}_"
+        rows = self.admin.query(f"SELECT datname, pg_database_size(datname) FROM pg_database "
+                                f"WHERE datname LIKE '{prefix}%' ORDER BY datname")
+        return [(name[len(prefix):], int(size)) for name, size in rows]
+
+    def write_manifest(self, name, manifest):
+        os.makedirs(SNAPSHOTS_DIR, exist_ok=True)
+        with open(self.manifest_path(name), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+    def read_manifest(self, name):
+        try:
+            with open(self.manifest_path(name), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+
+def restore_golden(name='golden', database_url=None):
+    """Reset the work database to a golden copy; returns the elapsed seconds"""
+    return Snapshots(Database(database_url)).restore(name)
+
+
+def seed_baseline(base_url, projects, tasks, members):
+    """Baseline dataset through the API; returns the manifest describing it"""
+    owner = ApiClient(base_url)
+    email = "golden.owner@example.com"
+    owner.register_and_login("Golden Owner", email, DEFAULT_PASSWORD)
+    seeder = ApiSeeder(owner, base_url, namespace='golden')
+    for _ in range(projects):
+        project_id = seeder.create_project()
+        seeder.grow_to(project_id, tasks=tasks, members=members, due_spread_days=30)
+    return {
+        'owner': {'id': owner.user['id'], 'email': email, 'password': DEFAULT_PASSWORD},
+        'members': seeder.accounts,
+        'projects': seeder.projects,
+        'counts': {'projects': len(seeder.projects), 'tasks': seeder.total_tasks,
+                   'members': seeder.total_members},
+    }
+
+
+def wait_for_app(base_url, timeout=60):
+    """The app's Prisma pool has to reconnect after the work database is recreated"""
+    client = ApiClient(base_url, timeout=5)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if client.get("/auth/csrf").status_code == 200:
+                return True
+        except Exception:
+            pass
+        time.sleep(1)
+    return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default=None, help="work database (defaults to $DATABASE_URL)")
+    parser.add_argument('--name', default='golden', help="snapshot name")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help="recreate, migrate and seed the work database, then save it")
+    build.add_argument('--base-url', default=BASE_URL)
+    build.add_argument('--projects', type=int, default=3)
+    build.add_argument('--tasks', type=int, default=25, help="tasks per project")
+    build.add_argument('--members', type=int, default=3, help="members per project")
+    sub.add_parser('save', help="save the work database as it is now")
+    sub.add_parser('restore', help="reset the work database to the snapshot")
+    for command in ('dump', 'load'):
+        p = sub.add_parser(command, help=f"{command} the snapshot {'to' if command == 'dump' else 'from'} a file")
+        p.add_argument('--file', default=None, help="defaults to bench_snapshots/<name>.dump")
+    sub.add_parser('list', help="list snapshots and their sizes")
+    sub.add_parser('drop', help="delete the snapshot")
+    args = parser.parse_args(argv)
+
+    try:
+        snapshots = Snapshots(Database(args.database_url))
+        name = args.name
+
+        if args.command == 'build':
+            print(f"🧱 Recreating {snapshots.db.name} from prisma/migrations...")
+            snapshots.recreate_work()
+            if not wait_for_app(args.base_url):
+                print(f"❌ The app at {args.base_url} is not answering; start it against {snapshots.db.name}")
+                return 1
+            start = time.perf_counter()
+            print(f"🌱 Seeding {args.projects} projects x {args.tasks} tasks / {args.members} members...")
+            manifest = seed_baseline(args.base_url, args.projects, args.tasks, args.members)
+            seed_seconds = time.perf_counter() - start
+            save_seconds = snapshots.save(name)
+            manifest.update({'name': name, 'database': snapshots.golden_name(name),
+                             'createdAt': datetime.now().isoformat(), 'commit': git_commit(),
+                             'seedSeconds': seed_seconds, 'saveSeconds': save_seconds})
+            snapshots.write_manifest(name, manifest)
+            print(f"✅ Seeded in {seed_seconds:.1f}s, saved as {snapshots.golden_name(name)} in {save_seconds:.1f}s")
+            print(f"💾 Accounts: {snapshots.manifest_path(name)}")
+
+        elif args.command == 'save':
+            print(f"✅ Saved {snapshots.golden_name(name)} in {snapshots.save(name):.1f}s")
+
+        elif args.command == 'restore':
+            seconds = snapshots.restore(name)
+            manifest = snapshots.read_manifest(name)
+            seeded = f" (seeded in {manifest['seedSeconds']:.0f}s)" if manifest else ""
+            print(f"⏱️  Restored {snapshots.db.name} from {snapshots.golden_name(name)} in {seconds:.1f}s{seeded}")
+
+        elif args.command == 'dump':
+            path = args.file or os.path.join(SNAPSHOTS_DIR, f"{name}.dump")
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            seconds = snapshots.dump(name, path)
+            print(f"💾 {path} ({os.path.getsize(path) / 1024 / 1024:.1f} MB) in {seconds:.1f}s")
+
+        elif args.command == 'load':
+            path = args.file or os.path.join(SNAPSHOTS_DIR, f"{name}.dump")
+            print(f"✅ Loaded {snapshots.golden_name(name)} from {path} in {snapshots.load(name, path):.1f}s")
+
+        elif args.command == 'list':
+            snapshots_found = snapshots.list()
+            if not snapshots_found:
+                print("No snapshots yet")
+            for snapshot, size in snapshots_found:
+                manifest = snapshots.read_manifest(snapshot) or {}
+                print(f"{snapshot:<20} {size / 1024 / 1024:>8.1f} MB  {manifest.get('createdAt', '-')[:19]}  "
+                      f"{manifest.get('counts', '')}")
+
+        elif args.command == 'drop':
+            snapshots.drop(snapshots.golden_name(name))
+            print(f"🗑️  Dropped {snapshots.golden_name(name)}")
+
+    except DatabaseError as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
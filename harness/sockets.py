@@ -0,0 +1,154 @@
+"""
+Socket.IO clients for load tools
+
+PollingSocket speaks Engine.IO v4 long-polling over plain requests, so
+tools can hold many notification connections open without extra
+dependencies. It answers pings, counts messages and reconnects when the
+server drops the session; pass on_event(name, data) to see the events
+themselves. Every connect, disconnect and message is
+counted on the recorder (ws.connect, ws.disconnect, ws.message_in,
+ws.message_out) and the open-connection total is kept in the
+ws.connections gauge.
+"""
+
+import json
+import threading
+import time
+
+import requests
+
+from .config import WS_URL
+
+_SEPARATOR = '\x1e'
+
+
+class _ConnectionGauge:
+    """Open PollingSocket sessions, shared so the gauge covers every client"""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def add(self, recorder, delta):
+        with self._lock:
+            self.value += delta
+            if recorder:
+                recorder.set_gauge('ws.connections', self.value)
+
+
+_GAUGE = _ConnectionGauge()
+
+
+class PollingSocket:
+    """One Socket.IO connection over long-polling, kept alive on a background thread"""
+
+    def __init__(self, ws_url=WS_URL, user_id=None, recorder=None, reconnect_delay=1.0, on_event=None):
+        self.url = f"{ws_url.rstrip('/')}/socket.io/"
+        self.user_id = user_id
+        self.recorder = recorder
+        self.reconnect_delay = reconnect_delay
+        self.session = requests.Session()
+        self.sid = None
+        self.ping_timeout = 20.0
+        self.ping_interval = 25.0
+        self.connected = False
+        self.disconnects = []  # (time, reason)
+        self.reconnect_ms = []  # downtime before each successful reconnect
+        self.messages = 0
+        self.on_event = on_event
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _count(self, name, n=1):
+        if self.recorder:
+            self.recorder.count(name, n)
+
+    def _params(self):
+        params = {'EIO': '4', 'transport': 'polling', 't': f"{time.time():.6f}"}
+        if self.sid:
+            params['sid'] = self.sid
+        return params
+
+    def send(self, packet):
+        response = self.session.post(self.url, params=self._params(), data=packet.encode('utf-8'), timeout=10)
+        response.raise_for_status()
+        self._count('ws.message_out')
+
+    def emit(self, event, data=None):
+        self.send('42' + json.dumps([event, data] if data is not None else [event]))
+
+    def open(self):
+        """Handshake, join the default namespace and announce the user"""
+        self.sid = None
+        response = self.session.get(self.url, params=self._params(), timeout=10)
+        response.raise_for_status()
+        handshake = json.loads(response.text.split(_SEPARATOR)[0][1:])
+        self.sid = handshake['sid']
+        self.ping_interval = handshake.get('pingInterval', 25000) / 1000
+        self.ping_timeout = handshake.get('pingTimeout', 20000) / 1000
+        self.send('40')
+        if self.user_id:
+            self.emit('user-connect', {'userId': self.user_id})
+        self.connected = True
+        _GAUGE.add(self.recorder, 1)
+        self._count('ws.connect')
+
+    def _drop(self, reason):
+        if self.connected:
+            self.connected = False
+            _GAUGE.add(self.recorder, -1)
+            self.disconnects.append((time.time(), reason))
+            self._count('ws.disconnect')
+
+    def poll_once(self):
+        """One long-poll; returns False when the session is gone"""
+        response = self.session.get(self.url, params=self._params(),
+                                    timeout=self.ping_interval + self.ping_timeout + 5)
+        if response.status_code != 200:
+            return False
+        for packet in response.text.split(_SEPARATOR):
+            if packet == '2':
+                self.send('3')
+            elif packet.startswith('1') or packet.startswith('41'):
+                return False
+            elif packet.startswith('4'):
+                self.messages += 1
+                self._count('ws.message_in')
+                if self.on_event and packet.startswith('42'):
+                    event, *args = json.loads(packet[2:])
+                    self.on_event(event, args[0] if args else None)
+        return True
+
+    def _loop(self):
+        down_since = None
+        while not self._stop.is_set():
+            try:
+                if not self.connected:
+                    self.open()
+                    if down_since is not None:
+                        self.reconnect_ms.append((time.time() - down_since) * 1000)
+                        down_since = None
+                if not self.poll_once():
+                    self._drop('server closed the session')
+                    down_since = time.time()
+            except (requests.RequestException, ValueError, KeyError) as e:
+                if self.connected or down_since is None:
+                    self._drop(type(e).__name__)
+                    down_since = down_since or time.time()
+                self._stop.wait(self.reconnect_delay)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._stop.set()
+        if self.connected:
+            try:
+                self.send('1')
+            except requests.RequestException:
+                pass
+            self.connected = False
+            _GAUGE.add(self.recorder, -1)
+        self.session.close()
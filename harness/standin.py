@@ -0,0 +1,1138 @@
+#!/usr/bin/env python3
+"""
+In-memory stand-in for the app and the Socket.IO server
+
+A near-zero-cost asyncio implementation of the API contract the harness
+and the pytest suite use (NextAuth credentials sign-in, projects, tasks,
+invitations, members, activity, inbox, dashboard, search) and of the
+Socket.IO notification/workspace events over Engine.IO long-polling.
+Everything lives in process memory; passwords are hashed with one
+SHA-256 instead of bcrypt. Like the app, API writes never reach the
+sockets: NotificationService's real-time path only runs in the browser,
+so notifications are delivered only when a client emits them. No Node or
+Postgres needed:
+
+    python -m harness.standin serve                    # :3000 (API) and :3001 (Socket.IO)
+    python -m pytest --standin                         # the suite against a private stand-in
+    python -m harness.standin calibrate --concurrency 1,8,32,128
+
+calibrate starts a stand-in and drives it with the harness's own client
+at each concurrency. Because the server does almost no work, the
+throughput and latency it reports are the load generator's ceiling and
+floor: app results close to them measure the harness, not the app.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import re
+import secrets
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+
+from .config import APP_PORT, WS_PORT
+from .db import new_id
+
+# enum ActivityType in prisma/schema.prisma; the app's routes also log NOTE_UPDATED, NOTE_DELETED and
+# TASK_DELETED, which Postgres rejects, so those requests end in a 500 after any earlier writes
+ACTIVITY_TYPES = {
+    'TASK_CREATED', 'TASK_UPDATED', 'TASK_COMPLETED', 'TASK_ASSIGNED', 'TASK_COMMENTED', 'PROJECT_CREATED',
+    'PROJECT_UPDATED', 'MEMBER_JOINED', 'MEMBER_LEFT', 'MEMBER_UPDATED', 'MEMBER_REMOVED', 'LABEL_CREATED',
+    'NOTE_CREATED', 'WORKSPACE_CREATED', 'WORKSPACE_UPDATED', 'WORKSPACE_DELETED',
+}
+PRIORITY_ORDER = {'LOW': 0, 'MEDIUM': 1, 'HIGH': 2, 'URGENT': 3}
+LOCK_TIMEOUT = 30.0  # websocket-server.js releases abandoned edit locks after 30s
+PING_INTERVAL = 25.0
+PING_TIMEOUT = 20.0
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _iso(value):
+    return value.isoformat(timespec='milliseconds').replace('+00:00', 'Z') if value else None
+
+
+def _hash(password):
+    return hashlib.sha256(password.encode('utf-8')).hexdigest()
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    def __init__(self, method, target, headers, body):
+        parts = urlsplit(target)
+        self.method = method
+        self.path = parts.path
+        self.query = dict(parse_qsl(parts.query))
+        self.headers = headers
+        self.body = body
+        self.cookies = {}
+        for pair in headers.get('cookie', '').split(';'):
+            name, _, value = pair.strip().partition('=')
+            if name:
+                self.cookies[name] = value
+
+    def json(self):
+        try:
+            return json.loads(self.body or b'{}')
+        except ValueError:
+            raise HttpError(400, 'Invalid JSON body')
+
+    def form(self):
+        return dict(parse_qsl(self.body.decode('utf-8')))
+
+
+class Response:
+    def __init__(self, status=200, payload=None, text=None, cookies=(), content_type='application/json'):
+        self.status = status
+        self.body = (text if text is not None else json.dumps(payload)).encode('utf-8')
+        self.cookies = list(cookies)
+        self.content_type = content_type
+
+
+# API -------------------------------------------------------------------
+
+class StandinApi:
+    """The API routes over in-memory tables"""
+
+    def __init__(self):
+        self.users = {}
+        self.users_by_email = {}
+        self.sessions = {}  # session token -> user id
+        self.projects = {}
+        self.members = {}  # member id -> {id, role, userId, projectId, joinedAt}
+        self.tasks = {}
+        self.invitations = {}
+        self.workspaces = {}
+        self.notes = {}
+        self.activities = []  # append-only, oldest first
+        self.inbox = []
+        self.inbox_reads = set()  # (inbox item id, user id)
+        self.notifications = []
+        self.routes = []
+        for method, pattern, handler in [
+            ('GET', r'/api/auth/csrf', self.csrf),
+            ('POST', r'/api/auth/callback/credentials', self.sign_in),
+            ('GET', r'/api/auth/session', self.session),
+            ('POST', r'/api/auth/signout', self.sign_out),
+            ('POST', r'/api/auth/register', self.register),
+            ('GET', r'/api/projects', self.list_projects),
+            ('POST', r'/api/projects', self.create_project),
+            ('GET', r'/api/projects/(?P<pid>[^/]+)', self.get_project),
+            ('PATCH', r'/api/projects/(?P<pid>[^/]+)', self.update_project),
+            ('DELETE', r'/api/projects/(?P<pid>[^/]+)', self.delete_project),
+            ('GET', r'/api/projects/(?P<pid>[^/]+)/workspaces', self.list_workspaces),
+            ('POST', r'/api/projects/(?P<pid>[^/]+)/workspaces', self.create_workspace),
+            ('GET', r'/api/projects/(?P<pid>[^/]+)/workspaces/(?P<wid>[^/]+)', self.get_workspace),
+            ('PATCH', r'/api/projects/(?P<pid>[^/]+)/workspaces/(?P<wid>[^/]+)', self.update_workspace),
+            ('DELETE', r'/api/projects/(?P<pid>[^/]+)/workspaces/(?P<wid>[^/]+)', self.delete_workspace),
+            ('GET', r'/api/projects/(?P<pid>[^/]+)/notes', self.list_notes),
+            ('POST', r'/api/projects/(?P<pid>[^/]+)/notes', self.create_note),
+            ('PATCH', r'/api/projects/(?P<pid>[^/]+)/notes/(?P<nid>[^/]+)', self.update_note),
+            ('DELETE', r'/api/projects/(?P<pid>[^/]+)/notes/(?P<nid>[^/]+)', self.delete_note),
+            ('GET', r'/api/projects/(?P<pid>[^/]+)/tasks', self.list_tasks),
+            ('POST', r'/api/projects/(?P<pid>[^/]+)/tasks', self.create_task),
+            ('POST', r'/api/projects/(?P<pid>[^/]+)/invite', self.invite),
+            ('PATCH', r'/api/projects/(?P<pid>[^/]+)/members/(?P<mid>[^/]+)', self.update_member),
+            ('DELETE', r'/api/projects/(?P<pid>[^/]+)/members/(?P<mid>[^/]+)', self.remove_member),
+            ('GET', r'/api/tasks/(?P<tid>[^/]+)', self.get_task),
+            ('PATCH', r'/api/tasks/(?P<tid>[^/]+)', self.update_task),
+            ('DELETE', r'/api/tasks/(?P<tid>[^/]+)', self.delete_task),
+            ('GET', r'/api/invitations', self.list_invitations),
+            ('POST', r'/api/inbox/invitations', self.answer_invitation),
+            ('GET', r'/api/inbox', self.list_inbox),
+            ('PATCH', r'/api/inbox', self.update_inbox),
+            ('GET', r'/api/inbox/unread-count', self.unread_count),
+            ('GET', r'/api/notifications', self.list_notifications),
+            ('PATCH', r'/api/notifications', self.update_notifications),
+            ('POST', r'/api/notifications/trigger', self.trigger_notification),
+            ('GET', r'/api/activity', self.list_activity),
+            ('GET', r'/api/my-tasks', self.my_tasks),
+            ('GET', r'/api/dashboard/stats', self.dashboard_stats),
+            ('GET', r'/api/dashboard/recent-tasks', self.recent_tasks),
+            ('GET', r'/api/dashboard/recent-projects', self.recent_projects),
+            ('GET', r'/api/dashboard/recent-activities', self.recent_activities),
+            ('GET', r'/api/search', self.search),
+            ('GET', r'/api/users/search', self.search_users),
+        ]:
+            self.routes.append((method, re.compile(pattern + '/?$'), handler))
+
+    def handle(self, request):
+        for method, pattern, handler in self.routes:
+            match = pattern.match(request.path)
+            if match and method == request.method:
+                try:
+                    result = handler(request, **match.groupdict())
+                except HttpError as e:
+                    return Response(e.status, {'error': e.message})
+                return result if isinstance(result, Response) else Response(200, result)
+        # Like app/api/[[...path]]: anything else under /api is the retired legacy API
+        return Response(410, {'error': "This legacy API endpoint has been deprecated",
+                              'message': "Please use the new individual API routes under /api/",
+                              'route': request.path[len('/api'):] or '/', 'method': request.method})
+
+    # Auth and users
+
+    def current_user(self, request):
+        user_id = self.sessions.get(request.cookies.get('next-auth.session-token'))
+        if not user_id or user_id not in self.users:
+            raise HttpError(401, 'Unauthorized')
+        return self.users[user_id]
+
+    def brief(self, user_id, email=False):
+        user = self.users.get(user_id)
+        if not user:
+            return None
+        out = {'id': user['id'], 'name': user['name'], 'image': None}
+        if email:
+            out['email'] = user['email']
+        return out
+
+    def csrf(self, request):
+        token = secrets.token_hex(16)
+        return Response(200, {'csrfToken': token}, cookies=[f"next-auth.csrf-token={token}; Path=/; HttpOnly"])
+
+    def sign_in(self, request):
+        form = request.form()
+        user = self.users_by_email.get(form.get('email', ''))
+        origin = f"http://{request.headers.get('host', 'localhost')}"
+        if not form.get('csrfToken') or not user or user['password'] != _hash(form.get('password', '')):
+            return Response(401, {'url': f"{origin}/api/auth/error?error=CredentialsSignin"})
+        token = secrets.token_hex(24)
+        self.sessions[token] = user['id']
+        return Response(200, {'url': f"{origin}/"},
+                        cookies=[f"next-auth.session-token={token}; Path=/; HttpOnly; SameSite=Lax"])
+
+    def session(self, request):
+        user_id = self.sessions.get(request.cookies.get('next-auth.session-token'))
+        user = self.users.get(user_id)
+        if not user:
+            return {}
+        return {'user': {'id': user['id'], 'name': user['name'], 'email': user['email'], 'image': None,
+                         'role': 'USER', 'username': user['username']},
+                'expires': _iso(_now() + timedelta(days=30))}
+
+    def sign_out(self, request):
+        self.sessions.pop(request.cookies.get('next-auth.session-token'), None)
+        return Response(200, {'url': '/'}, cookies=["next-auth.session-token=; Path=/; Max-Age=0"])
+
+    def register(self, request):
+        data = request.json()
+        name, email, password = data.get('name'), data.get('email'), data.get('password')
+        if not name or not email or not password:
+            raise HttpError(400, 'Name, email and password are required')
+        local, _, domain = email.partition('@')
+        if not local or '.' not in domain or ' ' in email:
+            raise HttpError(400, 'Invalid email format')
+        if len(password) < 6:
+            raise HttpError(400, 'Password must be at least 6 characters long')
+        if email in self.users_by_email:
+            raise HttpError(400, 'User already exists with this email')
+        user = {'id': new_id(), 'name': name, 'email': email, 'password': _hash(password),
+                'username': ''.join(c for c in local.lower() if c.isalnum()), 'createdAt': _iso(_now())}
+        self.users[user['id']] = user
+        self.users_by_email[email] = user
+        return {'user': {k: user[k] for k in ('id', 'name', 'email', 'username', 'createdAt')},
+                'message': 'User created successfully. You can now sign in.'}
+
+    def search_users(self, request):
+        self.current_user(request)
+        q = request.query.get('q', '').lower()
+        if len(q) < 2:
+            return {'users': []}
+        found = [self.brief(u['id'], email=True) for u in self.users.values()
+                 if q in u['name'].lower() or q in u['email'].lower()]
+        return {'users': found[:10]}
+
+    # Projects
+
+    def role(self, user, project):
+        if project['ownerId'] == user['id']:
+            return 'OWNER'
+        for member in self.members.values():
+            if member['projectId'] == project['id'] and member['userId'] == user['id']:
+                return member['role']
+        return None
+
+    def user_projects(self, user):
+        return [p for p in self.projects.values() if self.role(user, p)]
+
+    def project_for(self, user, pid, admin=False, message='Project not found', public=False):
+        project = self.projects.get(pid)
+        role = self.role(user, project) if project else None
+        if not project or not (role or (public and project['isPublic'])) or (admin and role not in ('OWNER', 'ADMIN')):
+            raise HttpError(404, message)
+        return project
+
+    def project_view(self, project, email=False):
+        members = [dict(m, user=self.brief(m['userId'], email)) for m in self.members.values()
+                   if m['projectId'] == project['id']]
+        tasks = [t for t in self.tasks.values() if t['projectId'] == project['id']]
+        return dict(project, owner=self.brief(project['ownerId'], email), members=members,
+                    _count={'tasks': len(tasks), 'members': len(members)})
+
+    def log(self, type, content, user, project_id=None, task_id=None):
+        if type not in ACTIVITY_TYPES:
+            raise HttpError(500, 'Internal server error')
+        self.activities.append({'id': new_id(), 'type': type, 'content': content, 'metadata': None,
+                                'createdAt': _iso(_now()), 'userId': user['id'], 'projectId': project_id,
+                                'taskId': task_id})
+
+    def list_projects(self, request):
+        user = self.current_user(request)
+        projects = sorted(self.user_projects(user), key=lambda p: p['updatedAt'], reverse=True)
+        views = []
+        for project in projects:
+            view = self.project_view(project)
+            view['tasks'] = [{'status': t['status']} for t in self.tasks.values() if t['projectId'] == project['id']]
+            views.append(view)
+        return {'projects': views}
+
+    def create_project(self, request):
+        user = self.current_user(request)
+        data = request.json()
+        if not (data.get('name') or '').strip():
+            raise HttpError(400, 'Project name is required')
+        now = _iso(_now())
+        project = {'id': new_id(), 'name': data['name'].strip(),
+                   'description': (data.get('description') or '').strip() or None,
+                   'color': data.get('color'), 'isPublic': bool(data.get('isPublic')), 'ownerId': user['id'],
+                   'createdAt': now, 'updatedAt': now}
+        self.projects[project['id']] = project
+        member = {'id': new_id(), 'role': 'OWNER', 'userId': user['id'], 'projectId': project['id'], 'joinedAt': now}
+        self.members[member['id']] = member
+        self.log('PROJECT_CREATED', f'created project "{project["name"]}"', user, project['id'])
+        return Response(201, {'project': self.project_view(project)})
+
+    def get_project(self, request, pid):
+        user = self.current_user(request)
+        project = self.project_for(user, pid, public=True)
+        view = self.project_view(project, email=True)
+        view['tasks'] = sorted(({k: t[k] for k in ('id', 'title', 'status', 'priority', 'createdAt', 'updatedAt')}
+                                for t in self.tasks.values() if t['projectId'] == pid),
+                               key=lambda t: t['updatedAt'], reverse=True)
+        view['labels'] = []
+        view['invitations'] = ([i for i in self.invitations.values() if i['projectId'] == pid
+                                and i['status'] == 'PENDING'] if self.role(user, project) in ('OWNER', 'ADMIN') else [])
+        return {'project': view, 'currentUserId': user['id']}
+
+    def update_project(self, request, pid):
+        user = self.current_user(request)
+        project = self.project_for(user, pid, admin=True, message='Project not found or insufficient permissions')
+        data = request.json()
+        if data.get('name'):
+            project['name'] = data['name'].strip()
+        if 'description' in data:
+            project['description'] = (data['description'] or '').strip() or None
+        if data.get('color'):
+            project['color'] = data['color']
+        if 'isPublic' in data:
+            project['isPublic'] = bool(data['isPublic'])
+        project['updatedAt'] = _iso(_now())
+        self.log('PROJECT_UPDATED', f'updated project "{project["name"]}"', user, pid)
+        return {'project': self.project_view(project, email=True)}
+
+    def delete_project(self, request, pid):
+        user = self.current_user(request)
+        self.project_for(user, pid, admin=True, message='Project not found or insufficient permissions')
+        del self.projects[pid]
+        for table in (self.members, self.tasks, self.invitations, self.workspaces, self.notes):
+            for key in [k for k, row in table.items() if row['projectId'] == pid]:
+                del table[key]
+        self.activities = [a for a in self.activities if a['projectId'] != pid]
+        return {'message': 'Project deleted successfully'}
+
+    # Workspaces and notes
+
+    def list_workspaces(self, request, pid):
+        user = self.current_user(request)
+        self.project_for(user, pid, public=True, message='Project not found or access denied')
+        workspaces = [w for w in self.workspaces.values() if w['projectId'] == pid]
+        return {'workspaces': sorted(workspaces, key=lambda w: w['updatedAt'], reverse=True)}
+
+    def create_workspace(self, request, pid):
+        user = self.current_user(request)
+        self.project_for(user, pid, message='Project not found or access denied')
+        data = request.json()
+        if not (data.get('name') or '').strip():
+            raise HttpError(400, 'Workspace name is required')
+        now = _iso(_now())
+        workspace = {'id': new_id(), 'name': data['name'].strip(),
+                     'data': data.get('data') or {'elements': [], 'appState': {}},
+                     'projectId': pid, 'creatorId': user['id'], 'createdAt': now, 'updatedAt': now}
+        self.workspaces[workspace['id']] = workspace
+        self.log('WORKSPACE_CREATED', f'created workspace "{workspace["name"]}"', user, pid)
+        return {'workspace': dict(workspace, creator=self.brief(user['id'], email=True))}
+
+    def workspace_for(self, request, pid, wid):
+        user = self.current_user(request)
+        self.project_for(user, pid, public=True, message='Project not found or access denied')
+        workspace = self.workspaces.get(wid)
+        if not workspace or workspace['projectId'] != pid:
+            raise HttpError(404, 'Workspace not found')
+        return user, workspace
+
+    def get_workspace(self, request, pid, wid):
+        return {'workspace': self.workspace_for(request, pid, wid)[1]}
+
+    def update_workspace(self, request, pid, wid):
+        user, workspace = self.workspace_for(request, pid, wid)
+        data = request.json()
+        if data.get('name'):
+            workspace['name'] = data['name']
+        if data.get('data'):
+            workspace['data'] = data['data']
+        workspace['updatedAt'] = _iso(_now())
+        self.log('WORKSPACE_UPDATED', f'updated workspace "{workspace["name"]}"', user, pid)
+        return {'workspace': workspace}
+
+    def delete_workspace(self, request, pid, wid):
+        user, workspace = self.workspace_for(request, pid, wid)
+        del self.workspaces[wid]
+        self.log('WORKSPACE_DELETED', f'deleted workspace "{workspace["name"]}"', user, pid)
+        return {'message': 'Workspace deleted successfully'}
+
+    def list_notes(self, request, pid):
+        user = self.current_user(request)
+        self.project_for(user, pid, public=True)
+        notes = [dict(n, author=self.brief(n['authorId'])) for n in self.notes.values() if n['projectId'] == pid]
+        return {'notes': sorted(notes, key=lambda n: n['updatedAt'], reverse=True)}
+
+    def create_note(self, request, pid):
+        user = self.current_user(request)
+        self.project_for(user, pid, message='Project not found or insufficient permissions')
+        data = request.json()
+        if not (data.get('title') or '').strip():
+            raise HttpError(400, 'Note title is required')
+        now = _iso(_now())
+        note = {'id': new_id(), 'title': data['title'].strip(), 'content': data.get('content') or '',
+                'isPublic': False, 'projectId': pid, 'authorId': user['id'], 'createdAt': now, 'updatedAt': now}
+        self.notes[note['id']] = note
+        self.log('NOTE_CREATED', f'created note "{note["title"]}"', user, pid)
+        return Response(201, {'note': dict(note, author=self.brief(user['id']))})
+
+    def note_for(self, request, pid, nid):
+        user = self.current_user(request)
+        self.project_for(user, pid, message='Project not found or insufficient permissions')
+        note = self.notes.get(nid)
+        if not note or note['projectId'] != pid:
+            raise HttpError(404, 'Note not found')
+        return user, note
+
+    def update_note(self, request, pid, nid):
+        user, note = self.note_for(request, pid, nid)
+        data = request.json()
+        if data.get('title') is not None:
+            note['title'] = data['title']
+        if data.get('content') is not None:
+            note['content'] = data['content']
+        note['updatedAt'] = _iso(_now())
+        self.log('NOTE_UPDATED', f'updated note "{note["title"]}"', user, pid)
+        return {'note': dict(note, author=self.brief(note['authorId']))}
+
+    def delete_note(self, request, pid, nid):
+        user, note = self.note_for(request, pid, nid)
+        del self.notes[nid]
+        self.log('NOTE_DELETED', f'deleted note "{note["title"]}"', user, pid)
+        return {'message': 'Note deleted successfully'}
+
+    # Tasks
+
+    def task_view(self, task, detail=False):
+        project = self.projects[task['projectId']]
+        view = dict(task, assignee=self.brief(task['assigneeId']), labels=[],
+                    project={'id': project['id'], 'name': project['name'], 'color': project['color']})
+        if detail:
+            view['comments'] = []
+        return view
+
+    def task_for(self, user, tid, message='Task not found', admin=False):
+        task = self.tasks.get(tid)
+        role = self.role(user, self.projects[task['projectId']]) if task else None
+        if not role or (admin and role not in ('OWNER', 'ADMIN')):
+            raise HttpError(404, message)
+        return task
+
+    def list_tasks(self, request, pid):
+        user = self.current_user(request)
+        self.project_for(user, pid, public=True)
+        tasks = sorted((t for t in self.tasks.values() if t['projectId'] == pid),
+                       key=lambda t: (PRIORITY_ORDER[t['priority']], t['createdAt']), reverse=True)
+        return {'tasks': [self.task_view(t) for t in tasks]}
+
+    def create_task(self, request, pid):
+        user = self.current_user(request)
+        project = self.project_for(user, pid, message='Project not found or insufficient permissions')
+        data = request.json()
+        if not (data.get('title') or '').strip():
+            raise HttpError(400, 'Task title is required')
+        now = _iso(_now())
+        task = {'id': new_id(), 'title': data['title'].strip(),
+                'description': (data.get('description') or '').strip() or None,
+                'status': 'TODO', 'priority': data.get('priority') or 'MEDIUM', 'position': 0,
+                'dueDate': data.get('dueDate'), 'projectId': pid, 'creatorId': user['id'],
+                'assigneeId': data.get('assigneeId') or None, 'createdAt': now, 'updatedAt': now}
+        self.tasks[task['id']] = task
+        self.log('TASK_CREATED', f'created task "{task["title"]}"', user, pid, task['id'])
+        if task['assigneeId'] and task['assigneeId'] != user['id']:
+            self.notify(task['assigneeId'], 'TASK_ASSIGNMENT', f"New task in {project['name']}",
+                        f'{user["name"]} assigned you "{task["title"]}"', {'taskId': task['id'], 'projectId': pid})
+        return Response(201, {'task': self.task_view(task)})
+
+    def get_task(self, request, tid):
+        user = self.current_user(request)
+        return {'task': self.task_view(self.task_for(user, tid), detail=True)}
+
+    def update_task(self, request, tid):
+        user = self.current_user(request)
+        task = self.task_for(user, tid, message='Task not found or insufficient permissions')
+        data = request.json()
+        previous_status = task['status']
+        if data.get('title'):
+            task['title'] = data['title'].strip()
+        if 'description' in data:
+            task['description'] = (data['description'] or '').strip() or None
+        for field in ('status', 'priority'):
+            if data.get(field):
+                task[field] = data[field]
+        for field in ('assigneeId', 'dueDate'):
+            if field in data:
+                task[field] = data[field] or None
+        task['updatedAt'] = _iso(_now())
+
+        activity_type, content = 'TASK_UPDATED', f'updated task "{task["title"]}"'
+        if data.get('status') and data['status'] != previous_status:
+            if data['status'] == 'DONE':
+                activity_type, content = 'TASK_COMPLETED', f'completed task "{task["title"]}"'
+            else:
+                content = f'changed status of "{task["title"]}" to {data["status"].lower()}'
+        self.log(activity_type, content, user, task['projectId'], tid)
+        return {'task': self.task_view(task)}
+
+    def delete_task(self, request, tid):
+        user = self.current_user(request)
+        task = self.task_for(user, tid, message='Task not found or insufficient permissions', admin=True)
+        self.log('TASK_DELETED', f'deleted task "{task["title"]}"', user, task['projectId'])
+        del self.tasks[tid]
+        for activity in self.activities:
+            if activity['taskId'] == tid:
+                activity['taskId'] = None
+        return {'message': 'Task deleted successfully'}
+
+    def my_tasks(self, request):
+        user = self.current_user(request)
+        tasks = [t for t in self.tasks.values() if t['assigneeId'] == user['id']]
+        return {'tasks': [self.task_view(t) for t in sorted(tasks, key=lambda t: t['updatedAt'], reverse=True)]}
+
+    # Team
+
+    def invite(self, request, pid):
+        user = self.current_user(request)
+        project = self.project_for(user, pid, admin=True, message='Project not found or insufficient permissions')
+        data = request.json()
+        email, role = data.get('email'), data.get('role') or 'MEMBER'
+        if not email:
+            raise HttpError(400, 'Email is required')
+        invitee = self.users_by_email.get(email)
+        if invitee and self.role(invitee, project):
+            raise HttpError(400, 'User is already a member of this project')
+        if any(i['projectId'] == pid and i['email'] == email and i['status'] == 'PENDING'
+               for i in self.invitations.values()):
+            raise HttpError(400, 'A pending invitation has already been sent to this email address')
+        for key in [k for k, i in self.invitations.items() if i['projectId'] == pid and i['email'] == email]:
+            del self.invitations[key]
+        invitation = {'id': new_id(), 'email': email, 'role': role, 'status': 'PENDING', 'projectId': pid,
+                      'inviterId': user['id'], 'createdAt': _iso(_now()),
+                      'expiresAt': _iso(_now() + timedelta(days=7))}
+        self.invitations[invitation['id']] = invitation
+        if invitee:
+            self.notify(invitee['id'], 'PROJECT_INVITATION', f"Invitation to {project['name']}",
+                        f"{user['name']} invited you to join {project['name']} as {role.lower()}",
+                        {'invitationId': invitation['id'], 'projectId': pid})
+        return Response(201, {'invitation': invitation})
+
+    def list_invitations(self, request):
+        user = self.current_user(request)
+        invitations = [dict(i, project={'id': i['projectId'], 'name': self.projects[i['projectId']]['name']},
+                            inviter=self.brief(i['inviterId'], email=True))
+                       for i in self.invitations.values() if i['email'] == user['email'] and i['status'] == 'PENDING']
+        return {'invitations': invitations, 'total': len(invitations)}
+
+    def answer_invitation(self, request):
+        user = self.current_user(request)
+        data = request.json()
+        if not data.get('invitationId') or data.get('action') not in ('accept', 'reject'):
+            raise HttpError(400, 'Invalid request')
+        invitation = self.invitations.get(data['invitationId'])
+        if not invitation or invitation['status'] != 'PENDING' or invitation['email'] != user['email']:
+            raise HttpError(404, 'Invitation not found or has expired')
+        for item in self.inbox:
+            if item['userId'] == user['id'] and item['data'].get('invitationId') == invitation['id']:
+                item['status'] = 'ARCHIVED'
+        if data['action'] == 'reject':
+            invitation['status'] = 'DECLINED'
+            return {'message': 'Invitation rejected'}
+        invitation['status'] = 'ACCEPTED'
+        project = self.projects[invitation['projectId']]
+        member = {'id': new_id(), 'role': invitation['role'], 'userId': user['id'], 'projectId': project['id'],
+                  'joinedAt': _iso(_now())}
+        self.members[member['id']] = member
+        self.log('MEMBER_JOINED', f'joined the project "{project["name"]}" after accepting an invitation',
+                 user, project['id'])
+        return {'message': 'Invitation accepted successfully!'}
+
+    def member_for(self, request, pid, mid):
+        user = self.current_user(request)
+        self.project_for(user, pid, admin=True, message='Project not found or insufficient permissions')
+        member = self.members.get(mid)
+        if not member or member['projectId'] != pid:
+            raise HttpError(404, 'Member not found')
+        return user, member
+
+    def update_member(self, request, pid, mid):
+        user, member = self.member_for(request, pid, mid)
+        role = request.json().get('role')
+        if role not in ('MEMBER', 'ADMIN'):
+            raise HttpError(400, 'Invalid role')
+        member['role'] = role
+        name = self.users[member['userId']]['name']
+        self.log('MEMBER_UPDATED', f"changed {name}'s role to {role.lower()}", user, pid)
+        return {'member': dict(member, user=self.brief(member['userId'], email=True))}
+
+    def remove_member(self, request, pid, mid):
+        user, member = self.member_for(request, pid, mid)
+        if member['role'] == 'OWNER':
+            raise HttpError(400, 'Cannot remove the project owner')
+        del self.members[mid]
+        self.log('MEMBER_REMOVED', f"removed {self.users[member['userId']]['name']} from the project", user, pid)
+        return {'message': 'Member removed successfully'}
+
+    # Activity, inbox and notifications
+
+    def activity_view(self, activity):
+        project = self.projects.get(activity['projectId'])
+        return dict(activity, user=self.brief(activity['userId']),
+                    project={'id': project['id'], 'name': project['name'], 'color': project['color']}
+                    if project else None)
+
+    def feed(self, project_ids, limit):
+        found = []
+        for activity in reversed(self.activities):
+            if activity['projectId'] in project_ids:
+                found.append(self.activity_view(activity))
+                if len(found) == limit:
+                    break
+        return found
+
+    def list_activity(self, request):
+        user = self.current_user(request)
+        if request.query.get('projectId'):
+            project = self.project_for(user, request.query['projectId'],
+                                       message='Project not found or access denied')
+            return {'activities': self.feed({project['id']}, 20)}
+        return {'activities': self.feed({p['id'] for p in self.user_projects(user)}, 20)}
+
+    def recent_activities(self, request):
+        user = self.current_user(request)
+        return {'activities': self.feed({p['id'] for p in self.user_projects(user)}, 10)}
+
+    def notify(self, user_id, type, title, message, data):
+        now = _iso(_now())
+        item = {'id': new_id(), 'type': type, 'title': title, 'message': message, 'status': 'ACTIVE',
+                'userId': user_id, 'data': data, 'createdAt': now}
+        notification = {'id': new_id(), 'type': type, 'title': title, 'message': message, 'isRead': False,
+                        'userId': user_id, 'data': data, 'createdAt': now}
+        self.inbox.append(item)
+        self.notifications.append(notification)
+        return notification, item
+
+    def inbox_stats(self, user):
+        items = [i for i in self.inbox if i['userId'] == user['id']]
+        unread = [i for i in items if i['status'] == 'ACTIVE' and (i['id'], user['id']) not in self.inbox_reads]
+        return {'total': len(items), 'unread': len(unread),
+                'active': sum(1 for i in items if i['status'] == 'ACTIVE'),
+                'archived': sum(1 for i in items if i['status'] == 'ARCHIVED')}
+
+    def list_inbox(self, request):
+        user = self.current_user(request)
+        status = {'active': ('ACTIVE',), 'archived': ('ARCHIVED',)}.get(request.query.get('filter', 'active'),
+                                                                          ('ACTIVE', 'ARCHIVED'))
+        limit = int(request.query.get('limit') or 50)
+        items = [dict(i, isRead=(i['id'], user['id']) in self.inbox_reads) for i in reversed(self.inbox)
+                 if i['userId'] == user['id'] and i['status'] in status
+                 and request.query.get('type') in (None, i['type'])][:limit]
+        return {'items': items, 'stats': self.inbox_stats(user),
+                'pagination': {'total': len(items), 'limit': limit, 'hasMore': len(items) == limit}}
+
+    def update_inbox(self, request):
+        user = self.current_user(request)
+        data = request.json()
+        action, ids = data.get('action'), set(data.get('ids') or [])
+        mine = [i for i in self.inbox if i['userId'] == user['id']]
+        if action == 'bulk_action':
+            options = data.get('options') or {}
+            targets = [i for i in mine if i['id'] in ids] if ids else [i for i in mine if i['status'] == 'ACTIVE']
+            action = 'mark_read' if options.get('readAction', True) else 'mark_unread'
+        else:
+            targets = [i for i in mine if i['id'] in ids]
+        if action == 'mark_read':
+            self.inbox_reads.update((i['id'], user['id']) for i in targets)
+        elif action == 'mark_unread':
+            self.inbox_reads.difference_update((i['id'], user['id']) for i in targets)
+        elif action in ('archive', 'unarchive'):
+            for item in targets:
+                item['status'] = 'ARCHIVED' if action == 'archive' else 'ACTIVE'
+        elif action == 'delete':
+            self.inbox = [i for i in self.inbox if i not in targets]
+        else:
+            raise HttpError(400, 'Invalid action')
+        return {'success': True, 'updated': len(targets)}
+
+    def unread_count(self, request):
+        return {'count': self.inbox_stats(self.current_user(request))['unread']}
+
+    def list_notifications(self, request):
+        user = self.current_user(request)
+        limit, offset = int(request.query.get('limit') or 50), int(request.query.get('offset') or 0)
+        mine = [n for n in reversed(self.notifications) if n['userId'] == user['id']]
+        if request.query.get('unread_only') == 'true':
+            mine = [n for n in mine if not n['isRead']]
+        page = mine[offset:offset + limit]
+        return {'notifications': page, 'unreadCount': sum(1 for n in mine if not n['isRead']),
+                'totalCount': len(mine),
+                'pagination': {'limit': limit, 'offset': offset, 'hasMore': len(page) == limit}}
+
+    def update_notifications(self, request):
+        user = self.current_user(request)
+        data = request.json()
+        action, ids = data.get('action'), data.get('notificationIds')
+        mine = [n for n in self.notifications if n['userId'] == user['id']]
+        if action == 'mark_all_read':
+            ids = [n['id'] for n in mine if not n['isRead']]
+        elif action not in ('mark_read', 'mark_unread'):
+            raise HttpError(400, 'Invalid action')
+        elif not isinstance(ids, list):
+            raise HttpError(400, 'Invalid notification IDs')
+        for notification in mine:
+            if notification['id'] in ids:
+                notification['isRead'] = action != 'mark_unread'
+        if action == 'mark_unread':
+            return {'success': True, 'markedAsUnread': len(ids)}
+        return {'success': True, 'markedAsRead': len(ids)}
+
+    def trigger_notification(self, request):
+        user = self.current_user(request)
+        if request.json().get('type') != 'test_notification':
+            raise HttpError(400, 'Invalid notification type')
+        notification, item = self.notify(user['id'], 'PROJECT_UPDATED', 'Test Notification',
+                                         'This is a test notification to verify the system is working correctly.',
+                                         {'isTest': True, 'createdBy': user['id']})
+        return {'success': True, 'notification': notification, 'inboxItem': item,
+                'message': 'test notification notification created successfully'}
+
+    # Dashboard and search
+
+    def dashboard_stats(self, request):
+        user = self.current_user(request)
+        ids = {p['id'] for p in self.user_projects(user)}
+        tasks = [t for t in self.tasks.values() if t['projectId'] in ids]
+        now = _iso(_now())
+        return {'totalProjects': len(ids), 'totalTasks': len(tasks),
+                'completedTasks': sum(1 for t in tasks if t['status'] == 'DONE'),
+                'overdueTasks': sum(1 for t in tasks if t['dueDate'] and t['dueDate'] < now and t['status'] != 'DONE')}
+
+    def recent_tasks(self, request):
+        user = self.current_user(request)
+        tasks = [t for t in self.tasks.values() if user['id'] in (t['assigneeId'], t['creatorId'])]
+        return {'tasks': [self.task_view(t) for t in sorted(tasks, key=lambda t: t['updatedAt'], reverse=True)[:5]]}
+
+    def recent_projects(self, request):
+        user = self.current_user(request)
+        projects = sorted(self.user_projects(user), key=lambda p: p['updatedAt'], reverse=True)[:5]
+        return {'projects': [self.project_view(p) for p in projects]}
+
+    def search(self, request):
+        user = self.current_user(request)
+        q = request.query.get('q', '').strip().lower()
+        if len(q) < 2:
+            return Response(200, [])
+        projects = self.user_projects(user)
+        ids = {p['id'] for p in projects}
+        found = [{'id': p['id'], 'type': 'project', 'title': p['name'], 'description': p['description'],
+                  'color': p['color']} for p in projects if q in p['name'].lower()][:5]
+        found += [{'id': t['id'], 'type': 'task', 'title': t['title'], 'description': t['description'],
+                   'projectId': t['projectId'], 'status': t['status'], 'priority': t['priority']}
+                  for t in self.tasks.values()
+                  if t['projectId'] in ids and q in (t['title'] + ' ' + (t['description'] or '')).lower()][:5]
+        found += [{'id': u['id'], 'type': 'user', 'name': u['name'], 'title': u['name'], 'description': u['email'],
+                   'image': None} for u in self.users.values() if q in u['name'].lower()][:5]
+        return Response(200, found)
+
+
+# Socket.IO (Engine.IO v4 long-polling) ------------------------------------
+
+class _EioSession:
+    def __init__(self, sid):
+        self.sid = sid
+        self.queue = asyncio.Queue()
+        self.polling = False
+        self.pong = True
+        self.closed = False
+        self.user_id = None
+        self.workspace_id = None
+        self.ping_task = None
+
+
+class StandinSockets:
+    """The websocket-server.js events, over Engine.IO polling (no websocket upgrade is offered)"""
+
+    def __init__(self, ping_interval=PING_INTERVAL, ping_timeout=PING_TIMEOUT):
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.sessions = {}
+        self.user_sockets = {}  # user id -> set of sids
+        self.rooms = {}  # workspace id -> set of sids
+        self.locks = {}  # workspace id -> {'userId', 'sid', 'timer'}
+        self.loop = None
+
+    async def handle(self, request):
+        if request.query.get('transport') != 'polling':
+            return Response(400, {'code': 3, 'message': 'Bad request'})
+        sid = request.query.get('sid')
+        if not sid:
+            return self.open()
+        session = self.sessions.get(sid)
+        if not session:
+            return Response(400, {'code': 1, 'message': 'Session ID unknown'})
+        if request.method == 'POST':
+            for packet in request.body.decode('utf-8').split('\x1e'):
+                self.receive(session, packet)
+            return Response(200, text='ok', content_type='text/plain; charset=UTF-8')
+        if session.polling:
+            self.close(session, 'multiple polls')
+            return Response(400, {'code': 3, 'message': 'Bad request'})
+        session.polling = True
+        try:
+            packets = [await session.queue.get()]
+            while not session.queue.empty():
+                packets.append(session.queue.get_nowait())
+        finally:
+            session.polling = False
+        return Response(200, text='\x1e'.join(packets), content_type='text/plain; charset=UTF-8')
+
+    def open(self):
+        self.loop = asyncio.get_running_loop()
+        session = _EioSession(secrets.token_urlsafe(15))
+        self.sessions[session.sid] = session
+        session.ping_task = self.loop.create_task(self._ping(session))
+        handshake = {'sid': session.sid, 'upgrades': [], 'pingInterval': int(self.ping_interval * 1000),
+                     'pingTimeout': int(self.ping_timeout * 1000), 'maxPayload': 1000000}
+        return Response(200, text='0' + json.dumps(handshake), content_type='text/plain; charset=UTF-8')
+
+    async def _ping(self, session):
+        while not session.closed:
+            await asyncio.sleep(self.ping_interval)
+            if session.closed:
+                return
+            session.pong = False
+            session.queue.put_nowait('2')
+            await asyncio.sleep(self.ping_timeout)
+            if not session.pong:
+                self.close(session, 'ping timeout')
+
+    def close(self, session, reason):
+        if session.closed:
+            return
+        session.closed = True
+        session.queue.put_nowait('1')  # wakes a pending poll with a close packet
+        self.sessions.pop(session.sid, None)
+        if session.ping_task and session.ping_task is not asyncio.current_task():
+            session.ping_task.cancel()
+        self.on_disconnect(session)
+
+    def receive(self, session, packet):
+        if packet == '3':
+            session.pong = True
+        elif packet == '1':
+            self.close(session, 'client close')
+        elif packet.startswith('40'):
+            session.queue.put_nowait('40' + json.dumps({'sid': session.sid}))
+        elif packet.startswith('41'):
+            self.close(session, 'namespace disconnect')
+        elif packet.startswith('42'):
+            try:
+                event, *args = json.loads(packet[2:])
+            except ValueError:
+                return
+            handler = getattr(self, 'on_' + event.replace('-', '_'), None)
+            if handler:
+                handler(session, args[0] if args and isinstance(args[0], dict) else {})
+
+    def emit(self, sids, event, data):
+        packet = '42' + json.dumps([event, data])
+        for sid in list(sids):
+            session = self.sessions.get(sid)
+            if session:
+                session.queue.put_nowait(packet)
+
+    def others(self, session, workspace_id):
+        return self.rooms.get(workspace_id, set()) - {session.sid}
+
+    # websocket-server.js handlers
+
+    def on_user_connect(self, session, data):
+        if data.get('userId'):
+            session.user_id = data['userId']
+            self.user_sockets.setdefault(session.user_id, set()).add(session.sid)
+
+    def on_user_notification(self, session, data):
+        self.emit(self.user_sockets.get(data.get('userId'), ()), 'notification-received', {
+            'notification': data.get('notification'), 'inboxItem': data.get('inboxItem'),
+            'type': data.get('type'), 'timestamp': _iso(_now())})
+
+    def on_notifications_read(self, session, data):
+        self.emit(self.user_sockets.get(data.get('userId'), ()), 'notifications-read-update', {
+            'notificationIds': data.get('notificationIds'), 'timestamp': _iso(_now())})
+
+    def on_join_workspace(self, session, data):
+        workspace_id = data.get('workspaceId')
+        self.rooms.setdefault(workspace_id, set()).add(session.sid)
+        session.workspace_id = workspace_id
+        session.user_id = data.get('userId')
+        self.emit(self.others(session, workspace_id), 'user-joined', {'userId': session.user_id,
+                                                                      'socketId': session.sid})
+
+    def on_workspace_update(self, session, data):
+        workspace_id = data.get('workspaceId')
+        if session.workspace_id != workspace_id:
+            self.emit([session.sid], 'error', {'message': 'Not authorized for this workspace'})
+            return
+        lock = self.locks.get(workspace_id)
+        if not lock or (lock['userId'] != data.get('userId') and lock['sid'] != session.sid):
+            self.emit([session.sid], 'error', {'message': 'Edit lock required to make changes'})
+            return
+        timestamp = _iso(_now())
+        self.emit(self.others(session, workspace_id), 'workspace-updated', {
+            'elements': data.get('elements'), 'appState': data.get('appState'), 'userId': data.get('userId'),
+            'timestamp': timestamp, 'schemaVersion': '1.0.0'})
+        self.emit([session.sid], 'update-confirmed', {'timestamp': timestamp, 'schemaVersion': '1.0.0'})
+
+    def on_request_edit_lock(self, session, data):
+        workspace_id = data.get('workspaceId')
+        if session.workspace_id != workspace_id:
+            self.emit([session.sid], 'edit-lock-denied', {'error': 'Not authorized for this workspace'})
+            return
+        lock = self.locks.get(workspace_id)
+        if lock:
+            self.emit([session.sid], 'edit-lock-denied', {'currentEditor': lock['userId'],
+                                                          'currentEditorSocketId': lock['sid']})
+            return
+
+        def expire():
+            self.locks.pop(workspace_id, None)
+            self.emit(self.rooms.get(workspace_id, ()), 'edit-lock-released', {'reason': 'timeout'})
+
+        self.locks[workspace_id] = {'userId': data.get('userId'), 'sid': session.sid,
+                                    'timer': self.loop.call_later(LOCK_TIMEOUT, expire)}
+        self.emit(self.rooms.get(workspace_id, ()), 'edit-lock-granted', {'userId': data.get('userId'),
+                                                                          'socketId': session.sid})
+
+    def on_release_edit_lock(self, session, data):
+        workspace_id = data.get('workspaceId')
+        lock = self.locks.get(workspace_id)
+        if not lock or (lock['userId'] != data.get('userId') and lock['sid'] != session.sid):
+            self.emit([session.sid], 'error', {'message': 'Cannot release lock - not the current editor'})
+            return
+        lock['timer'].cancel()
+        del self.locks[workspace_id]
+        self.emit(self.rooms.get(workspace_id, ()), 'edit-lock-released', {'previousEditor': data.get('userId'),
+                                                                           'reason': 'manual'})
+
+    def on_pointer_update(self, session, data):
+        if session.workspace_id == data.get('workspaceId'):
+            fields = ('userId', 'pointer', 'button', 'username', 'color', 'timestamp')
+            self.emit(self.others(session, session.workspace_id), 'pointer-updated',
+                      dict({k: data.get(k) for k in fields}, socketId=session.sid))
+
+    def on_cursor_update(self, session, data):
+        if session.workspace_id == data.get('workspaceId'):
+            self.emit(self.others(session, session.workspace_id), 'cursor-updated', {
+                'userId': data.get('userId'), 'cursor': data.get('cursor'), 'socketId': session.sid})
+
+    def on_disconnect(self, session):
+        if session.user_id in self.user_sockets:
+            self.user_sockets[session.user_id].discard(session.sid)
+            if not self.user_sockets[session.user_id]:
+                del self.user_sockets[session.user_id]
+        if session.workspace_id is not None:
+            room = self.rooms.get(session.workspace_id, set())
+            room.discard(session.sid)
+            lock = self.locks.get(session.workspace_id)
+            if lock and lock['sid'] == session.sid:
+                lock['timer'].cancel()
+                del self.locks[session.workspace_id]
+                self.emit(room, 'edit-lock-released', {'previousEditor': session.user_id, 'reason': 'disconnect'})
+            self.emit(room, 'user-left', {'userId': session.user_id, 'socketId': session.sid})
+
+
+# HTTP server -----------------------------------------------------------
+
+class StandinServer:
+    """HTTP/1.1 keep-alive server; /socket.io/ goes to the sockets, the rest to the API, on either port"""
+
+    def __init__(self, host='127.0.0.1', port=APP_PORT, ws_port=WS_PORT):
+        self.host = host
+        self.ports = [p for p in (port, ws_port) if p]
+        self.sockets = StandinSockets()
+        self.api = StandinApi()
+        self.requests = 0
+
+    async def dispatch(self, request):
+        self.requests += 1
+        if request.path.startswith('/socket.io'):
+            return await self.sockets.handle(request)
+        if request.path.startswith('/api'):
+            return self.api.handle(request)
+        return Response(404, {'error': 'Not found'})
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                method, target, version = line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length') or 0))
+                try:
+                    response = await self.dispatch(Request(method, target, headers, body))
+                except Exception as e:  # keep serving; the client sees what a crashed route returns
+                    print(f"❌ {method} {target}: {type(e).__name__}: {e}", file=sys.stderr)
+                    response = Response(500, {'error': 'Internal server error'})
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                head = [f"HTTP/1.1 {response.status} {HTTPStatus(response.status).phrase}",
+                        f"Content-Type: {response.content_type}",
+                        f"Content-Length: {len(response.body)}",
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+                head += [f"Set-Cookie: {cookie}" for cookie in response.cookies]
+                writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + response.body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, ready=None):
+        servers = [await asyncio.start_server(self.serve_connection, self.host, port) for port in self.ports]
+        if ready:
+            ready.set()
+        await asyncio.gather(*(s.serve_forever() for s in servers))
+
+
+def serve(args):
+    server = StandinServer(args.host, args.port, args.ws_port)
+    print(f"🚀 Stand-in API on http://{args.host}:{args.port}/api, Socket.IO on :{args.ws_port}", flush=True)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def calibrate(args):
+    from .client import ApiClient
+    from .results import RunRecorder
+    from .servers import free_port, standin_server
+    from .stats import format_ms, summarize
+
+    port = args.port or free_port()
+    recorder = RunRecorder('calibration')
+    base_url = f"http://127.0.0.1:{port}/api"
+    print("=" * 80)
+    print("HARNESS CALIBRATION AGAINST THE IN-MEMORY STAND-IN")
+    print("=" * 80)
+    levels = []
+    with standin_server(port=port, ws_port=free_port(), log_path=recorder.artifact_path('standin.log')):
+        clients = []
+        for i in range(max(args.concurrency)):
+            client = ApiClient(base_url, recorder=recorder)
+            client.register_and_login(f"Calibration {i}", f"calibration.{i}.{secrets.token_hex(4)}@example.com")
+            clients.append(client)
+        print(f"{'workers':>8} {'requests':>9} {'rps':>9} {'p50':>9} {'p99':>9} {'max':>9}")
+        for concurrency in args.concurrency:
+            timings = [[] for _ in range(concurrency)]
+            deadline = time.perf_counter() + args.duration
+
+            def worker(index):
+                client = clients[index]
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    client.get(args.endpoint)
+                    timings[index].append((time.perf_counter() - start) * 1000)
+
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+            latencies = [ms for per_worker in timings for ms in per_worker]
+            level = {'concurrency': concurrency, 'rps': len(latencies) / elapsed, **summarize(latencies)}
+            levels.append(level)
+            print(f"{concurrency:>8} {level['count']:>9} {level['rps']:>9.0f} {format_ms(level.get('p50')):>9} "
+                  f"{format_ms(level.get('p99')):>9} {format_ms(level.get('max')):>9}")
+
+    best = max(levels, key=lambda level: level['rps'])
+    floor = min(level['p50'] for level in levels if level['count'])
+    recorder.add_section('calibration', {'endpoint': args.endpoint, 'durationSec': args.duration, 'levels': levels,
+                                         'maxRps': best['rps'], 'latencyFloorMs': floor})
+    print(f"\n📊 Harness ceiling ~{best['rps']:.0f} rps at {best['concurrency']} workers, "
+          f"latency floor {format_ms(floor)} (GET {args.endpoint})")
+    print("   App runs approaching these numbers are limited by the load generator, not the app.")
+    print(f"\n💾 Results: {recorder.save()}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = sub.add_parser('serve', help="run the stand-in until interrupted")
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=APP_PORT)
+    serve_parser.add_argument('--ws-port', type=int, default=WS_PORT)
+
+    calibrate_parser = sub.add_parser('calibrate', help="measure the harness's own ceiling against a stand-in")
+    calibrate_parser.add_argument('--port', type=int, default=None, help="stand-in port (default: a free one)")
+    calibrate_parser.add_argument('--concurrency', type=lambda v: [int(x) for x in v.split(',')],
+                                  default=[1, 4, 16, 64], help="closed-loop worker threads per level")
+    calibrate_parser.add_argument('--duration', type=float, default=5.0, help="seconds per level")
+    calibrate_parser.add_argument('--endpoint', default='/dashboard/stats')
+    args = parser.parse_args(argv)
+
+    return serve(args) if args.command == 'serve' else calibrate(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
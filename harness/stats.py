@@ -0,0 +1,72 @@
+"""
+Small statistics helpers shared by the benchmarks
+"""
+
+import math
+
+
+def percentile(values, pct):
+    """Return the pct-th percentile (0-100) using linear interpolation"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (pct / 100.0) * (len(ordered) - 1)
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values):
+    """Summarize a list of latencies (ms) into count/min/mean/p50/p90/p99/max"""
+    if not values:
+        return {'count': 0}
+    return {
+        'count': len(values),
+        'min': min(values),
+        'mean': sum(values) / len(values),
+        'p50': percentile(values, 50),
+        'p90': percentile(values, 90),
+        'p99': percentile(values, 99),
+        'max': max(values),
+    }
+
+
+def format_ms(value):
+    """Format a millisecond value for the console tables"""
+    if value is None:
+        return "-"
+    if value >= 1000:
+        return f"{value / 1000:.2f}s"
+    return f"{value:.1f}ms"
+
+
+def mann_whitney(a, b):
+    """Two-sided Mann-Whitney U test (normal approximation, tie corrected); returns the p-value
+
+    Latency samples are skewed and heavy tailed, so ranks are compared
+    rather than means. None when either side has fewer than 8 values.
+    """
+    if len(a) < 8 or len(b) < 8:
+        return None
+    ranked = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    rank_sum_a, ties, i = 0.0, 0.0, 0
+    while i < len(ranked):
+        j = i
+        while j + 1 < len(ranked) and ranked[j + 1][0] == ranked[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        rank_sum_a += rank * sum(1 for k in range(i, j + 1) if ranked[k][1] == 0)
+        ties += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+    n1, n2 = len(a), len(b)
+    n = n1 + n2
+    u = rank_sum_a - n1 * (n1 + 1) / 2
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1))))
+    if sigma == 0:
+        return 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / sigma
+    return min(1.0, math.erfc(max(z, 0) / math.sqrt(2)))
@@ -0,0 +1,264 @@
+"""
+Reusable user actions for scenarios
+
+Each step is a function taking a VirtualUser plus keyword params from the
+scenario file and returning True on success. Steps are registered by name
+so scenario files can compose them:
+
+    {"step": "inbox_list", "params": {"filter": "archived"}}
+
+Steps named ``tester:<method>`` run a method of the backend testers
+(``EnhancedProjectManagementAPITester`` by default) with the virtual
+user's session, so the existing test flows can be mixed into a journey.
+"""
+
+import importlib
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+from .capture import TESTERS
+from .client import ApiClient
+from .config import REPO_ROOT
+
+STEPS = {}
+
+TASK_STATUSES = ['TODO', 'IN_PROGRESS', 'IN_REVIEW', 'DONE']
+PRIORITIES = ['LOW', 'MEDIUM', 'HIGH', 'URGENT']
+
+
+def step(name):
+    """Register a step function under a scenario name"""
+    def register(func):
+        STEPS[name] = func
+        return func
+    return register
+
+
+class VirtualUser:
+    """One simulated user: a signed-in client plus the ids it has created"""
+
+    def __init__(self, index, base_url, recorder=None, namespace='vu'):
+        self.index = index
+        self.namespace = namespace
+        self.client = ApiClient(base_url, recorder=recorder)
+        self.projects = []
+        self.tasks = []
+        self.invitations = []
+        self.testers = {}
+        self.rng = random.Random(f"{namespace}-{index}")
+
+    def sign_up(self):
+        email = f"{self.namespace}.u{self.index:05d}.{uuid.uuid4().hex[:8]}@example.com"
+        return self.client.register_and_login(f"Virtual User {self.index}", email)
+
+    def pick_project(self):
+        return self.rng.choice(self.projects) if self.projects else None
+
+    def pick_task(self):
+        return self.rng.choice(self.tasks) if self.tasks else None
+
+
+def run_step(vu, name, params=None):
+    """Run a registered step; unknown names raise KeyError"""
+    if name.startswith('tester:'):
+        return run_tester_step(vu, name.split(':', 1)[1], **(params or {}))
+    return STEPS[name](vu, **(params or {}))
+
+
+def ok(response):
+    return 200 <= response.status_code < 300
+
+
+# Reads ---------------------------------------------------------------
+
+@step('dashboard_stats')
+def dashboard_stats(vu):
+    return ok(vu.client.get("/dashboard/stats"))
+
+
+@step('dashboard_recent')
+def dashboard_recent(vu):
+    results = [
+        vu.client.get("/dashboard/recent-projects"),
+        vu.client.get("/dashboard/recent-tasks"),
+        vu.client.get("/dashboard/recent-activities"),
+    ]
+    return all(ok(r) for r in results)
+
+
+@step('inbox_list')
+def inbox_list(vu, filter='active', type=None, limit=50):
+    params = {'filter': filter, 'limit': limit}
+    if type:
+        params['type'] = type
+    return ok(vu.client.get("/inbox", params=params))
+
+
+@step('inbox_unread_count')
+def inbox_unread_count(vu):
+    return ok(vu.client.get("/inbox/unread-count"))
+
+
+@step('inbox_mark_all_read')
+def inbox_mark_all_read(vu):
+    return ok(vu.client.patch("/inbox", json={
+        'action': 'bulk_action', 'ids': [], 'options': {'readAction': True}
+    }))
+
+
+@step('notifications_list')
+def notifications_list(vu):
+    return ok(vu.client.get("/notifications"))
+
+
+@step('my_tasks')
+def my_tasks(vu):
+    return ok(vu.client.get("/my-tasks"))
+
+
+@step('activity_feed')
+def activity_feed(vu, scope='all'):
+    params = {}
+    if scope == 'project' and vu.projects:
+        params['projectId'] = vu.pick_project()
+    return ok(vu.client.get("/activity", params=params))
+
+
+@step('list_projects')
+def list_projects(vu):
+    return ok(vu.client.get("/projects"))
+
+
+@step('project_detail')
+def project_detail(vu):
+    project_id = vu.pick_project()
+    if not project_id:
+        return False
+    return ok(vu.client.get(f"/projects/{project_id}"))
+
+
+@step('project_tasks')
+def project_tasks(vu):
+    project_id = vu.pick_project()
+    if not project_id:
+        return False
+    return ok(vu.client.get(f"/projects/{project_id}/tasks"))
+
+
+@step('task_detail')
+def task_detail(vu):
+    task_id = vu.pick_task()
+    if not task_id:
+        return False
+    return ok(vu.client.get(f"/tasks/{task_id}"))
+
+
+@step('search')
+def search(vu, q='task'):
+    return ok(vu.client.get("/search", params={'q': q}))
+
+
+# Writes --------------------------------------------------------------
+
+@step('create_project')
+def create_project(vu, name=None):
+    response = vu.client.post("/projects", json={
+        'name': name or f"Load Project {vu.index}-{len(vu.projects) + 1}",
+        'description': "Created by the performance harness",
+    })
+    if not ok(response):
+        return False
+    vu.projects.append(response.json()['project']['id'])
+    return True
+
+
+@step('create_task')
+def create_task(vu, due_in_days=None):
+    project_id = vu.pick_project()
+    if not project_id:
+        return False
+    payload = {
+        'title': f"Load task {vu.index}-{len(vu.tasks) + 1}",
+        'description': "Created by the performance harness",
+        'priority': vu.rng.choice(PRIORITIES),
+        'assigneeId': (vu.client.user or {}).get('id'),
+    }
+    if due_in_days is not None:
+        payload['dueDate'] = (datetime.now() + timedelta(days=due_in_days)).isoformat()
+    response = vu.client.post(f"/projects/{project_id}/tasks", json=payload)
+    if not ok(response):
+        return False
+    vu.tasks.append(response.json()['task']['id'])
+    return True
+
+
+@step('update_task')
+def update_task(vu, status=None, priority=None):
+    task_id = vu.pick_task()
+    if not task_id:
+        return False
+    return ok(vu.client.patch(f"/tasks/{task_id}", json={
+        'status': status or vu.rng.choice(TASK_STATUSES),
+        'priority': priority or vu.rng.choice(PRIORITIES),
+    }))
+
+
+@step('comment_task')
+def comment_task(vu, content="Looks good, moving this forward."):
+    """Tester contract (POST /tasks/{id}/comments); the app has no comments route yet, so every call
+    fails and the bundled scenarios leave it out"""
+    task_id = vu.pick_task()
+    if not task_id:
+        return False
+    return ok(vu.client.post(f"/tasks/{task_id}/comments", json={
+        'content': content, 'userId': (vu.client.user or {}).get('id')
+    }, endpoint="POST /tasks/{id}/comments"))
+
+
+@step('invite_member')
+def invite_member(vu, role='MEMBER'):
+    project_id = vu.pick_project()
+    if not project_id:
+        return False
+    response = vu.client.post(f"/projects/{project_id}/invite", json={
+        'email': f"invitee.{uuid.uuid4().hex[:10]}@example.com", 'role': role
+    })
+    if ok(response):
+        vu.invitations.append(response.json()['invitation']['id'])
+    return ok(response)
+
+
+@step('list_invitations')
+def list_invitations(vu):
+    project_id = vu.pick_project()
+    params = {'projectId': project_id} if project_id else {}
+    return ok(vu.client.get("/invitations", params=params))
+
+
+@step('update_project')
+def update_project(vu):
+    project_id = vu.pick_project()
+    if not project_id:
+        return False
+    return ok(vu.client.patch(f"/projects/{project_id}", json={
+        'description': f"Updated by the harness at {datetime.now().isoformat()}"
+    }))
+
+
+# Backend tester methods -------------------------------------------------
+
+def run_tester_step(vu, method, module='enhanced_backend_test'):
+    """Run one tester method with the virtual user's session, silently"""
+    tester = vu.testers.get(module)
+    if tester is None:
+        if REPO_ROOT not in sys.path:
+            sys.path.insert(0, REPO_ROOT)
+        tester_class = getattr(importlib.import_module(module), TESTERS[module][0])
+        tester = tester_class()
+        tester.base_url = vu.client.base_url
+        tester.session = vu.client.session
+        tester.log_result = lambda *args, **kwargs: None
+        vu.testers[module] = tester
+    return bool(getattr(tester, method)())
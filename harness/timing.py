@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Client-side network timing per request
+
+ApiClient mounts TimingAdapter on its session, so every sample carries
+the phases requests normally hides:
+
+    queueMs     waiting for a free pooled connection
+    connectMs   DNS + TCP connect (0 when a kept-alive connection was reused)
+    tlsMs       TLS handshake (https only)
+    sendMs      writing the request line, headers and body
+    ttfbMs      request sent -> response headers received
+    downloadMs  response headers -> body fully read
+    reused      whether the pooled connection was reused
+
+Report a stored run per endpoint, or probe endpoints with sequential
+requests on one session to check that keep-alive works end to end
+(through nginx, a load balancer or the Next.js server itself):
+
+    python -m harness.timing report bench_runs/<run-id>
+    python -m harness.timing probe --endpoint /projects --endpoint /inbox --requests 50
+"""
+
+import argparse
+import sys
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .config import BASE_URL
+from .results import RunRecorder, load_run
+from .stats import format_ms, percentile
+
+PHASES = ['queueMs', 'connectMs', 'tlsMs', 'sendMs', 'ttfbMs', 'downloadMs']
+
+
+class _TimedConnectionMixin:
+    """Times connect/send/first byte on the connection; the pool resets it per request"""
+
+    def reset_timing(self, queue_ms):
+        self.timing = {'queueMs': queue_ms, 'connectMs': 0.0, 'tlsMs': 0.0}
+        self._connected_in_request = False
+
+    def _new_conn(self):
+        if not hasattr(self, 'timing'):
+            self.reset_timing(0.0)
+        start = time.perf_counter()
+        sock = super()._new_conn()
+        self.timing['connectMs'] = (time.perf_counter() - start) * 1000
+        return sock
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        self._connected_in_request = True
+        # Whatever connect() spent beyond the TCP socket is the TLS handshake
+        self.timing['tlsMs'] = max((time.perf_counter() - start) * 1000 - self.timing['connectMs'], 0.0)
+
+    def request(self, *args, **kwargs):
+        start = time.perf_counter()
+        super().request(*args, **kwargs)
+        self._sent_at = time.perf_counter()
+        elapsed = (self._sent_at - start) * 1000
+        if self._connected_in_request:
+            elapsed -= self.timing['connectMs'] + self.timing['tlsMs']
+        self.timing['sendMs'] = max(elapsed, 0.0)
+
+    def getresponse(self):
+        response = super().getresponse()
+        headers_at = time.perf_counter()
+        self.timing['ttfbMs'] = (headers_at - self._sent_at) * 1000
+        self.timing['reused'] = not self._connected_in_request
+        self.timing['connectionClose'] = response.headers.get('Connection', '').lower() == 'close'
+        response.harness_timing = dict(self.timing, headersAt=headers_at)
+        return response
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedPoolMixin:
+    def _get_conn(self, timeout=None):
+        start = time.perf_counter()
+        conn = super()._get_conn(timeout)
+        conn.reset_timing((time.perf_counter() - start) * 1000)
+        return conn
+
+
+class TimedHTTPConnectionPool(_TimedPoolMixin, HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(_TimedPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimingAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools hand out timed connections"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+
+
+def install(session):
+    adapter = TimingAdapter()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def response_timing(response, finished_at):
+    """Phase timings for a completed requests.Response (None if it was not timed)"""
+    timing = getattr(response.raw, 'harness_timing', None)
+    if timing is None:
+        return None
+    timing = dict(timing)
+    timing['downloadMs'] = max((finished_at - timing.pop('headersAt')) * 1000, 0.0)
+    return timing
+
+
+def network_summary(samples):
+    """Per endpoint: p50/p99 for each phase, connection reuse and Connection: close counts"""
+    grouped = {}
+    for sample in samples:
+        if 'ttfbMs' in sample:
+            grouped.setdefault(sample['endpoint'], []).append(sample)
+    summary = {}
+    for endpoint, items in sorted(grouped.items()):
+        entry = {'requests': len(items),
+                 'reuseRatio': sum(1 for s in items if s['reused']) / len(items),
+                 'newConnections': sum(1 for s in items if not s['reused']),
+                 'connectionClose': sum(1 for s in items if s.get('connectionClose'))}
+        for phase in PHASES:
+            values = [s[phase] for s in items]
+            entry[phase] = {'p50': percentile(values, 50), 'p99': percentile(values, 99)}
+        # Only requests that actually paid for a connection say anything about connect cost
+        connects = [s['connectMs'] + s['tlsMs'] for s in items if not s['reused']]
+        entry['newConnectionMs'] = {'p50': percentile(connects, 50), 'p99': percentile(connects, 99)}
+        summary[endpoint] = entry
+    return summary
+
+
+def print_summary(summary, reuse_warning=0.9):
+    print("=" * 80)
+    print("CLIENT NETWORK TIMING (p50 / p99 per phase)")
+    print("=" * 80)
+    print(f"{'endpoint':<30} {'reqs':>5} {'reuse':>6} " + ' '.join(f"{p[:-2]:>15}" for p in PHASES))
+    for endpoint, entry in summary.items():
+        phases = ' '.join(f"{format_ms(entry[p]['p50']):>7}/{format_ms(entry[p]['p99']):<7}" for p in PHASES)
+        print(f"{endpoint[:30]:<30} {entry['requests']:>5} {entry['reuseRatio']:>6.0%} {phases}")
+
+    suspicious = {e: s for e, s in summary.items() if s['requests'] > 1 and s['reuseRatio'] < reuse_warning}
+    if suspicious:
+        print()
+        for endpoint, entry in suspicious.items():
+            reason = (f"{entry['connectionClose']} responses sent Connection: close"
+                      if entry['connectionClose'] else "the server or a proxy closes idle connections")
+            print(f"🚨 {endpoint}: only {entry['reuseRatio']:.0%} of requests reused a connection "
+                  f"({entry['newConnections']} new, ~{format_ms(entry['newConnectionMs']['p50'])} each); {reason}")
+    elif summary:
+        print("\n✅ Keep-alive works: connections are reused")
+
+
+def probe(args):
+    from .client import ApiClient
+
+    recorder = RunRecorder('timing')
+    client = ApiClient(args.base_url, recorder=recorder)
+    if not args.anonymous:
+        client.register_and_login("Timing Probe")
+    for endpoint in args.endpoints:
+        for _ in range(args.requests):
+            client.get(endpoint)
+            if args.pause:
+                time.sleep(args.pause)
+    summary = network_summary(recorder.samples)
+    recorder.add_section('network', summary)
+    print_summary(summary)
+    print(f"\n💾 Results: {recorder.save()}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    report = sub.add_parser('report', help="network breakdown of a stored run")
+    report.add_argument('run', help="run directory or results.json")
+
+    probe_parser = sub.add_parser('probe', help="sequential requests on one session")
+    probe_parser.add_argument('--base-url', default=BASE_URL)
+    probe_parser.add_argument('--endpoint', dest='endpoints', action='append', default=None)
+    probe_parser.add_argument('--requests', type=int, default=30, help="requests per endpoint")
+    probe_parser.add_argument('--pause', type=float, default=0.0,
+                              help="idle seconds between requests (exposes short keep-alive timeouts)")
+    probe_parser.add_argument('--anonymous', action='store_true', help="skip sign-in")
+    args = parser.parse_args(argv)
+
+    if args.command == 'probe':
+        args.endpoints = args.endpoints or ["/projects", "/inbox", "/dashboard/stats"]
+        return probe(args)
+    print_summary(network_summary(load_run(args.run)['samples']))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Local OTLP collector stand-in and per-request server timing breakdown
+
+Every harness request carries a W3C traceparent and an X-Request-Id
+(harness.client.trace_headers) and the sample records both. Run the app
+with the tracing preload and this collector, and each request's spans can
+be joined back to the sample that sent it:
+
+    NODE_OPTIONS="--require ./harness/otel/register.js" npm start
+    python -m harness.tracing probe --endpoint /dashboard/stats --endpoint /inbox --requests 50
+
+`probe` starts the collector, signs in and fires the requests itself.
+To trace another tool's run, keep a collector running and report later:
+
+    python -m harness.tracing collect --out spans.jsonl
+    python -m harness.tracing report bench_runs/<run-id> --spans spans.jsonl
+
+The collector accepts OTLP/HTTP JSON on /v1/traces (and protobuf when
+opentelemetry-proto is installed). Each slow request is split into:
+
+    framework   HTTP server span minus the route handler span
+    auth        getServerSession; explicit spans when the app emits them,
+                otherwise handler start -> first Prisma query (every route
+                awaits the session first)
+    db          union of Prisma spans
+    serialize   explicit spans, otherwise last Prisma query -> handler end
+                (NextResponse.json and the response body)
+    other       the rest of the handler (JS between queries)
+"""
+
+import argparse
+import base64
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .client import ApiClient
+from .config import BASE_URL
+from .results import RunRecorder, load_run
+from .stats import format_ms, percentile, summarize
+
+OTLP_PORT = int(os.environ.get('HARNESS_OTLP_PORT', 4318))
+
+_HANDLER_RE = re.compile(r'runHandler|executing api route', re.I)
+_AUTH_RE = re.compile(r'getServerSession|auth', re.I)
+_SERIALIZE_RE = re.compile(r'serializ|NextResponse\.json', re.I)
+PHASES = ['framework', 'auth', 'db', 'serialize', 'other']
+
+
+def _attribute_value(value):
+    for key in ('stringValue', 'intValue', 'doubleValue', 'boolValue'):
+        if key in value:
+            return value[key]
+    return None
+
+
+def spans_from_json(payload):
+    """Flatten an OTLP/JSON ExportTraceServiceRequest"""
+    spans = []
+    for resource in payload.get('resourceSpans', []):
+        service = None
+        for attr in resource.get('resource', {}).get('attributes', []):
+            if attr['key'] == 'service.name':
+                service = _attribute_value(attr['value'])
+        for scope in resource.get('scopeSpans', []):
+            for span in scope.get('spans', []):
+                spans.append({
+                    'traceId': span['traceId'].lower(),
+                    'spanId': span['spanId'].lower(),
+                    'parentSpanId': (span.get('parentSpanId') or '').lower() or None,
+                    'name': span.get('name', ''),
+                    'kind': span.get('kind'),
+                    'start': int(span['startTimeUnixNano']) / 1e6,
+                    'end': int(span['endTimeUnixNano']) / 1e6,
+                    'service': service,
+                    'attributes': {a['key']: _attribute_value(a['value']) for a in span.get('attributes', [])},
+                })
+    return spans
+
+
+def spans_from_protobuf(body):
+    try:
+        from google.protobuf.json_format import MessageToDict
+        from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+    except ImportError:
+        raise ValueError("protobuf OTLP needs opentelemetry-proto (pip install opentelemetry-proto); "
+                         "or export with OTEL_EXPORTER_OTLP_PROTOCOL=http/json")
+    request = ExportTraceServiceRequest()
+    request.ParseFromString(body)
+    payload = MessageToDict(request)
+    # MessageToDict renders bytes ids as base64; OTLP/JSON uses hex
+    for resource in payload.get('resourceSpans', []):
+        for scope in resource.get('scopeSpans', []):
+            for span in scope.get('spans', []):
+                for key in ('traceId', 'spanId', 'parentSpanId'):
+                    if span.get(key):
+                        span[key] = _b64_to_hex(span[key])
+    return spans_from_json(payload)
+
+
+def _b64_to_hex(value):
+    return base64.b64decode(value).hex()
+
+
+class OtlpCollector:
+    """OTLP/HTTP trace receiver keeping spans in memory (and optionally on disk)"""
+
+    def __init__(self, port=OTLP_PORT, out=None, host='127.0.0.1'):
+        self.port = port
+        self.host = host
+        self.out = out
+        self.traces = {}  # traceId -> [span]
+        self.received = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._server = None
+
+    def add(self, spans):
+        with self._lock:
+            for span in spans:
+                self.traces.setdefault(span['traceId'], []).append(span)
+                if self._file:
+                    self._file.write(json.dumps(span) + "\n")
+            self.received += len(spans)
+            if self._file:
+                self._file.flush()
+
+    def _handler(self):
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if self.path.split('?')[0] != '/v1/traces':
+                    self.send_error(404)
+                    return
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                content_type = self.headers.get('Content-Type', '')
+                try:
+                    if 'json' in content_type:
+                        collector.add(spans_from_json(json.loads(body)))
+                        response, response_type = b'{}', 'application/json'
+                    else:
+                        collector.add(spans_from_protobuf(body))
+                        response, response_type = b'', 'application/x-protobuf'
+                except ValueError as e:
+                    self.send_error(415, str(e))
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', response_type)
+                self.send_header('Content-Length', str(len(response)))
+                self.end_headers()
+                self.wfile.write(response)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        if self.out:
+            self._file = open(self.out, 'a', encoding='utf-8')
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def load_spans(path):
+    traces = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                span = json.loads(line)
+                traces.setdefault(span['traceId'], []).append(span)
+    return traces
+
+
+def _union_ms(intervals):
+    total, current_start, current_end = 0.0, None, None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def breakdown(spans):
+    """Split one trace into PHASES (ms); None when the trace has no server span"""
+    ids = {s['spanId'] for s in spans}
+    roots = [s for s in spans if s['parentSpanId'] not in ids]
+    if not roots:
+        return None
+    root = max(roots, key=lambda s: s['end'] - s['start'])
+    handler = next((s for s in spans if _HANDLER_RE.search(s['name'])), root)
+
+    def inside(s):
+        return s['start'] >= handler['start'] and s['end'] <= handler['end'] + 0.5
+
+    prisma = [s for s in spans if s['name'].startswith('prisma') and inside(s)]
+    auth_spans = [s for s in spans if _AUTH_RE.search(s['name']) and not s['name'].startswith('prisma')
+                  and s is not root and s is not handler]
+    serialize_spans = [s for s in spans if _SERIALIZE_RE.search(s['name'])]
+
+    handler_ms = handler['end'] - handler['start']
+    db = _union_ms([(s['start'], s['end']) for s in prisma])
+    inferred = False
+    if auth_spans:
+        auth = _union_ms([(s['start'], s['end']) for s in auth_spans])
+    elif prisma:
+        auth = min(s['start'] for s in prisma) - handler['start']
+        inferred = True
+    else:
+        auth = 0.0
+    if serialize_spans:
+        serialize = _union_ms([(s['start'], s['end']) for s in serialize_spans])
+    elif prisma:
+        serialize = handler['end'] - max(s['end'] for s in prisma)
+        inferred = True
+    else:
+        serialize = 0.0
+    return {
+        'totalMs': root['end'] - root['start'],
+        'framework': (root['end'] - root['start']) - handler_ms if handler is not root else 0.0,
+        'auth': max(auth, 0.0),
+        'db': db,
+        'serialize': max(serialize, 0.0),
+        'other': max(handler_ms - db - max(auth, 0.0) - max(serialize, 0.0), 0.0),
+        'queries': (sum(1 for s in prisma if s['name'] == 'prisma:client:operation')
+                    or sum(1 for s in prisma if s['name'] == 'prisma:engine:db_query')),
+        'inferred': inferred,
+        'spans': len(spans),
+    }
+
+
+def trace_report(samples, traces, slow_pct=90):
+    """Per endpoint: breakdown of requests at or above the slow_pct latency percentile"""
+    by_endpoint = {}
+    for sample in samples:
+        if sample.get('traceId') and sample['error'] is None:
+            by_endpoint.setdefault(sample['endpoint'], []).append(sample)
+    report = {}
+    for endpoint, items in sorted(by_endpoint.items()):
+        threshold = percentile([s['latencyMs'] for s in items], slow_pct)
+        slow = [s for s in items if s['latencyMs'] >= threshold]
+        # Query counts over every traced request, not just the slow tail
+        queries = [parts['queries'] for parts in (breakdown(traces.get(s['traceId'], [])) for s in items) if parts]
+        rows = []
+        for sample in slow:
+            parts = breakdown(traces.get(sample['traceId'], []))
+            if parts:
+                rows.append({'requestId': sample.get('requestId'), 'traceId': sample['traceId'],
+                             'clientMs': sample['latencyMs'], **parts})
+        report[endpoint] = {
+            'requests': len(items),
+            'traced': sum(1 for s in items if s['traceId'] in traces),
+            'slowThresholdMs': threshold,
+            'queries': summarize(queries),
+            'slow': rows,
+            'mean': {phase: sum(r[phase] for r in rows) / len(rows) for phase in PHASES + ['totalMs', 'clientMs']}
+            if rows else None,
+        }
+    return report
+
+
+def print_report(report):
+    print("=" * 80)
+    print("SERVER TIMING BREAKDOWN (slow requests, mean per endpoint)")
+    print("=" * 80)
+    print(f"{'endpoint':<30} {'traced':>7} {'client':>8} {'server':>8} "
+          + ' '.join(f"{p:>9}" for p in PHASES))
+    for endpoint, entry in report.items():
+        mean = entry['mean']
+        if not mean:
+            print(f"{endpoint[:30]:<30} {entry['traced']:>3}/{entry['requests']:<3}  no spans matched")
+            continue
+        print(f"{endpoint[:30]:<30} {entry['traced']:>3}/{entry['requests']:<3} {format_ms(mean['clientMs']):>8} "
+              f"{format_ms(mean['totalMs']):>8} " + ' '.join(f"{format_ms(mean[p]):>9}" for p in PHASES))
+    inferred = any(r['inferred'] for e in report.values() for r in e['slow'])
+    if inferred:
+        print("\nauth/serialize are inferred around the Prisma spans where the app emits no explicit spans")
+    if not any(e['traced'] for e in report.values()):
+        print("\n❌ No spans matched; is the app running with harness/otel/register.js and exporting here?")
+
+
+def probe(args):
+    recorder = RunRecorder('tracing')
+    out = recorder.artifact_path('spans.jsonl')
+    with OtlpCollector(args.port, out=out) as collector:
+        print(f"📡 OTLP collector on http://127.0.0.1:{args.port}/v1/traces")
+        client = ApiClient(args.base_url, recorder=recorder)
+        client.register_and_login("Tracing Probe")
+        for endpoint in args.endpoints:
+            for _ in range(args.requests):
+                client.get(endpoint)
+        print(f"⏳ Waiting {args.flush:g}s for the app to flush its spans...")
+        time.sleep(args.flush)
+        traces = dict(collector.traces)
+    report = trace_report(recorder.samples, traces, args.slow_pct)
+    recorder.add_section('tracing', {'spansFile': 'spans.jsonl', 'slowPct': args.slow_pct, 'endpoints': report})
+    print_report(report)
+    print(f"\n💾 Results: {recorder.save()}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=OTLP_PORT, help="OTLP/HTTP port")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    collect = sub.add_parser('collect', help="run the collector until Ctrl-C")
+    collect.add_argument('--out', default='spans.jsonl')
+
+    probe_parser = sub.add_parser('probe', help="collector + traced requests + breakdown")
+    probe_parser.add_argument('--base-url', default=BASE_URL)
+    probe_parser.add_argument('--endpoint', dest='endpoints', action='append', default=None)
+    probe_parser.add_argument('--requests', type=int, default=30, help="requests per endpoint")
+    probe_parser.add_argument('--flush', type=float, default=3.0, help="seconds to wait for span export")
+    probe_parser.add_argument('--slow-pct', type=float, default=90, help="break down requests above this pct")
+
+    report = sub.add_parser('report', help="join a stored run with a spans file")
+    report.add_argument('run', help="run directory or results.json")
+    report.add_argument('--spans', required=True)
+    report.add_argument('--slow-pct', type=float, default=90)
+    args = parser.parse_args(argv)
+
+    if args.command == 'collect':
+        with OtlpCollector(args.port, out=args.out) as collector:
+            print(f"📡 OTLP collector on http://127.0.0.1:{args.port}/v1/traces -> {args.out} (Ctrl-C to stop)")
+            try:
+                while True:
+                    time.sleep(5)
+                    print(f"   {collector.received} spans / {len(collector.traces)} traces")
+            except KeyboardInterrupt:
+                pass
+        return 0
+    if args.command == 'probe':
+        args.endpoints = args.endpoints or ["/dashboard/stats", "/inbox"]
+        return probe(args)
+
+    run = load_run(args.run)
+    print_report(trace_report(run['samples'], load_spans(args.spans), args.slow_pct))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Fixtures for the API suite
+
+The suite runs against a live app (BASE_URL, or --base-url) and skips
+itself when nothing answers there. Every worker gets its own namespace,
+so users, projects and emails never collide when the suite is split up:
+
+    python -m pytest                          # serial
+    python -m pytest -n auto                  # parallel workers (optional: pip install pytest-xdist)
+    python -m pytest --shard 2/4              # one of four CI shards
+    python -m pytest --standin                # against a private in-memory stand-in
+
+Shards split the collected tests by a stable hash of their node id, and
+combine with -n, so each CI machine can also run workers in parallel.
+"""
+
+import itertools
+import os
+import uuid
+import zlib
+
+import pytest
+import requests
+
+from harness.client import ApiClient
+from harness.config import BASE_URL, DEFAULT_PASSWORD
+from harness.servers import free_port, standin_server
+
+from .helpers import join_project
+
+
+def pytest_addoption(parser):
+    parser.addoption('--base-url', default=BASE_URL, help="API under test (default: harness BASE_URL)")
+    parser.addoption('--standin', action='store_true', help="start harness.standin and test against it instead")
+    parser.addoption('--shard', default=None, metavar='K/N', help="run only shard K of N (1-based)")
+
+
+def pytest_collection_modifyitems(config, items):
+    shard = config.getoption('shard')
+    if not shard:
+        return
+    index, total = (int(part) for part in shard.split('/'))
+    if not 1 <= index <= total:
+        raise pytest.UsageError(f"--shard {shard}: K must be between 1 and N")
+    keep, drop = [], []
+    for item in items:
+        (keep if zlib.crc32(item.nodeid.encode('utf-8')) % total == index - 1 else drop).append(item)
+    if drop:
+        config.hook.pytest_deselected(items=drop)
+    items[:] = keep
+
+
+@pytest.fixture(scope='session')
+def base_url(pytestconfig):
+    if pytestconfig.getoption('standin'):
+        port = free_port()
+        with standin_server(port=port, ws_port=free_port()):
+            yield f"http://127.0.0.1:{port}/api"
+        return
+    url = pytestconfig.getoption('base_url')
+    try:
+        requests.get(f"{url}/auth/csrf", timeout=5)
+    except requests.RequestException:
+        pytest.skip(f"app not reachable at {url}")
+    yield url
+
+
+@pytest.fixture(scope='session')
+def namespace():
+    """Unique per worker and run: gw0, gw1, ... under xdist, 'main' otherwise"""
+    worker = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+    return f"pytest-{worker}-{uuid.uuid4().hex[:6]}"
+
+
+@pytest.fixture(scope='session')
+def unique_email(namespace):
+    counter = itertools.count(1)
+    return lambda label='user': f"{namespace}.{label}.{next(counter)}@example.com"
+
+
+@pytest.fixture(scope='session')
+def make_user(base_url, unique_email):
+    """Register and sign in a new user; returns the signed-in ApiClient"""
+    def make(name="Test User"):
+        client = ApiClient(base_url)
+        client.register_and_login(name, unique_email(), DEFAULT_PASSWORD)
+        return client
+    return make
+
+
+@pytest.fixture(scope='session')
+def owner(make_user):
+    """Signed-in user shared by this worker's tests; owns every project fixture"""
+    return make_user("Project Owner")
+
+
+@pytest.fixture
+def anonymous(base_url):
+    return ApiClient(base_url)
+
+
+@pytest.fixture
+def project(owner, namespace):
+    response = owner.post("/projects", json={
+        'name': f"{namespace} project",
+        'description': "Created by the API suite",
+    })
+    assert response.status_code == 201, response.text
+    return response.json()['project']
+
+
+@pytest.fixture
+def task(owner, project):
+    response = owner.post(f"/projects/{project['id']}/tasks", json={
+        'title': "Implement user authentication system",
+        'description': "Secure sign-in with hashed passwords",
+        'priority': 'HIGH',
+    })
+    assert response.status_code == 201, response.text
+    return response.json()['task']
+
+
+@pytest.fixture
+def member(owner, project, make_user):
+    """A second user who has joined the project"""
+    client = make_user("Project Member")
+    join_project(owner, client, project['id'])
+    return client
+
+
+@pytest.fixture
+def outsider(make_user):
+    """A signed-in user with no access to the fixture project"""
+    return make_user("Outsider")
@@ -0,0 +1,12 @@
+"""Plain helpers shared by the API tests (fixtures live in conftest.py)"""
+
+
+def join_project(owner, member, project_id, role='MEMBER'):
+    """Invite member's account as owner and accept the invitation as member"""
+    invite = owner.post(f"/projects/{project_id}/invite", json={'email': member.user['email'], 'role': role})
+    assert invite.status_code == 201, invite.text
+    accept = member.post("/inbox/invitations", json={
+        'invitationId': invite.json()['invitation']['id'], 'action': 'accept'
+    })
+    assert accept.status_code == 200, accept.text
+    return invite.json()['invitation']
@@ -0,0 +1,31 @@
+"""Activity logging for project and task changes"""
+
+
+def activities(client, project):
+    response = client.get("/activity", params={'projectId': project['id']})
+    assert response.status_code == 200
+    return response.json()['activities']
+
+
+def test_task_creation_is_logged(owner, project, task):
+    logged = [a for a in activities(owner, project) if a['type'] == 'TASK_CREATED']
+    assert [a['content'] for a in logged] == [f'created task "{task["title"]}"']
+
+
+def test_task_updates_with_activity_tracking(owner, project, task):
+    owner.patch(f"/tasks/{task['id']}", json={'priority': 'URGENT'})
+    owner.patch(f"/tasks/{task['id']}", json={'status': 'DONE'})
+    types = [a['type'] for a in activities(owner, project)]
+    assert types.count('TASK_UPDATED') == 1
+    assert types.count('TASK_COMPLETED') == 1
+
+
+def test_activity_attributed_to_member(owner, project, task, member):
+    member.patch(f"/tasks/{task['id']}", json={'status': 'IN_PROGRESS'})
+    latest = activities(owner, project)[0]
+    assert latest['user']['id'] == member.user['id']
+    assert latest['content'] == f'changed status of "{task["title"]}" to in_progress'
+
+
+def test_activity_hidden_from_outsiders(outsider, project):
+    assert outsider.get("/activity", params={'projectId': project['id']}).status_code == 404
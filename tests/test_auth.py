@@ -0,0 +1,65 @@
+"""Registration and NextAuth credentials sign-in"""
+
+import pytest
+
+from harness.config import DEFAULT_PASSWORD
+
+
+def test_legacy_api_root_is_deprecated(anonymous):
+    response = anonymous.get("/")
+    assert response.status_code == 410
+    assert 'deprecated' in response.json()['error']
+
+
+def test_user_registration(anonymous, unique_email):
+    email = unique_email()
+    response = anonymous.post("/auth/register", json={
+        'name': "Sarah Johnson", 'email': email, 'password': DEFAULT_PASSWORD
+    })
+    assert response.status_code == 200
+    user = response.json()['user']
+    assert user['email'] == email
+    assert 'password' not in user
+
+
+@pytest.mark.parametrize('missing', ['name', 'email', 'password'])
+def test_user_registration_requires_fields(anonymous, unique_email, missing):
+    payload = {'name': "Test User", 'email': unique_email(), 'password': DEFAULT_PASSWORD}
+    del payload[missing]
+    assert anonymous.post("/auth/register", json=payload).status_code == 400
+
+
+@pytest.mark.parametrize('field, value', [('email', 'not-an-email'), ('password', '12345')])
+def test_user_registration_validation(anonymous, unique_email, field, value):
+    payload = {'name': "Test User", 'email': unique_email(), 'password': DEFAULT_PASSWORD, field: value}
+    assert anonymous.post("/auth/register", json=payload).status_code == 400
+
+
+def test_duplicate_user_registration(anonymous, owner):
+    response = anonymous.post("/auth/register", json={
+        'name': "Duplicate", 'email': owner.user['email'], 'password': DEFAULT_PASSWORD
+    })
+    assert response.status_code == 400
+    assert 'already exists' in response.json()['error'].lower()
+
+
+def test_user_login(owner):
+    assert owner.is_authenticated
+    session = owner.get("/auth/session").json()
+    assert session['user']['id'] == owner.user['id']
+    assert 'password' not in session['user']
+
+
+def test_user_login_invalid_credentials(anonymous, owner):
+    with pytest.raises(RuntimeError):
+        anonymous.login(owner.user['email'], "WrongPassword123!")
+    assert not anonymous.is_authenticated
+
+
+def test_user_login_nonexistent_user(anonymous, unique_email):
+    with pytest.raises(RuntimeError):
+        anonymous.login(unique_email('missing'), DEFAULT_PASSWORD)
+
+
+def test_unauthenticated_requests_are_rejected(anonymous):
+    assert anonymous.get("/projects").status_code == 401
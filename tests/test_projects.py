@@ -0,0 +1,46 @@
+"""Project CRUD and visibility"""
+
+
+def test_project_creation(owner, project):
+    assert project['owner']['id'] == owner.user['id']
+    assert project['name'].endswith(" project")
+
+
+def test_project_creation_validation(owner):
+    response = owner.post("/projects", json={'description': "Project without a name"})
+    assert response.status_code == 400
+
+
+def test_project_retrieval(owner, project):
+    response = owner.get("/projects")
+    assert response.status_code == 200
+    assert project['id'] in [p['id'] for p in response.json()['projects']]
+
+
+def test_project_detail(owner, project):
+    response = owner.get(f"/projects/{project['id']}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data['currentUserId'] == owner.user['id']
+    assert [m['role'] for m in data['project']['members']] == ['OWNER']
+
+
+def test_project_hidden_from_outsiders(outsider, project):
+    assert outsider.get(f"/projects/{project['id']}").status_code == 404
+    assert project['id'] not in [p['id'] for p in outsider.get("/projects").json()['projects']]
+
+
+def test_project_update(owner, project):
+    response = owner.patch(f"/projects/{project['id']}", json={'name': "Renamed", 'description': "New scope"})
+    assert response.status_code == 200
+    assert response.json()['project']['name'] == "Renamed"
+    assert response.json()['project']['description'] == "New scope"
+
+
+def test_project_update_requires_admin(member, project):
+    assert member.patch(f"/projects/{project['id']}", json={'name': "Hijacked"}).status_code == 404
+
+
+def test_project_deletion(owner, project):
+    assert owner.delete(f"/projects/{project['id']}").status_code == 200
+    assert owner.get(f"/projects/{project['id']}").status_code == 404
@@ -0,0 +1,9 @@
+"""Bundled scenario files (no app needed)"""
+
+from harness.scenario import load_scenario
+
+
+def test_load_scenario_by_bare_name():
+    # The spelling harness.profiling documents for --phase NAME=SCENARIO
+    assert load_scenario('inbox_read_storm')['journeys']
+    assert load_scenario('production_mix') == load_scenario('production_mix.json')
@@ -0,0 +1,62 @@
+"""Task CRUD inside a project"""
+
+import pytest
+
+
+def task_ids(client, project):
+    response = client.get(f"/projects/{project['id']}/tasks")
+    assert response.status_code == 200
+    return [t['id'] for t in response.json()['tasks']]
+
+
+def test_task_creation(task):
+    assert task['status'] == 'TODO'
+    assert task['priority'] == 'HIGH'
+
+
+def test_task_creation_validation(owner, project):
+    response = owner.post(f"/projects/{project['id']}/tasks", json={'description': "Task without a title"})
+    assert response.status_code == 400
+
+
+def test_task_retrieval(owner, project, task):
+    assert task['id'] in task_ids(owner, project)
+    response = owner.get(f"/tasks/{task['id']}")
+    assert response.status_code == 200
+    assert response.json()['task']['project']['id'] == project['id']
+
+
+def test_task_update(owner, task):
+    response = owner.patch(f"/tasks/{task['id']}", json={
+        'status': 'IN_PROGRESS', 'priority': 'MEDIUM', 'description': "Now with session management"
+    })
+    assert response.status_code == 200
+    updated = response.json()['task']
+    assert (updated['status'], updated['priority']) == ('IN_PROGRESS', 'MEDIUM')
+    assert updated['description'] == "Now with session management"
+
+
+def test_task_update_by_member(member, task):
+    response = member.patch(f"/tasks/{task['id']}", json={'status': 'DONE'})
+    assert response.status_code == 200
+    assert response.json()['task']['status'] == 'DONE'
+
+
+def test_task_update_by_outsider(outsider, task):
+    assert outsider.patch(f"/tasks/{task['id']}", json={'status': 'DONE'}).status_code == 404
+
+
+def test_task_update_nonexistent(owner):
+    assert owner.patch("/tasks/non-existent-task-id", json={'status': 'DONE'}).status_code == 404
+
+
+@pytest.mark.xfail(reason="DELETE /tasks/:id logs activity type TASK_DELETED, missing from enum ActivityType")
+def test_task_deletion(owner, project, task):
+    response = owner.delete(f"/tasks/{task['id']}")
+    assert response.status_code == 200
+    assert 'deleted' in response.json()['message'].lower()
+    assert task['id'] not in task_ids(owner, project)
+
+
+def test_task_deletion_nonexistent(owner):
+    assert owner.delete("/tasks/non-existent-task-id").status_code == 404
@@ -0,0 +1,57 @@
+"""Invitations and project membership"""
+
+from .helpers import join_project
+
+
+def project_ids(client):
+    return [p['id'] for p in client.get("/projects").json()['projects']]
+
+
+def member_row(owner, project, client):
+    members = owner.get(f"/projects/{project['id']}").json()['project']['members']
+    return next(m for m in members if m['user']['id'] == client.user['id'])
+
+
+def test_team_invitation_system(owner, project, make_user):
+    invitee = make_user("Invitee")
+    invitation = join_project(owner, invitee, project['id'])
+    assert invitation['email'] == invitee.user['email']
+    assert project['id'] in project_ids(invitee)
+    assert member_row(owner, project, invitee)['role'] == 'MEMBER'
+
+
+def test_invitation_requires_email(owner, project):
+    assert owner.post(f"/projects/{project['id']}/invite", json={'role': 'MEMBER'}).status_code == 400
+
+
+def test_invitation_for_existing_member(owner, project, member):
+    response = owner.post(f"/projects/{project['id']}/invite", json={'email': member.user['email']})
+    assert response.status_code == 400
+
+
+def test_invitation_rejected(owner, project, make_user):
+    invitee = make_user("Reluctant Invitee")
+    invite = owner.post(f"/projects/{project['id']}/invite", json={'email': invitee.user['email']})
+    assert invite.status_code == 201
+    response = invitee.post("/inbox/invitations", json={
+        'invitationId': invite.json()['invitation']['id'], 'action': 'reject'
+    })
+    assert response.status_code == 200
+    assert project['id'] not in project_ids(invitee)
+
+
+def test_member_cannot_invite(member, project, unique_email):
+    response = member.post(f"/projects/{project['id']}/invite", json={'email': unique_email('invitee')})
+    assert response.status_code == 404
+
+
+def test_member_role_change(owner, project, member):
+    row = member_row(owner, project, member)
+    response = owner.patch(f"/projects/{project['id']}/members/{row['id']}", json={'role': 'ADMIN'})
+    assert response.status_code == 200
+    assert member.patch(f"/projects/{project['id']}", json={'description': "Edited by an admin"}).status_code == 200
+
+
+def test_member_role_validation(owner, project, member):
+    row = member_row(owner, project, member)
+    assert owner.patch(f"/projects/{project['id']}/members/{row['id']}", json={'role': 'OWNER'}).status_code == 400